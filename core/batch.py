@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class RateLimiter:
+    """
+    초당 최대 호출 수를 제한하는 간단한 스레드 안전 리미터.
+    rate_per_sec가 None 또는 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate_per_sec: Optional[float]):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec and rate_per_sec > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+
+class JsonlWriter:
+    """결과를 한 줄씩 즉시 추가(append)하는 JSONL 기록기. 중간에 중단돼도 기록된 줄은 보존됩니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """임시 파일에 쓴 뒤 os.replace로 교체해, 중단돼도 반쯤 쓰인 JSON 파일이 남지 않게 합니다."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """JSONL 파일을 읽습니다. 중단으로 잘린 마지막 줄 등 깨진 줄은 건너뜁니다."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ 손상된 JSONL 줄을 건너뜁니다: {line[:80]}")
+
+
+@dataclass
+class BatchStats:
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    latencies: List[float] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, success: bool, latency: float) -> None:
+        with self._lock:
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            self.latencies.append(latency)
+
+    def summary(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started_at
+        processed = self.succeeded + self.failed
+        latencies = sorted(self.latencies)
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(processed / elapsed, 3) if elapsed else 0.0,
+            "latency_avg_seconds": (
+                round(sum(latencies) / len(latencies), 2) if latencies else None
+            ),
+            "latency_p95_seconds": (
+                round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2)
+                if latencies
+                else None
+            ),
+        }
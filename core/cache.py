@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, NamedTuple, Optional
+
+from .config import CACHE_DIR
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def prompt_version(prompt: str) -> str:
+    """프롬프트 원문 해시의 앞 12자리. 프롬프트가 수정되면 캐시 키도 자동으로 바뀝니다."""
+    return hash_bytes(prompt.encode("utf-8"))[:12]
+
+
+def make_cache_key(*parts: Any) -> str:
+    """여러 구성 요소를 하나의 고정 길이 캐시 키로 합칩니다."""
+    joined = "\x1f".join(str(p) for p in parts)
+    return hash_bytes(joined.encode("utf-8"))
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    created_at: float
+    expires_at: Optional[float]
+
+    @property
+    def is_expired(self) -> bool:
+        return self.expires_at is not None and self.expires_at <= time.time()
+
+
+class PersistentCache:
+    """
+    SQLite 파일 기반의 JSON 값 캐시.
+    - max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거 (LRU)
+    - 항목별 TTL (default_ttl 또는 set(..., ttl=)) 지원, 만료된 항목은 get()에서 miss로 처리
+    - 프로세스 단위 hit/miss/stale/eviction 카운터 제공
+    - data_versioned=True(기본)이면 키에 참조 데이터 버전(core.data_version)을 포함해,
+      csv_data나 벡터 인덱스가 바뀌면 이전 항목은 자동으로 miss 처리 (이후 LRU로 정리)
+    연결은 첫 사용 시점에 열리며, 여러 스레드·프로세스에서 같은 파일을 공유할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        cache_dir: str = CACHE_DIR,
+        data_versioned: bool = True,
+    ):
+        self.name = name
+        self.path = os.path.join(cache_dir, f"{name}.sqlite3")
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.data_versioned = data_versioned
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "expires_at" not in columns:  # TTL 도입 이전에 만들어진 캐시 파일
+                conn.execute("ALTER TABLE entries ADD COLUMN expires_at REAL")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _versioned_key(self, key: str) -> str:
+        if not self.data_versioned:
+            return key
+        from .data_version import get_data_version  # data_version이 이 모듈을 import
+
+        return make_cache_key(key, get_data_version())
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_expired:
+            return None
+        return entry.value
+
+    def get_entry(self, key: str, max_stale: float = 0) -> Optional[CacheEntry]:
+        """
+        만료 시각 정보를 포함해 항목을 반환합니다.
+        만료 후 max_stale초 이내의 항목은 is_expired=True 상태로 반환되어
+        호출 측에서 stale-while-revalidate 처리를 할 수 있습니다.
+        """
+        key = self._versioned_key(key)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or (row[2] is not None and row[2] + max_stale <= now):
+                self._counters["misses"] += 1
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+            )
+            conn.commit()
+            if row[2] is not None and row[2] <= now:
+                self._counters["stale"] += 1
+            else:
+                self._counters["hits"] += 1
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        key = self._versioned_key(key)
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, last_access, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, now, expires_at),
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        if not self.max_entries:
+            return
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            self._counters["evictions"] += overflow
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self._counters[k] for k in ("hits", "misses", "stale"))
+        return {
+            "name": self.name,
+            **self._counters,
+            "hit_rate": (self._counters["hits"] / lookups) if lookups else 0.0,
+            "size": len(self),
+            "max_entries": self.max_entries,
+            "data_versioned": self.data_versioned,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
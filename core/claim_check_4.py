@@ -1,133 +1,177 @@
-import re
 import os
 import json
-import pandas as pd
+import time
 
 # from dotenv import load_dotenv # main.py에서 처리
-from .config import text_llm
-from .prompt import QUERY2KEYWORD_PROMPT
-from typing import List, Tuple
-from rapidfuzz import fuzz  # pip install rapidfuzz
+from .keyword_extractor import get_query_keywords
+from .reference_data import (
+    ReferenceData,
+    get_reference_data,
+    normalize_efficacy_text,
+    register_reload_warmer,
+)
+from .ingredient_aliases import lookup_alias
+from .ingredient_resolver import IngredientResolver, get_ingredient_resolver
+from .efficacy_index import SOURCE_FNCLTY, SOURCE_HEALTHFOOD_CLAIMS, get_efficacy_index
+from typing import Any, Dict, List, Optional
+import numpy as np
+from rapidfuzz import fuzz, process  # pip install rapidfuzz
 
-# 📁 경로 설정
+# 키워드 × 효능 텍스트 점수 행렬 계산에 쓸 스레드 수 (-1: 모든 코어)
+MATCH_WORKERS = int(os.getenv("MATCH_WORKERS", "1"))
 
-# claim_check_3.py 파일의 현재 디렉터리 위치를 가져옵니다.
-CURRENT_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 제품 성분이 매칭될 수 있는 기능성 색인 출처 (db_material은 의약품(drug_raw)이 될 수 없음)
+PRODUCT_MATERIAL_SOURCES = (SOURCE_FNCLTY, SOURCE_HEALTHFOOD_CLAIMS)
 
-BASE_DIR = os.path.dirname(
-    CURRENT_SCRIPT_DIR
-)  # core 폴더의 부모 디렉터리 (프로젝트 최상위)
-CSV_DATA_DIR = os.path.join(BASE_DIR, "csv_data")
-CSV_HEALTHFOOD_CLAIMS = os.path.join(CSV_DATA_DIR, "healthfood_claims_final10.csv")
+
+def _warm_product_material_index(ref: ReferenceData) -> None:
+    get_efficacy_index(ref).warm(PRODUCT_MATERIAL_SOURCES)
+
+
+# 참조 데이터 교체 시 성분 판정에 쓰는 출처의 기능성 색인만 교체 전에 생성
+register_reload_warmer(_warm_product_material_index)
 
 # DATA_DIR = "TEXT2SEARCH_data"
-CSV_FNCLTY = os.path.join(CSV_DATA_DIR, "fnclty_materials_complete.csv")
-CSV_DRUG = os.path.join(CSV_DATA_DIR, "drug_raw.csv")
 # OUTPUT_DIR = "DECISION_data" # main.py에서 처리
 # os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# 📄 CSV: 성분 기반 효능
-df_fnclty = pd.read_csv(CSV_FNCLTY)
-df_fnclty["APLC_RAWMTRL_NM"] = df_fnclty["APLC_RAWMTRL_NM"].astype(str)
-df_fnclty["FNCLTY_CN"] = df_fnclty["FNCLTY_CN"].astype(str)
-
-efficacy_dict = {
-    row["APLC_RAWMTRL_NM"]: row["FNCLTY_CN"] for _, row in df_fnclty.iterrows()
-}
-
-# 📄 CSV: 제품명 기반 효능 (보완용)
-df_drug = pd.read_csv(CSV_DRUG)
-df_drug["itemName"] = df_drug["itemName"].astype(str)
-df_drug["efcyQesitm"] = df_drug["efcyQesitm"].astype(str)
-
-drug_efficacy_dict = {
-    row["itemName"]: row["efcyQesitm"] for _, row in df_drug.iterrows()
-}
-
-# 📄 CSV: (제품명, 성분명['일일섭취량']) 복합 키 기반 효능 (healthfood_claims_final10.csv)
-df_healthfood_claims = pd.read_csv(CSV_HEALTHFOOD_CLAIMS)
-
-PRODUCT_NAME_COL_HC_CLAIMS = "제품명"
-INGREDIENT_COL_HC_CLAIMS = "일일섭취량"
-EFFICACY_COL_HC_CLAIMS = "기능성 내용"
-
-healthfood_claims_composite_key_efficacy_dict: dict[Tuple[str, str], str] = {}
-
-# healthfood_claims_final10.csv 파일에 필요한 컬럼들이 모두 있는지 확인
-if (
-    PRODUCT_NAME_COL_HC_CLAIMS in df_healthfood_claims.columns
-    and INGREDIENT_COL_HC_CLAIMS in df_healthfood_claims.columns
-    and EFFICACY_COL_HC_CLAIMS in df_healthfood_claims.columns
-):
-
-    df_healthfood_claims[PRODUCT_NAME_COL_HC_CLAIMS] = df_healthfood_claims[
-        PRODUCT_NAME_COL_HC_CLAIMS
-    ].astype(str)
-    df_healthfood_claims[INGREDIENT_COL_HC_CLAIMS] = df_healthfood_claims[
-        INGREDIENT_COL_HC_CLAIMS
-    ].astype(str)
-    df_healthfood_claims[EFFICACY_COL_HC_CLAIMS] = df_healthfood_claims[
-        EFFICACY_COL_HC_CLAIMS
-    ].astype(str)
-
-    for _, row in df_healthfood_claims.iterrows():
-        product_name_key = row[PRODUCT_NAME_COL_HC_CLAIMS].strip()
-        ingredient_key = row[
-            INGREDIENT_COL_HC_CLAIMS
-        ].strip()  # '일일섭취량' 컬럼 값 (성분명으로 사용)
-        efficacy_value = row[EFFICACY_COL_HC_CLAIMS]  # '기능성 내용' 컬럼 값
-
-        if (
-            product_name_key and ingredient_key
-        ):  # 제품명과 성분명(일일섭취량)이 모두 유효한 경우
-            healthfood_claims_composite_key_efficacy_dict[
-                (product_name_key, ingredient_key)
-            ] = efficacy_value
-else:
-    print(
-        f"⚠️ '{os.path.basename(CSV_HEALTHFOOD_CLAIMS)}' 파일에서 복합 키 생성에 필요한 컬럼('{PRODUCT_NAME_COL_HC_CLAIMS}', '{INGREDIENT_COL_HC_CLAIMS}', 또는 '{EFFICACY_COL_HC_CLAIMS}')을(를) 찾을 수 없습니다. 해당 딕셔너리가 비어있을 수 있습니다."
-    )
+# 📄 efficacy_dict / drug_efficacy_dict / healthfood_claims_composite_key_efficacy_dict 는
+# core.reference_data.ReferenceData 가 첫 접근 시 생성합니다. (import 시점에 CSV를 읽지 않음)
+_REFERENCE_ATTRS = (
+    "efficacy_dict",
+    "drug_efficacy_dict",
+    "healthfood_claims_composite_key_efficacy_dict",
+    "df_fnclty",
+    "df_drug",
+    "df_healthfood_claims",
+)
+
 
+def __getattr__(name: str):
+    # 기존 모듈 속성(claim_check_4.efficacy_dict 등)에 대한 호환용 지연 접근
+    if name in _REFERENCE_ATTRS:
+        return getattr(get_reference_data(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# 🔍 LLM으로 질의 핵심어 추출
+
+# 🔍 질의 핵심어 추출 (형태소 분석 + 건강 용어 사전, 신뢰도가 낮으면 LLM)
+# RAG 보완(rag_service_4_1.extract_keywords)과 같은 질문이면 메모된 결과를 공유합니다.
 def extract_keywords_from_query(query: str) -> List[str]:
-    prompt = QUERY2KEYWORD_PROMPT.replace("{query}", query)
-    response = text_llm.invoke(prompt)
-    try:
-        content = response.content.strip()  # strip()추가
-        return json.loads(content)
-    except Exception as e:
-        print(f"❌ 키워드 JSON 파싱 실패: {e}\n원문: {response.content}")
-        return []
+    return get_query_keywords(query).keywords
 
 
 def _normalize(text: str) -> str:
     """
     소문자 변환 + 공백·중점(·)·특수기호 제거
     """
-    text = text.lower()
-    text = re.sub(r"[\s·\.\,!?;:()\[\]{}]", "", text)
-    return text
+    return normalize_efficacy_text(text)
 
 
-def match_efficacy(
-    query_keywords: list[str], efficacy_text: str, threshold: int = 70
-) -> str:
+def score_efficacy_matrix(
+    query_keywords: List[str], efficacy_texts: List[str], ref: Optional[ReferenceData] = None
+) -> "np.ndarray":
+    """
+    키워드 × 효능 텍스트 전체 쌍의 partial_ratio 점수 행렬 (shape: [키워드 수, 텍스트 수])
+    rapidfuzz.process.cdist 한 번으로 계산합니다.
+    참조 데이터의 효능 텍스트는 로딩 시 미리 정규화해 둔 값을 그대로 사용합니다.
+    점수는 fuzz.partial_ratio 반환값과 같도록 float64로 받습니다. (기본 float32는 임계값 경계에서 반올림될 수 있음)
+    """
+    ref = ref or get_reference_data()
+    return process.cdist(
+        [_normalize(kw) for kw in query_keywords],
+        [ref.normalized_efficacy(text) for text in efficacy_texts],
+        scorer=fuzz.partial_ratio,
+        dtype=np.float64,
+        workers=MATCH_WORKERS,
+    )
 
-    eff_norm = _normalize(efficacy_text)
 
-    for kw in query_keywords:
-        kw_norm = _normalize(kw)
-        if fuzz.partial_ratio(kw_norm, eff_norm) >= threshold:
-            return "일치"
+def score_efficacy_ids(
+    query_keywords: List[str], text_ids: List[int], ref: Optional[ReferenceData] = None
+) -> "np.ndarray":
+    """
+    score_efficacy_matrix와 같되 참조 데이터 효능 텍스트를 풀 id로 받습니다.
+    정규화 텍스트를 normalized_efficacy_pool에서 id로 바로 꺼내므로 원문 해시·비교가 없습니다.
+    """
+    ref = ref or get_reference_data()
+    normalized_pool = ref.normalized_efficacy_pool
+    return process.cdist(
+        [_normalize(kw) for kw in query_keywords],
+        [normalized_pool[text_id] for text_id in text_ids],
+        scorer=fuzz.partial_ratio,
+        dtype=np.float64,
+        workers=MATCH_WORKERS,
+    )
 
-    return "불일치"
 
+def _judge_scores(
+    query_keywords: List[str], scores: "np.ndarray", threshold: int = 70
+) -> List[Dict[str, Any]]:
+    """
+    점수 행렬([키워드 수, 텍스트 수])을 텍스트별 판정 결과로 변환합니다.
+    판정은 반올림 전 점수로 하고, 소수 첫째 자리 반올림은 출력 값에만 적용합니다.
+    """
+    results = []
+    for col in range(scores.shape[1]):
+        raw_scores = [float(scores[row, col]) for row in range(len(query_keywords))]
+        best = max(raw_scores, default=0.0)
+        results.append(
+            {
+                "일치도": "일치" if best >= threshold else "불일치",
+                "일치_점수": round(best, 1),
+                "키워드별_점수": {
+                    kw: round(score, 1) for kw, score in zip(query_keywords, raw_scores)
+                },
+            }
+        )
+    return results
 
-# --- 파이프라인을 위한 수정된 함수 ---
-def get_product_evaluation(
-    enriched_data: dict, user_query: str, original_user_query_for_display: str
-) -> dict:  # 새 인자 추가
+
+def match_efficacy_batch(
+    query_keywords: List[str],
+    efficacy_texts: List[str],
+    threshold: int = 70,
+    ref: Optional[ReferenceData] = None,
+) -> List[Dict[str, Any]]:
+    """
+    여러 효능 텍스트를 한 번에 판정합니다. 텍스트마다
+    {"일치도": "일치"/"불일치", "일치_점수": 최고 점수, "키워드별_점수": {키워드: 점수}}를 반환합니다.
+    """
+    if not efficacy_texts:
+        return []
+    return _judge_scores(
+        query_keywords, score_efficacy_matrix(query_keywords, efficacy_texts, ref), threshold
+    )
+
+
+def match_efficacy_ids(
+    query_keywords: List[str],
+    text_ids: List[int],
+    threshold: int = 70,
+    ref: Optional[ReferenceData] = None,
+) -> List[Dict[str, Any]]:
+    """match_efficacy_batch의 풀 id 버전 (_lookup_product_efficacies가 찾은 참조 데이터 텍스트용)"""
+    if not text_ids:
+        return []
+    return _judge_scores(
+        query_keywords, score_efficacy_ids(query_keywords, text_ids, ref), threshold
+    )
+
+
+def match_efficacy(
+    query_keywords: list[str], efficacy_text: str, threshold: int = 70
+) -> str:
+    return match_efficacy_batch(query_keywords, [efficacy_text], threshold)[0]["일치도"]
+
+
+def _lookup_product_efficacies(
+    enriched_data: dict, ref: ReferenceData, resolver: IngredientResolver
+) -> dict:
+    """
+    제품의 성분별 효능 텍스트와 출처를 DB에서 찾습니다. (질문과 무관하므로 제품당 한 번)
+    반환: {"product_name_original", "product_name", "ingredients", "lookups", "fallback_text", "fallback_id"}
+    lookups: (성분명, 효능 텍스트, 출처, 기능성 색인 (출처, 원료명), 효능 텍스트의 efficacy_pool id)
+    """
     product_name_original = enriched_data.get("제품명", "unknown")
     product_name = product_name_original.strip()
     ingredients = enriched_data.get("확정_성분", [])
@@ -138,38 +182,108 @@ def get_product_evaluation(
         )
         ingredients = []
 
-    # user_query는 내부 처리용 (정제된) 질문임
-    query_keywords = extract_keywords_from_query(user_query)
-
-    matched_results = []
-    match_count = 0
+    efficacy_dict = ref.efficacy_dict
+    healthfood_claims_composite_key_efficacy_dict = (
+        ref.healthfood_claims_composite_key_efficacy_dict
+    )
+    ingredient_alias_dict = ref.ingredient_alias_dict
 
+    lookups = []
     for ing_original in ingredients:
         ing = ing_original.strip()
         efficacy = None
         source_db = None
+        db_material = None  # 기능성 색인 조회용 (출처, 원료명)
+        efficacy_id = None  # 정규화 텍스트 조회용 (efficacy_pool id)
 
         # 1순위: efficacy_dict (fnclty_materials_complete.csv - 성분 기반)
         if ing in efficacy_dict:
             efficacy = efficacy_dict[ing]
+            efficacy_id = efficacy_dict.value_id(ing)
             source_db = "fnclty_materials (ingredient)"
+            db_material = (SOURCE_FNCLTY, ing)
         # 2순위: healthfood_claims_composite_key_efficacy_dict (healthfood_claims_final10.csv - (제품명, 성분명['일일섭취량']) 복합 키 기반)
         elif (product_name, ing) in healthfood_claims_composite_key_efficacy_dict:
             efficacy = healthfood_claims_composite_key_efficacy_dict[
                 (product_name, ing)
             ]
+            efficacy_id = healthfood_claims_composite_key_efficacy_dict.value_id(
+                (product_name, ing)
+            )
             source_db = "healthfood_claims (product+ingredient)"
+            db_material = (SOURCE_HEALTHFOOD_CLAIMS, product_name)
+        else:
+            # 3순위: 오프라인 별칭 테이블 (괄호 속 학명·추출물 접미사·구분자 차이, O(1) 조회)
+            alias = lookup_alias(ing, ingredient_alias_dict)
+            if alias is not None:
+                efficacy = efficacy_dict[alias]
+                efficacy_id = efficacy_dict.value_id(alias)
+                source_db = f"fnclty_materials (별칭: {alias})"
+                db_material = (SOURCE_FNCLTY, alias)
+            else:
+                # 4순위: 원료명 표기 차이 보정 (trigram 색인 + rapidfuzz, RAG 경로로 넘어가기 전 로컬에서 해결)
+                approx = resolver.resolve(ing)
+                if approx:
+                    efficacy = efficacy_dict[approx.name]
+                    efficacy_id = efficacy_dict.value_id(approx.name)
+                    source_db = f"fnclty_materials (유사 원료명: {approx.name}, {approx.score})"
+                    db_material = (SOURCE_FNCLTY, approx.name)
+        lookups.append((ing_original, efficacy, source_db, db_material, efficacy_id))
+
+    # 제품명 기반 검색은 drug_efficacy_dict (drug_raw.csv)만 사용
+    fallback_text = ref.drug_efficacy_dict.get(product_name)
+    fallback_id = ref.drug_efficacy_dict.value_id(product_name) if fallback_text else None
+    return {
+        "product_name_original": product_name_original,
+        "product_name": product_name,
+        "ingredients": ingredients,
+        "lookups": lookups,
+        "fallback_text": fallback_text,
+        "fallback_id": fallback_id,
+    }
 
+
+def _text_ids_to_score(product: dict) -> List[int]:
+    """점수를 계산할 텍스트의 풀 id (성분 효능 순서대로, 마지막에 제품명 기반 보완 텍스트)"""
+    text_ids = [efficacy_id for _, efficacy, _, _, efficacy_id in product["lookups"] if efficacy]
+    if product["fallback_text"]:
+        text_ids.append(product["fallback_id"])
+    return text_ids
+
+
+def _build_evaluation_output(
+    enriched_data: dict,
+    product: dict,
+    user_query: str,
+    original_user_query_for_display: str,
+    query_keywords: List[str],
+    scored: List[Dict[str, Any]],
+    keyword_materials: set,
+    verbose: bool = True,
+) -> dict:
+    """_text_ids_to_score 순서의 판정 결과(scored)로 evaluation_output을 만듭니다."""
+    product_name_original = product["product_name_original"]
+    ingredients = product["ingredients"]
+    fallback_text = product["fallback_text"]
+    scored = iter(scored)
+
+    matched_results = []
+    match_count = 0
+
+    for ing_original, efficacy, source_db, db_material, _ in product["lookups"]:
         if efficacy:
-            match_level = match_efficacy(query_keywords, efficacy)
-            if match_level == "일치":
+            match = next(scored)
+            if match["일치도"] == "일치":
                 match_count += 1
             matched_results.append(
                 {
                     "성분명": ing_original,
                     "효능": efficacy,
-                    "일치도": match_level,
+                    "일치도": match["일치도"],
                     "출처 DB": source_db,
+                    "일치_점수": match["일치_점수"],
+                    "키워드별_점수": match["키워드별_점수"],
+                    "기능성_색인_일치": db_material in keyword_materials,
                 }
             )
         else:
@@ -185,19 +299,19 @@ def get_product_evaluation(
     fallback_result = {}
     # 성분 기반 또는 (제품+성분) 복합키 기반 일치가 없으면 제품명만으로 보완 시도
     if match_count == 0:
-        # 제품명 기반 검색은 drug_efficacy_dict (drug_raw.csv)만 사용
-        if product_name in drug_efficacy_dict:
-            fallback_text = drug_efficacy_dict[product_name]
-            fallback_match = match_efficacy(query_keywords, fallback_text)
+        if fallback_text:
+            fallback_match = next(scored)
             fallback_result = {
                 "제품명": product_name_original,
                 "보완_효능": fallback_text,
-                "일치도": fallback_match,
+                "일치도": fallback_match["일치도"],
                 "출처 DB": "drug_raw (product)",
+                "일치_점수": fallback_match["일치_점수"],
+                "키워드별_점수": fallback_match["키워드별_점수"],
             }
-            if fallback_match == "일치":
+            if fallback_match["일치도"] == "일치":
                 match_count += 1
-        else:
+        elif verbose:
             sources_checked = [
                 "fnclty_materials",
                 "healthfood_claims_composite",
@@ -232,10 +346,117 @@ def get_product_evaluation(
         "성분_효능_웹": enriched_data.get("성분_효능"),
     }
 
+    if verbose:
+        print(
+            f"✅ '{product_name_original}' 평가 완료 (원본 질문: '{original_user_query_for_display}', 내부 처리 질문: '{user_query}'): {final_judgement_text}"
+        )
+    return evaluation_output
+
+
+# --- 파이프라인을 위한 수정된 함수 ---
+def get_product_evaluation(
+    enriched_data: dict, user_query: str, original_user_query_for_display: str
+) -> dict:  # 새 인자 추가
+    # 평가 도중 참조 데이터가 교체되어도 이 평가는 시작 시점의 인스턴스로 끝까지 진행
+    ref = get_reference_data()
+    product = _lookup_product_efficacies(enriched_data, ref, get_ingredient_resolver(ref))
+
+    # user_query는 내부 처리용 (정제된) 질문임
+    query_keywords = extract_keywords_from_query(user_query)
+
+    # 성분별 효능 텍스트와 제품명 기반 보완 텍스트를 한 번에 점수 계산
+    scored = match_efficacy_ids(query_keywords, _text_ids_to_score(product), ref=ref)
+    # 질문 키워드의 기능성 색인 posting과 제품 성분 집합의 교집합 (퍼지 점수와 별도의 근거)
+    keyword_materials = get_efficacy_index(ref).matching_materials(
+        query_keywords, sources=PRODUCT_MATERIAL_SOURCES
+    )
+
+    return _build_evaluation_output(
+        enriched_data,
+        product,
+        user_query,
+        original_user_query_for_display,
+        query_keywords,
+        scored,
+        keyword_materials,
+    )
+
+
+# 📦 제품 목록 × 질문 목록 일괄 평가 (야간 컴플라이언스 점검용)
+def get_product_evaluations_batch(
+    enriched_products: List[dict],
+    user_queries: List[str],
+    original_user_queries_for_display: Optional[List[str]] = None,
+    threshold: int = 70,
+) -> List[dict]:
+    """
+    모든 (제품, 질문) 조합을 평가해 get_product_evaluation과 같은 evaluation_output 목록을
+    제품 순서 → 질문 순서로 반환합니다.
+    - 질문 키워드 추출과 기능성 색인 조회는 고유 질문마다 한 번
+    - 성분 DB 조회는 제품마다 한 번
+    - 점수 계산은 (전체 고유 키워드 × 전체 고유 효능 텍스트) rapidfuzz cdist 한 번
+    """
+    if original_user_queries_for_display is None:
+        original_user_queries_for_display = user_queries
+    if len(original_user_queries_for_display) != len(user_queries):
+        raise ValueError("original_user_queries_for_display와 user_queries의 길이가 다릅니다.")
+
+    start = time.perf_counter()
+    ref = get_reference_data()
+    resolver = get_ingredient_resolver(ref)
+    efficacy_index = get_efficacy_index(ref)
+
+    unique_queries = list(dict.fromkeys(user_queries))
+    query_keywords = {q: extract_keywords_from_query(q) for q in unique_queries}
+    keyword_materials = {
+        q: efficacy_index.matching_materials(query_keywords[q], sources=PRODUCT_MATERIAL_SOURCES)
+        for q in unique_queries
+    }
+
+    products = [_lookup_product_efficacies(data, ref, resolver) for data in enriched_products]
+    product_text_ids = [_text_ids_to_score(p) for p in products]
+
+    # 행렬의 행/열 번호: 고유 키워드, 고유 효능 텍스트 (여러 제품이 같은 원료를 공유하면 한 번만 계산)
+    unique_keywords = dict.fromkeys(kw for kws in query_keywords.values() for kw in kws)
+    unique_ids = dict.fromkeys(i for text_ids in product_text_ids for i in text_ids)
+    keyword_row = {kw: i for i, kw in enumerate(unique_keywords)}
+    text_col = {text_id: i for i, text_id in enumerate(unique_ids)}
+    scores = (
+        score_efficacy_ids(list(keyword_row), list(text_col), ref)
+        if keyword_row and text_col
+        else None
+    )
+
+    results = []
+    for enriched_data, product, text_ids in zip(enriched_products, products, product_text_ids):
+        cols = [text_col[i] for i in text_ids]
+        for user_query, original_query in zip(user_queries, original_user_queries_for_display):
+            keywords = query_keywords[user_query]
+            if scores is not None and cols:
+                sub_scores = scores[[keyword_row[kw] for kw in keywords]][:, cols]
+                scored = _judge_scores(keywords, sub_scores, threshold)
+            else:
+                scored = match_efficacy_ids(keywords, text_ids, threshold, ref)
+            results.append(
+                _build_evaluation_output(
+                    enriched_data,
+                    product,
+                    user_query,
+                    original_query,
+                    keywords,
+                    scored,
+                    keyword_materials[user_query],
+                    verbose=False,
+                )
+            )
+
+    matched = sum(1 for r in results if r["최종_판단"].startswith("사용자 질문과"))
     print(
-        f"✅ '{product_name_original}' 평가 완료 (원본 질문: '{original_user_query_for_display}', 내부 처리 질문: '{user_query}'): {final_judgement_text}"
+        f"✅ 일괄 평가 완료: 제품 {len(products)}개 × 질문 {len(user_queries)}개 = {len(results)}건 "
+        f"(일치 {matched}건, 키워드 {len(keyword_row)}개 × 효능 텍스트 {len(text_col)}개, "
+        f"{time.perf_counter() - start:.2f}s)"
     )
-    return evaluation_output
+    return results
 
 
 # 🧪 제품 평가 함수
@@ -309,3 +530,29 @@ def get_product_evaluation(
 #         if filename.endswith(".json"):
 #             filepath = os.path.join(DATA_DIR, filename)
 #             evaluate_product(filepath, query)
+
+
+# ▶️ 일괄 평가 실행 예시 (야간 컴플라이언스 점검)
+#   python -m core.claim_check_4 --queries 표준질문.txt [--products TEXT2SEARCH_data] [--output DECISION_data/batch_evaluation.json]
+if __name__ == "__main__":
+    import argparse
+    import glob
+
+    from .batch import write_json_atomic
+
+    parser = argparse.ArgumentParser(description="보강된 제품 목록 × 질문 목록 일괄 평가")
+    parser.add_argument("--products", default="TEXT2SEARCH_data", help="enriched_*.json 폴더")
+    parser.add_argument("--queries", required=True, help="질문 목록 (한 줄에 하나)")
+    parser.add_argument("--output", default=os.path.join("DECISION_data", "batch_evaluation.json"))
+    args = parser.parse_args()
+
+    enriched_products = []
+    for path in sorted(glob.glob(os.path.join(args.products, "enriched_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            enriched_products.append(json.load(f))
+    with open(args.queries, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+
+    results = get_product_evaluations_batch(enriched_products, queries)
+    write_json_atomic(args.output, results)
+    print(f"💾 저장 완료: {args.output}")
@@ -0,0 +1,172 @@
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+# 문자열 구간 오프셋 배열 타입 (unsigned 32bit: 풀 전체 길이 4G 문자까지)
+OFFSET_TYPECODE = "I"
+
+
+class StringPool:
+    """
+    중복 없는 문자열들을 하나의 연속된 str에 이어 붙이고, 각 문자열의 시작 위치를 정수 배열로 보관합니다.
+    문자열마다 생기는 파이썬 객체 헤더(약 50~80바이트)와 dict 값 슬롯이 없어지며,
+    pool[i]는 조회할 때마다 해당 구간을 잘라 새 str로 반환합니다.
+    """
+
+    def __init__(self, data: str = "", offsets: Optional[array] = None):
+        self._data = data
+        self._offsets = offsets if offsets is not None else array(OFFSET_TYPECODE, [0])
+        self._hashes: Optional[array] = None  # find()용 (hash, id) 정렬 배열, 첫 사용 시 생성
+        self._hash_ids: Optional[array] = None
+
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringPool":
+        parts: List[str] = []
+        offsets = array(OFFSET_TYPECODE, [0])
+        for text in strings:
+            parts.append(text)
+            offsets.append(offsets[-1] + len(text))
+        return cls("".join(parts), offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self._data[self._offsets[i] : self._offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def find(self, text: str) -> Optional[int]:
+        """text와 같은 문자열의 id (없으면 None). 해시 정렬 배열을 이분 탐색한 뒤 원문을 비교합니다."""
+        if self._hashes is None:
+            pairs = sorted((hash(s), i) for i, s in enumerate(self))
+            self._hash_ids = array("I", (i for _, i in pairs))
+            self._hashes = array("q", (h for h, _ in pairs))
+        h = hash(text)
+        pos = bisect_left(self._hashes, h)
+        while pos < len(self._hashes) and self._hashes[pos] == h:
+            if self[self._hash_ids[pos]] == text:
+                return self._hash_ids[pos]
+            pos += 1
+        return None
+
+    def nbytes(self) -> int:
+        """풀이 차지하는 대략적인 메모리 (문자열 본문 + 오프셋 + find 색인)"""
+        size = sys.getsizeof(self._data) + self._offsets.itemsize * len(self._offsets)
+        if self._hashes is not None:
+            size += self._hashes.itemsize * len(self._hashes)
+            size += self._hash_ids.itemsize * len(self._hash_ids)
+        return size
+
+    # --- 스냅샷 직렬화 (msgpack) ---
+    def to_payload(self) -> Dict[str, Any]:
+        return {"data": self._data, "offsets": self._offsets.tobytes()}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "StringPool":
+        offsets = array(OFFSET_TYPECODE)
+        offsets.frombytes(payload["offsets"])
+        return cls(payload["data"], offsets)
+
+
+def _intern_key(key: Hashable) -> Hashable:
+    if isinstance(key, str):
+        return sys.intern(key)
+    if isinstance(key, tuple):
+        return tuple(_intern_key(k) for k in key)
+    return key
+
+
+class CompactMapping(Mapping):
+    """
+    키 → StringPool id 매핑. dict와 같은 읽기 인터페이스(in, [], get, items ...)를 제공하며
+    값 문자열은 풀에만 한 번 저장됩니다. 키(원료명·제품명)는 sys.intern으로 공유합니다.
+    """
+
+    def __init__(self, ids: Dict[Hashable, int], pool: StringPool):
+        self._ids = ids
+        self._pool = pool
+
+    @classmethod
+    def from_dict(
+        cls, table: Dict[Hashable, str], pool: StringPool, pool_ids: Dict[str, int]
+    ) -> "CompactMapping":
+        """pool_ids: 값 문자열 → pool id (build_string_pool이 반환한 것)"""
+        ids = {_intern_key(k): pool_ids[v] for k, v in table.items()}
+        return cls(ids, pool)
+
+    def __getitem__(self, key: Hashable) -> str:
+        return self._pool[self._ids[key]]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def value_id(self, key: Hashable) -> int:
+        return self._ids[key]
+
+    def nbytes(self) -> int:
+        """키 dict와 id 정수가 차지하는 대략적인 메모리 (풀은 공유되므로 제외, 키 문자열 포함)"""
+        size = sys.getsizeof(self._ids)
+        for key, value_id in self._ids.items():
+            size += sys.getsizeof(value_id)
+            parts = key if isinstance(key, tuple) else (key,)
+            size += sum(sys.getsizeof(p) for p in parts)
+            if isinstance(key, tuple):
+                size += sys.getsizeof(key)
+        return size
+
+    # --- 스냅샷 직렬화 (msgpack: 튜플 키는 리스트로 저장) ---
+    def to_payload(self) -> Dict[str, Any]:
+        keys = [list(k) if isinstance(k, tuple) else k for k in self._ids]
+        return {"keys": keys, "ids": array("I", self._ids.values()).tobytes()}
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], pool: StringPool) -> "CompactMapping":
+        ids = array("I")
+        ids.frombytes(payload["ids"])
+        keys = (tuple(k) if isinstance(k, list) else k for k in payload["keys"])
+        return cls({_intern_key(k): i for k, i in zip(keys, ids)}, pool)
+
+
+def build_string_pool(
+    tables: Iterable[Dict[Hashable, str]]
+) -> Tuple[StringPool, Dict[str, int]]:
+    """여러 테이블의 값 문자열을 중복 없이 한 풀로 모읍니다. (풀, 값 → id)"""
+    pool_ids: Dict[str, int] = {}
+    for table in tables:
+        for value in table.values():
+            pool_ids.setdefault(value, len(pool_ids))
+    return StringPool.from_strings(pool_ids), pool_ids
+
+
+def intern_str_dict(table: Dict[str, str]) -> Dict[str, str]:
+    """키·값을 모두 intern한 dict (별칭 테이블처럼 같은 원료명이 여러 번 값으로 나오는 경우)"""
+    return {sys.intern(k): sys.intern(v) for k, v in table.items()}
+
+
+def deep_sizeof(obj: Any, _seen: Optional[set] = None) -> int:
+    """dict/list/tuple/str을 따라가며 합산한 대략적인 메모리 (공유 객체는 한 번만)"""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if hasattr(obj, "nbytes") and callable(obj.nbytes):
+        return obj.nbytes()
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    return size
@@ -1,38 +1,123 @@
 import logging
 import os
+import threading
+from typing import Any, Callable, Generic, Optional, TypeVar
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_openai.embeddings import OpenAIEmbeddings
-from langchain_chroma import Chroma
-from langchain_core.runnables import RunnableConfig
-import google.generativeai as genai
-from tavily import TavilyClient
 
 # 🔐 .env 파일에서 환경변수 불러오기
 load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
-genai.configure(api_key=GOOGLE_API_KEY)
+COHERE_API_KEY = os.getenv("COHERE_API_KEY")
+
+# 📁 프로젝트 경로 및 로컬 캐시 저장 위치
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "CACHE_data"))
+# 🧭 Chroma 벡터 DB (cromadb_indexing_0.py가 생성, RAG가 조회)
+CHROMA_PERSIST_DIR = "./chroma_db"
+CHROMA_COLLECTION_NAME = "health_collection"
 
 # Logging 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# LLM 및 벡터 임베딩 설정
-text_llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0)
+T = TypeVar("T")
+
+
+class LazyProvider(Generic[T]):
+    """
+    처음 사용되는 시점에 클라이언트를 생성하는 지연 초기화 프록시.
+    속성 접근은 생성된 실제 객체로 그대로 위임됩니다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self._name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:  # 다른 스레드가 먼저 만들었을 수 있음
+                    logger.info(f"⚙️ '{self._name}' 클라이언트 초기화 중...")
+                    self._instance = self._factory()
+        return self._instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.get(), item)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.is_initialized else "lazy"
+        return f"<LazyProvider {self._name} ({state})>"
+
+
+# LLM 및 벡터 임베딩 설정 (SDK import와 생성은 첫 사용 시점으로 미룸)
+def _build_text_llm():
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model_name="gpt-4o-mini", temperature=0)
+
+
+def _build_image_llm():
+    import google.generativeai as genai
+
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai.GenerativeModel("gemini-1.5-flash")
+
 
-image_llm = genai.GenerativeModel("gemini-1.5-flash")
-web_search_llm = TavilyClient(api_key=TAVILY_API_KEY)
+def _build_web_search_llm():
+    from tavily import TavilyClient
 
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small", dimensions=1536)
+    return TavilyClient(api_key=TAVILY_API_KEY)
 
-vector_store = Chroma(
-    collection_name="health_collection",
-    embedding_function=embeddings,
-    persist_directory="./chroma_db",
+
+def _build_async_web_search_llm():
+    from tavily import AsyncTavilyClient
+
+    return AsyncTavilyClient(api_key=TAVILY_API_KEY)
+
+
+def _build_embeddings():
+    from langchain_openai.embeddings import OpenAIEmbeddings
+
+    return OpenAIEmbeddings(model="text-embedding-3-small", dimensions=1536)
+
+
+def _build_vector_store():
+    from langchain_chroma import Chroma
+
+    return Chroma(
+        collection_name=CHROMA_COLLECTION_NAME,
+        embedding_function=embeddings.get(),
+        persist_directory=CHROMA_PERSIST_DIR,
+    )
+
+
+def _build_rerank_client():
+    import cohere
+
+    return cohere.Client(COHERE_API_KEY)
+
+
+text_llm = LazyProvider("text_llm", _build_text_llm)
+image_llm = LazyProvider("image_llm", _build_image_llm)
+web_search_llm = LazyProvider("web_search_llm", _build_web_search_llm)
+async_web_search_llm = LazyProvider(
+    "async_web_search_llm", _build_async_web_search_llm
 )
+embeddings = LazyProvider("embeddings", _build_embeddings)
+vector_store = LazyProvider("vector_store", _build_vector_store)
+rerank_client = LazyProvider("rerank_client", _build_rerank_client)
+
 
 if __name__ == "__main__":
+    from langchain_core.runnables import RunnableConfig
+
     test_prompt = "파이썬이란 무엇인가요?"
 
     # LangSmith 추적 구성
@@ -1,9 +1,11 @@
 import os
-import pandas as pd
 from dotenv import load_dotenv
 from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from langchain.schema import Document
+from core.config import CHROMA_COLLECTION_NAME, CHROMA_PERSIST_DIR
+from core.data_version import write_index_build_info
+from core.reference_data import get_reference_data
 
 
 # 문서 변환 함수들
@@ -64,26 +66,20 @@ if __name__ == "__main__":
     os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
     print("✅ OPENAI_API_KEY 로딩 완료")
 
-    fnclty_path = "csv_data/fnclty_materials_complete.csv"
-    drug_path = "csv_data/drug_raw.csv"
-    healthfood_claims_path = "csv_data/healthfood_claims_final10.csv"
+    # CSV 로딩 (claim check와 같은 ReferenceData 사용)
+    reference_data = get_reference_data()
 
-    # CSV 로딩
-    print(f"📄 CSV 파일 로딩 중: {fnclty_path}")
-    df_fnclty = pd.read_csv(fnclty_path)
+    print(f"📄 CSV 파일 로딩 중: {reference_data.fnclty_path}")
+    df_fnclty = reference_data.df_fnclty
     print(f"➡️ {len(df_fnclty)}개의 기능성 성분 로딩 완료")
 
-    print(f"📄 CSV 파일 로딩 중: {drug_path}")
-    df_drug = pd.read_csv(drug_path)
+    print(f"📄 CSV 파일 로딩 중: {reference_data.drug_path}")
+    df_drug = reference_data.df_drug
     print(f"➡️ {len(df_drug)}개의 의약품 데이터 로딩 완료")
 
-    print(f"📄 CSV 파일 로딩 중: {healthfood_claims_path}")
-    try:
-        df_healthfood_claims = pd.read_csv(healthfood_claims_path)
-        print(f"➡️ {len(df_healthfood_claims)}개의 건강기능식품 클레임 데이터 로딩 완료")
-    except FileNotFoundError:
-        print(f"❌ 오류: {healthfood_claims_path} 파일을 찾을 수 없습니다. 건너뜁니다.")
-        df_healthfood_claims = pd.DataFrame()
+    print(f"📄 CSV 파일 로딩 중: {reference_data.healthfood_claims_path}")
+    df_healthfood_claims = reference_data.df_healthfood_claims
+    print(f"➡️ {len(df_healthfood_claims)}개의 건강기능식품 클레임 데이터 로딩 완료")
 
     # 문서 변환
     print("📦 문서 리스트 생성 중...")
@@ -101,8 +97,8 @@ if __name__ == "__main__":
     print("🔧 벡터 DB 초기화 중...")
     embedding = OpenAIEmbeddings(model="text-embedding-3-small", dimensions=1536)
     vector_db = Chroma(
-        persist_directory="./chroma_db",
-        collection_name="health_collection",
+        persist_directory=CHROMA_PERSIST_DIR,
+        collection_name=CHROMA_COLLECTION_NAME,
         embedding_function=embedding,
     )
     print("✅ 벡터 DB 초기화 완료")
@@ -120,6 +116,9 @@ if __name__ == "__main__":
             break
     else:
         print("🎉 모든 문서 저장 완료")
+        # 새 build_id 기록 → 데이터 버전이 바뀌어 이전 인덱스 기준 캐시가 무효화됨
+        build_info = write_index_build_info(reference_data.fingerprint, len(all_docs))
+        print(f"🔖 인덱스 build_id: {build_info['build_id']}")
 
     # 저장된 문서 수 확인
     try:
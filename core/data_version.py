@@ -0,0 +1,86 @@
+import os
+import json
+import uuid
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .cache import make_cache_key
+from .config import CHROMA_COLLECTION_NAME, CHROMA_PERSIST_DIR
+from .reference_data import get_reference_data
+
+# 📁 cromadb_indexing_0.py가 인덱스를 다 만든 뒤 기록하는 빌드 정보
+INDEX_BUILD_INFO_PATH = os.path.join(CHROMA_PERSIST_DIR, "build_info.json")
+NO_INDEX_BUILD_ID = "no-index"
+
+_build_info_cache: Dict[str, Any] = {"stat": None, "info": {}}
+_build_info_lock = threading.Lock()
+
+
+def write_index_build_info(
+    csv_fingerprint: str, document_count: int, path: str = INDEX_BUILD_INFO_PATH
+) -> Dict[str, Any]:
+    """Chroma 인덱스 빌드가 끝났을 때 새 build_id를 기록합니다. (임시 파일 → os.replace)"""
+    from .batch import write_json_atomic
+
+    info = {
+        "build_id": uuid.uuid4().hex[:12],
+        "built_at": datetime.now().isoformat(),
+        "collection_name": CHROMA_COLLECTION_NAME,
+        "csv_fingerprint": csv_fingerprint,
+        "document_count": document_count,
+    }
+    write_json_atomic(path, info)
+    return info
+
+
+def read_index_build_info(path: str = INDEX_BUILD_INFO_PATH) -> Dict[str, Any]:
+    """기록된 빌드 정보 (없으면 빈 dict). 파일 크기/수정시각이 그대로면 다시 읽지 않습니다."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    stat = (path, st.st_size, st.st_mtime_ns)
+    if _build_info_cache["stat"] != stat:
+        with _build_info_lock:
+            if _build_info_cache["stat"] != stat:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        info = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️ 인덱스 빌드 정보를 읽지 못했습니다: {e}")
+                    info = {}
+                _build_info_cache["info"] = info
+                _build_info_cache["stat"] = stat
+    return _build_info_cache["info"]
+
+
+def get_data_version() -> str:
+    """
+    참조 데이터 버전: csv_data 내용 지문 + Chroma 인덱스 build_id의 해시 앞 16자리.
+    CSV가 바뀌거나(핫 리로드 포함) 인덱스를 다시 만들면 값이 바뀌어,
+    이 값을 키에 포함한 캐시는 TTL 없이도 정확히 그 시점에 무효화됩니다.
+    """
+    build_id = read_index_build_info().get("build_id", NO_INDEX_BUILD_ID)
+    return make_cache_key(get_reference_data().fingerprint, build_id)[:16]
+
+
+def data_version_info() -> Dict[str, Optional[str]]:
+    """단계 출력(STEP_OUTPUTS) 등에 기록할 버전 구성 요소"""
+    build_info = read_index_build_info()
+    return {
+        "data_version": get_data_version(),
+        "csv_fingerprint": get_reference_data().fingerprint,
+        "index_build_id": build_info.get("build_id", NO_INDEX_BUILD_ID),
+        "index_csv_fingerprint": build_info.get("csv_fingerprint"),
+    }
+
+
+# ▶️ 현재 데이터 버전 확인: python -m core.data_version
+if __name__ == "__main__":
+    info = data_version_info()
+    print(f"🔖 데이터 버전: {info['data_version']}")
+    print(f"  - csv_data 지문: {info['csv_fingerprint']}")
+    print(f"  - 인덱스 build_id: {info['index_build_id']}")
+    if info["index_csv_fingerprint"] not in (None, info["csv_fingerprint"]):
+        print("⚠️ 벡터 DB가 현재 csv_data와 다른 버전으로 만들어졌습니다. cromadb_indexing_0.py를 다시 실행하세요.")
@@ -0,0 +1,209 @@
+import os
+import math
+import time
+import threading
+import weakref
+from typing import Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .korean_nlp import char_ngrams, content_morphs, get_kiwi
+from .reference_data import ReferenceData, get_reference_data
+
+# ⚙️ 설정 (환경변수로 조정 가능)
+# 키워드 토큰(idf 가중) 중 이 비율 이상이 문서에 있으면 해당 키워드와 일치로 봅니다.
+KEYWORD_MATCH_COVERAGE = float(os.getenv("KEYWORD_MATCH_COVERAGE", "0.75"))
+
+SOURCE_FNCLTY = "fnclty_materials"
+SOURCE_HEALTHFOOD_CLAIMS = "healthfood_claims"
+SOURCE_DRUG = "drug_raw"
+
+
+class MaterialHit(NamedTuple):
+    name: str  # 원료명 (drug_raw는 제품명)
+    source: str
+    score: float
+    matched_keywords: Tuple[str, ...]
+    efficacy: str
+
+
+def _tokens(text: str, use_unigrams: bool) -> Set[str]:
+    """형태소(m:) + 문자 bigram(g:) 토큰. 형태소 분석기가 없으면 한 글자 키워드를 위해 unigram(u:)도 사용"""
+    tokens = {f"m:{m}" for m in content_morphs(text)}
+    tokens.update(f"g:{g}" for g in char_ngrams(text, 2))
+    if use_unigrams:
+        tokens.update(f"u:{u}" for u in char_ngrams(text, 1))
+    return tokens
+
+
+class _SourceIndex:
+    """한 출처 테이블의 역색인. 출처마다 따로 만들어 idf도 출처 안의 문서 빈도로 계산합니다."""
+
+    def __init__(self, source: str, table: Mapping[Hashable, str], use_unigrams: bool):
+        self.use_unigrams = use_unigrams
+        # (원료명, 조회 키). 효능 원문은 참조 데이터의 문자열 풀에서 필요할 때만 꺼냄
+        self.docs: List[Tuple[str, Hashable]] = []
+        self.postings: Dict[str, List[int]] = {}
+        for key, text in table.items():
+            # healthfood_claims는 (원료명, 일일섭취량) 복합 키
+            name = key[0] if source == SOURCE_HEALTHFOOD_CLAIMS else key
+            doc_id = len(self.docs)
+            self.docs.append((name, key))
+            for token in _tokens(text, use_unigrams):
+                self.postings.setdefault(token, []).append(doc_id)
+
+        doc_count = max(len(self.docs), 1)
+        self.idf = {token: math.log(1 + doc_count / len(ids)) for token, ids in self.postings.items()}
+
+    def keyword_coverage(self, keyword: str) -> Dict[int, float]:
+        """문서별로 키워드 토큰(idf 가중) 중 몇 %가 들어 있는지"""
+        tokens = _tokens(keyword, self.use_unigrams or len(keyword.strip()) == 1)
+        tokens = {t for t in tokens if t in self.idf}
+        total = sum(self.idf[t] for t in tokens)
+        coverage: Dict[int, float] = {}
+        if not total:
+            return coverage
+        for token in tokens:
+            weight = self.idf[token] / total
+            for doc_id in self.postings[token]:
+                coverage[doc_id] = coverage.get(doc_id, 0.0) + weight
+        return coverage
+
+
+class EfficacyIndex:
+    """
+    기능성 문구 → 원료 역색인.
+    fnclty(FNCLTY_CN), healthfood_claims(기능성 내용), drug_raw(efcyQesitm)의 각 행을
+    형태소·문자 n-gram 토큰으로 색인하고, 질의 키워드별 토큰 적중률(idf 가중)로 원료를 순위화합니다.
+    출처별 색인은 그 출처를 처음 조회할 때 만들므로, 조회하지 않는 출처(예: 성분 판정의 drug_raw)는
+    메모리·기동 시간을 쓰지 않고 다른 출처의 idf에도 영향을 주지 않습니다.
+    """
+
+    def __init__(self, ref: ReferenceData):
+        self._use_unigrams = get_kiwi() is None
+        self._tables: Dict[str, Mapping[Hashable, str]] = {
+            SOURCE_FNCLTY: ref.efficacy_dict,
+            SOURCE_HEALTHFOOD_CLAIMS: ref.healthfood_claims_composite_key_efficacy_dict,
+            SOURCE_DRUG: ref.drug_efficacy_dict,
+        }
+        self._sources: Dict[str, _SourceIndex] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self._tables.values())
+
+    def _source_index(self, source: str) -> _SourceIndex:
+        index = self._sources.get(source)
+        if index is None:
+            with self._lock:
+                index = self._sources.get(source)
+                if index is None:
+                    index = _SourceIndex(source, self._tables[source], self._use_unigrams)
+                    self._sources[source] = index
+        return index
+
+    def warm(self, sources: Optional[Iterable[str]] = None) -> "EfficacyIndex":
+        """주어진 출처(없으면 전체)의 색인을 미리 만듭니다."""
+        for source in self._selected_sources(sources):
+            self._source_index(source)
+        return self
+
+    def _selected_sources(self, sources: Optional[Iterable[str]]) -> List[str]:
+        if not sources:
+            return list(self._tables)
+        wanted = set(sources)
+        return [s for s in self._tables if s in wanted]
+
+    def _matched_docs(
+        self, keywords: Iterable[str], sources: Optional[Iterable[str]], min_coverage: float
+    ) -> Dict[Tuple[str, int], List[Tuple[str, float]]]:
+        """(출처, doc_id) → [(일치한 키워드, 적중률)]. sources에 없는 출처는 색인하지도 읽지도 않습니다."""
+        keywords = [kw for kw in keywords if kw and kw.strip()]
+        matched: Dict[Tuple[str, int], List[Tuple[str, float]]] = {}
+        if not keywords:
+            return matched
+        for source in self._selected_sources(sources):
+            index = self._source_index(source)
+            for keyword in keywords:
+                for doc_id, coverage in index.keyword_coverage(keyword).items():
+                    if coverage >= min_coverage - 1e-9:
+                        matched.setdefault((source, doc_id), []).append((keyword, coverage))
+        return matched
+
+    def search(
+        self,
+        keywords: Iterable[str],
+        top_k: Optional[int] = 20,
+        sources: Optional[Iterable[str]] = None,
+        min_coverage: float = KEYWORD_MATCH_COVERAGE,
+    ) -> List[MaterialHit]:
+        """
+        키워드 중 하나 이상과 일치하는 원료를 (일치 키워드 수, 점수) 순으로 반환합니다.
+        같은 출처의 같은 원료가 여러 행이면 점수가 가장 높은 행만 남깁니다.
+        """
+        best: Dict[Tuple[str, str], MaterialHit] = {}
+        for (source, doc_id), hits in self._matched_docs(keywords, sources, min_coverage).items():
+            name, key = self._sources[source].docs[doc_id]
+            hit = MaterialHit(
+                name,
+                source,
+                round(sum(c for _, c in hits), 3),
+                tuple(kw for kw, _ in hits),
+                self._tables[source][key],
+            )
+            current = best.get((source, name))
+            if current is None or hit.score > current.score:
+                best[(source, name)] = hit
+
+        ranked = sorted(best.values(), key=lambda h: (-len(h.matched_keywords), -h.score, h.name))
+        return ranked[:top_k] if top_k else ranked
+
+    def matching_materials(
+        self, keywords: Iterable[str], sources: Optional[Iterable[str]] = None
+    ) -> Set[Tuple[str, str]]:
+        """
+        키워드와 일치하는 (출처, 원료명) 집합 — 제품 성분 집합과 교집합을 구하는 용도.
+        순위와 효능 원문이 필요 없으므로 search()와 달리 MaterialHit을 만들지 않습니다.
+        """
+        materials: Set[Tuple[str, str]] = set()
+        for source, doc_id in self._matched_docs(keywords, sources, KEYWORD_MATCH_COVERAGE):
+            materials.add((source, self._sources[source].docs[doc_id][0]))
+        return materials
+
+
+# ReferenceData 인스턴스별로 한 번만 색인 (참조 데이터가 교체되면 새로 생성)
+_indexes: "weakref.WeakKeyDictionary[ReferenceData, EfficacyIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_efficacy_index(ref: Optional[ReferenceData] = None) -> EfficacyIndex:
+    ref = ref or get_reference_data()
+    index = _indexes.get(ref)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(ref)
+            if index is None:
+                index = EfficacyIndex(ref)
+                _indexes[ref] = index
+    return index
+
+
+def search_materials(
+    keywords: Iterable[str], top_k: Optional[int] = 20, sources: Optional[Iterable[str]] = None
+) -> List[MaterialHit]:
+    """예: search_materials(["간", "건강"]) → 간 건강 기능성이 있는 원료 목록"""
+    return get_efficacy_index().search(keywords, top_k=top_k, sources=sources)
+
+
+# ▶️ 실행 예시: python -m core.efficacy_index 간 건강
+if __name__ == "__main__":
+    import sys
+
+    start = time.perf_counter()
+    index = get_efficacy_index()
+    print(f"📚 기능성 색인: {len(index)}개 행 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    query = sys.argv[1:] or ["간", "건강"]
+    start = time.perf_counter()
+    hits = index.search(query, top_k=10)
+    print(f"🔍 {query} → {len(hits)}건 ({(time.perf_counter() - start) * 1000:.2f} ms)")
+    for hit in hits:
+        print(f"  [{hit.source}] {hit.name} (점수 {hit.score}, 일치 {list(hit.matched_keywords)})")
@@ -0,0 +1,195 @@
+import io
+import os
+import re
+import sys
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageOps
+
+# ⚙️ 전처리 설정 (환경변수로 조정 가능)
+IMAGE_MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1600"))
+IMAGE_OUTPUT_FORMAT = os.getenv("IMAGE_OUTPUT_FORMAT", "JPEG").upper()  # JPEG | WEBP
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+
+_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+
+@dataclass
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    size: Tuple[int, int]
+    original_size: Tuple[int, int]
+    original_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.data)
+
+    def as_gemini_part(self) -> Dict[str, object]:
+        """generate_content에 그대로 넘길 수 있는 inline 이미지 파트"""
+        return {"mime_type": self.mime_type, "data": self.data}
+
+
+def preprocessing_signature(
+    max_edge: int = IMAGE_MAX_EDGE,
+    fmt: str = IMAGE_OUTPUT_FORMAT,
+    quality: int = IMAGE_QUALITY,
+) -> str:
+    """캐시 키에 포함할 전처리 설정 문자열"""
+    return f"{fmt}:{max_edge}:{quality}"
+
+
+def _to_output_mode(image: Image.Image) -> Image.Image:
+    # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널을 지원하지 않음)
+    if image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    ):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    if image.mode not in ("RGB", "L"):
+        return image.convert("RGB")
+    return image
+
+
+def prepare_pil_image(
+    image: Image.Image,
+    original_bytes: int,
+    max_edge: int = IMAGE_MAX_EDGE,
+    fmt: str = IMAGE_OUTPUT_FORMAT,
+    quality: int = IMAGE_QUALITY,
+) -> PreparedImage:
+    """이미 열린 PIL 이미지를 축소·색상 변환 후 압축 바이트로 인코딩합니다."""
+    original_size = image.size
+    image = _to_output_mode(ImageOps.exif_transpose(image))
+    if max(image.size) > max_edge:
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, quality=quality, optimize=True)
+    return PreparedImage(
+        data=buffer.getvalue(),
+        mime_type=_MIME_TYPES[fmt],
+        size=image.size,
+        original_size=original_size,
+        original_bytes=original_bytes,
+    )
+
+
+def preprocess_image(
+    image_path: str,
+    max_edge: int = IMAGE_MAX_EDGE,
+    fmt: str = IMAGE_OUTPUT_FORMAT,
+    quality: int = IMAGE_QUALITY,
+) -> PreparedImage:
+    """
+    Gemini 업로드용 이미지 전처리.
+    JPEG는 draft 모드로 디코딩 단계에서부터 축소하고, 긴 변을 max_edge로 맞춘 뒤
+    JPEG/WebP로 재인코딩합니다. 재인코딩 결과가 원본보다 크면 원본을 그대로 사용합니다.
+    """
+    with open(image_path, "rb") as f:
+        raw = f.read()
+
+    image = Image.open(io.BytesIO(raw))
+    source_format = image.format
+    original_size = image.size
+    if source_format == "JPEG" and max(original_size) > max_edge:
+        scale = max_edge / max(original_size)
+        # draft는 요청 크기 이상을 유지하는 가장 작은 DCT 배율로 디코딩합니다.
+        image.draft(
+            "RGB",
+            (math.ceil(original_size[0] * scale), math.ceil(original_size[1] * scale)),
+        )
+
+    prepared = prepare_pil_image(image, len(raw), max_edge, fmt, quality)
+    prepared.original_size = original_size
+
+    if len(prepared.data) >= len(raw) and source_format in _MIME_TYPES:
+        if max(original_size) <= max_edge:
+            return PreparedImage(
+                data=raw,
+                mime_type=_MIME_TYPES[source_format],
+                size=original_size,
+                original_size=original_size,
+                original_bytes=len(raw),
+            )
+    return prepared
+
+
+def _normalize_claim(text: str) -> str:
+    return re.sub(r"[\s·\.\,!?;:()\[\]{}\"'“”]", "", str(text).lower())
+
+
+def compare_extractions(baseline: dict, candidate: dict) -> Dict[str, object]:
+    """원본 이미지 추출 결과 대비 전처리 이미지 추출 결과의 일치 정도"""
+    baseline_claims = {_normalize_claim(c) for c in baseline.get("효능_주장", []) or []}
+    candidate_claims = {_normalize_claim(c) for c in candidate.get("효능_주장", []) or []}
+    recall = (
+        len(baseline_claims & candidate_claims) / len(baseline_claims)
+        if baseline_claims
+        else 1.0
+    )
+    return {
+        "제품명_일치": _normalize_claim(baseline.get("제품명", ""))
+        == _normalize_claim(candidate.get("제품명", "")),
+        "효능_주장_재현율": round(recall, 3),
+    }
+
+
+def report_preprocessing(img_dir: str = "img", check_accuracy: bool = False) -> List[dict]:
+    """
+    img/ 폴더 이미지에 대해 전처리 전후 바이트 수를 출력합니다.
+    check_accuracy=True이면 원본/전처리 이미지를 각각 Gemini로 추출해 결과를 비교합니다. (API 호출 발생)
+    """
+    if check_accuracy:
+        from .text_extract_1 import extract_info_from_image
+
+    rows = []
+    for filename in sorted(os.listdir(img_dir)):
+        if not filename.lower().endswith((".png", ".jpg", ".jpeg", ".webp")):
+            continue
+        path = os.path.join(img_dir, filename)
+        prepared = preprocess_image(path)
+        row = {
+            "이미지": filename,
+            "원본_크기": prepared.original_size,
+            "전처리_크기": prepared.size,
+            "원본_bytes": prepared.original_bytes,
+            "전처리_bytes": len(prepared.data),
+            "절감_bytes": prepared.bytes_saved,
+        }
+        if check_accuracy:
+            baseline = extract_info_from_image(path, use_cache=False, preprocess=False)
+            candidate = extract_info_from_image(path, use_cache=False, preprocess=True)
+            row.update(compare_extractions(baseline, candidate))
+        rows.append(row)
+        saved_ratio = prepared.bytes_saved / prepared.original_bytes * 100
+        print(
+            f"🖼️ {filename}: {prepared.original_bytes:,} → {len(prepared.data):,} bytes ({saved_ratio:.1f}% 절감)"
+            + (
+                f" | 제품명 일치: {row['제품명_일치']}, 효능 주장 재현율: {row['효능_주장_재현율']}"
+                if check_accuracy
+                else ""
+            )
+        )
+
+    total_before = sum(r["원본_bytes"] for r in rows)
+    total_after = sum(r["전처리_bytes"] for r in rows)
+    if total_before:
+        print(
+            f"\n📊 총 {len(rows)}개 이미지: {total_before:,} → {total_after:,} bytes ({(1 - total_after / total_before) * 100:.1f}% 절감)"
+        )
+    if check_accuracy and rows:
+        name_acc = sum(r["제품명_일치"] for r in rows) / len(rows)
+        claim_recall = sum(r["효능_주장_재현율"] for r in rows) / len(rows)
+        print(f"🎯 제품명 일치율: {name_acc:.2%}, 평균 효능 주장 재현율: {claim_recall:.2%}")
+    return rows
+
+
+# ▶️ 실행 예시: python -m core.image_preprocess [--accuracy]
+if __name__ == "__main__":
+    report_preprocessing(check_accuracy="--accuracy" in sys.argv)
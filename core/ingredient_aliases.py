@@ -0,0 +1,136 @@
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+# 원료명 끝에 붙는 일반적인 제형 표현 (비교용 기본형을 만들 때 제거)
+GENERIC_SUFFIXES = ("추출물", "추출분말", "분말", "농축액", "extract", "powder")
+# 괄호 속 별칭은 이 길이(정규화 후) 이상일 때만 사용 (예: "(DG)", "(LFK)" 같은 약어는 제외)
+MIN_PAREN_ALIAS_LENGTH = 3
+
+# 닫히지 않은 괄호("피엘에이지(PLAG, 1-palmitoyl-...")도 끝까지 괄호 내용으로 취급
+_PAREN_PATTERN = re.compile(r"[(\[]([^)\]]*)(?:[)\]]|$)")
+_AND_PATTERN = re.compile(r"\s및\s")
+_NON_WORD_PATTERN = re.compile(r"[\s\W_]+")
+
+
+def normalize_ingredient_name(name: str) -> str:
+    """대소문자·공백·중점·구분자('및', '&', '/') 차이를 없앤 비교용 원료명"""
+    return _NON_WORD_PATTERN.sub("", _AND_PATTERN.sub(" ", str(name))).lower()
+
+
+def _strip_suffixes(key: str) -> str:
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in GENERIC_SUFFIXES:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                key = key[: -len(suffix)]
+                stripped = True
+    return key
+
+
+def base_ingredient_name(name: str) -> str:
+    """
+    괄호 속 부가 설명과 끝의 제형 표현(추출물·분말 등)을 뗀 기본형.
+    '밀크씨슬(실리마린)'과 '밀크씨슬 (카르두스 마리아누스) 추출물'은 모두 '밀크씨슬'이 됩니다.
+    """
+    return _strip_suffixes(normalize_ingredient_name(_PAREN_PATTERN.sub("", str(name))))
+
+
+def alias_keys(name: str) -> List[str]:
+    """
+    원료명 한 개에서 파생되는 조회 키 (구체적인 것부터):
+    전체 → 괄호 제거 → 기본형 → "/" 로 나뉜 각 부분 → 괄호 속 별칭(학명·영문명)과 그 기본형
+    """
+    name = str(name)
+    candidates = [
+        normalize_ingredient_name(name),
+        normalize_ingredient_name(_PAREN_PATTERN.sub("", name)),
+        base_ingredient_name(name),
+    ]
+    if "/" in name:
+        for part in name.split("/"):
+            candidates += [normalize_ingredient_name(part), base_ingredient_name(part)]
+    for inner in _PAREN_PATTERN.findall(name):
+        inner_key = normalize_ingredient_name(inner)
+        if len(inner_key) >= MIN_PAREN_ALIAS_LENGTH:
+            candidates += [inner_key, _strip_suffixes(inner_key)]
+
+    keys: List[str] = []
+    for key in candidates:
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def build_alias_table(
+    canonical_names: Iterable[str], synonym_names: Iterable[str] = ()
+) -> Dict[str, str]:
+    """
+    별칭(정규화 키) → DB 원료명(canonical) 테이블을 만듭니다.
+    - canonical_names: fnclty_materials_complete.csv의 APLC_RAWMTRL_NM
+    - synonym_names: healthfood_claims_final10.csv 등 다른 표기의 원료명.
+      파생 키 중 하나가 이미 어떤 canonical을 가리키면 나머지 키도 그 canonical의 별칭으로 추가합니다.
+    둘 이상의 원료를 가리키는 모호한 별칭은 제외합니다. (원료명 전체를 정규화한 키는 항상 자기 자신)
+    """
+    canonical_names = [n for n in canonical_names if isinstance(n, str) and n.strip()]
+    owners: Dict[str, List[str]] = {}
+    table: Dict[str, str] = {}
+    for name in canonical_names:
+        keys = alias_keys(name)
+        table.setdefault(keys[0], name)  # 표기만 다른 중복 원료명은 처음 것을 사용
+        for key in keys[1:]:
+            if name not in owners.setdefault(key, []):
+                owners[key].append(name)
+
+    ambiguous: Set[str] = set()
+    for key, names in owners.items():
+        if key in table:
+            continue
+        # 같은 원료의 중복 표기("밀크씨슬추출물", "밀크씨슬 추출물(Milk Thistle Extract)")는
+        # 기본형이 모두 같으므로 CSV에서 먼저 나온 원료명으로 정함
+        if len(names) == 1 or all(base_ingredient_name(n) == key for n in names):
+            table[key] = names[0]
+        else:
+            ambiguous.add(key)
+
+    for name in synonym_names:
+        if not isinstance(name, str) or not name.strip():
+            continue
+        keys = alias_keys(name)
+        canonical = next((table[k] for k in keys if k in table), None)
+        if canonical is None:
+            continue
+        for key in keys:
+            if key not in table and key not in ambiguous:
+                table[key] = canonical
+    return table
+
+
+def lookup_alias(name: str, table: Dict[str, str]) -> Optional[str]:
+    """원료명의 파생 키를 구체적인 것부터 O(1)로 조회해 DB 원료명을 반환합니다."""
+    for key in alias_keys(name):
+        canonical = table.get(key)
+        if canonical is not None:
+            return canonical
+    return None
+
+
+# ▶️ 별칭 테이블 빌드 (참조 데이터 스냅샷에 함께 저장): python -m core.ingredient_aliases
+if __name__ == "__main__":
+    import sys
+
+    from .reference_data import get_reference_data
+
+    reference_data = get_reference_data()
+    start = time.perf_counter()
+    reference_data.build_snapshot()
+    table = reference_data.ingredient_alias_dict
+    canonical_count = len(set(table.values()))
+    print(
+        f"📚 별칭 테이블 생성: 별칭 {len(table)}개 → 원료 {canonical_count}개 ({(time.perf_counter() - start) * 1000:.1f} ms)"
+    )
+
+    for query in sys.argv[1:] or ["밀크씨슬(실리마린)", "EPA/DHA 함유 유지", "카르두스 마리아누스", "은행잎"]:
+        canonical = lookup_alias(query, table)
+        print(f"{'✅' if canonical else '❌'} '{query}' → {canonical}")
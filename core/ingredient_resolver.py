@@ -0,0 +1,158 @@
+import os
+import re
+import time
+import threading
+import weakref
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from rapidfuzz import fuzz
+
+from .ingredient_aliases import base_ingredient_name, normalize_ingredient_name
+from .reference_data import ReferenceData, get_reference_data, register_reload_warmer
+
+# ⚙️ 설정 (환경변수로 조정 가능)
+INGREDIENT_MATCH_THRESHOLD = float(os.getenv("INGREDIENT_MATCH_THRESHOLD", "85"))  # 0~100
+# 기본형이 이 길이 이하인 짧은 원료명은 한 음절 차이로도 85점을 넘으므로 ("프리바이오틱스" ↔ "프로바이오틱스")
+# 더 높은 임계값을 적용합니다.
+INGREDIENT_SHORT_NAME_LENGTH = int(os.getenv("INGREDIENT_SHORT_NAME_LENGTH", "8"))
+INGREDIENT_SHORT_MATCH_THRESHOLD = float(os.getenv("INGREDIENT_SHORT_MATCH_THRESHOLD", "95"))
+INGREDIENT_INDEX_NGRAM = 3
+INGREDIENT_MAX_CANDIDATES = int(os.getenv("INGREDIENT_MAX_CANDIDATES", "30"))
+
+
+# 균주·규격 코드 ("c29", "twk10", "q10"): 이 코드가 다르면 이름이 비슷해도 다른 원료
+_CODE_PATTERN = re.compile(r"[a-z]*\d+[a-z0-9]*")
+
+
+def _codes(key: str) -> Set[str]:
+    return set(_CODE_PATTERN.findall(key))
+
+
+def _ngrams(key: str, n: int = INGREDIENT_INDEX_NGRAM) -> Set[str]:
+    if len(key) <= n:
+        return {key} if key else set()
+    return {key[i : i + n] for i in range(len(key) - n + 1)}
+
+
+class IngredientMatch(NamedTuple):
+    name: str  # DB(APLC_RAWMTRL_NM) 원료명
+    score: float
+
+
+class IngredientResolver:
+    """
+    DB 원료명에 대한 문자 trigram 역색인.
+    조회 시 trigram을 많이 공유하는 후보(INGREDIENT_MAX_CANDIDATES개)만 골라
+    rapidfuzz로 재채점하므로 원료 수와 무관하게 1ms 미만으로 응답합니다.
+    점수는 정규화 전체 이름 간 ratio와 기본형(base_ingredient_name) 간 ratio 중 큰 값이며,
+    기본형끼리의 ratio도 임계값을 넘어야 합니다. ("코엔자임Q10" ↔ 제품명 "동우코엔자임Q10" 제외)
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._bases: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._exact: Dict[str, int] = {}
+        for name in names:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            key = normalize_ingredient_name(name)
+            if key in self._exact:  # 표기만 다른 중복 원료명은 처음 것을 사용
+                continue
+            idx = len(self._names)
+            self._names.append(name)
+            self._keys.append(key)
+            self._bases.append(base_ingredient_name(name))
+            self._exact[key] = idx
+            for gram in _ngrams(key) | _ngrams(self._bases[idx]):
+                self._postings.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(
+        self, name: str, threshold: float = INGREDIENT_MATCH_THRESHOLD
+    ) -> Optional[IngredientMatch]:
+        """
+        가장 유사한 DB 원료명과 점수(0~100). threshold 미만이면 None.
+        두 기본형 중 짧은 쪽이 INGREDIENT_SHORT_NAME_LENGTH 이하이면 INGREDIENT_SHORT_MATCH_THRESHOLD를 적용합니다.
+        """
+        key = normalize_ingredient_name(name)
+        if not key:
+            return None
+        exact = self._exact.get(key)
+        if exact is not None:
+            return IngredientMatch(self._names[exact], 100.0)
+
+        base = base_ingredient_name(name)
+        codes = _codes(key)
+        counts: Counter = Counter()
+        for gram in _ngrams(key) | _ngrams(base):
+            counts.update(self._postings.get(gram, ()))
+
+        best_idx, best_score = -1, 0.0
+        for idx, _ in counts.most_common(INGREDIENT_MAX_CANDIDATES):
+            candidate_base = self._bases[idx]
+            if not base or not candidate_base or codes != _codes(self._keys[idx]):
+                continue
+            required = threshold
+            if min(len(base), len(candidate_base)) <= INGREDIENT_SHORT_NAME_LENGTH:
+                required = max(threshold, INGREDIENT_SHORT_MATCH_THRESHOLD)
+            base_score = fuzz.ratio(base, candidate_base)
+            if base_score < required:
+                continue
+            score = max(fuzz.ratio(key, self._keys[idx]), base_score)
+            if score > best_score:
+                best_idx, best_score = idx, score
+        if best_idx < 0:
+            return None
+        return IngredientMatch(self._names[best_idx], round(best_score, 1))
+
+
+# ReferenceData 인스턴스별로 한 번만 색인 (참조 데이터가 교체되면 새로 생성)
+_resolvers: "weakref.WeakKeyDictionary[ReferenceData, IngredientResolver]" = (
+    weakref.WeakKeyDictionary()
+)
+_resolvers_lock = threading.Lock()
+
+
+def get_ingredient_resolver(ref: Optional[ReferenceData] = None) -> IngredientResolver:
+    ref = ref or get_reference_data()
+    resolver = _resolvers.get(ref)
+    if resolver is None:
+        with _resolvers_lock:
+            resolver = _resolvers.get(ref)
+            if resolver is None:
+                resolver = IngredientResolver(ref.efficacy_dict.keys())
+                _resolvers[ref] = resolver
+    return resolver
+
+
+# 참조 데이터를 다시 불러올 때 교체 전에 미리 색인 (교체 직후 첫 요청이 색인 생성을 기다리지 않도록)
+register_reload_warmer(get_ingredient_resolver)
+
+
+def resolve_ingredient(
+    name: str, threshold: float = INGREDIENT_MATCH_THRESHOLD
+) -> Optional[IngredientMatch]:
+    return get_ingredient_resolver().resolve(name, threshold)
+
+
+# ▶️ 실행 예시: python -m core.ingredient_resolver "밀크씨슬(실리마린)" "홍경천 추출물"
+if __name__ == "__main__":
+    import sys
+
+    start = time.perf_counter()
+    resolver = get_ingredient_resolver()
+    print(f"📚 원료명 색인: {len(resolver)}개 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    for query in sys.argv[1:] or ["밀크씨슬(실리마린)", "홍경천 추출물", "EPA/DHA 함유 유지", "유산균"]:
+        start = time.perf_counter()
+        match = resolver.resolve(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if match:
+            print(f"✅ '{query}' → '{match.name}' (점수 {match.score}, {elapsed_ms:.3f} ms)")
+        else:
+            print(f"❌ '{query}' 일치 원료 없음 ({elapsed_ms:.3f} ms)")
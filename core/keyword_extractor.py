@@ -0,0 +1,318 @@
+import os
+import re
+import json
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from .cache import PersistentCache, make_cache_key, prompt_version
+from .config import text_llm
+from .health_lexicon import CATEGORY_KEYWORDS
+from .korean_nlp import content_morphs, get_kiwi
+from .prompt import QUERY2KEYWORD_PROMPT
+
+# ⚙️ 설정 (환경변수로 조정 가능)
+# local: 형태소 분석 + 건강 용어 사전만 / llm: 기존 LLM 호출만 / hybrid: 로컬 결과의 신뢰도가 낮을 때만 LLM
+KEYWORD_EXTRACTOR = os.getenv("KEYWORD_EXTRACTOR", "hybrid")
+KEYWORD_LOCAL_MIN_CONFIDENCE = float(os.getenv("KEYWORD_LOCAL_MIN_CONFIDENCE", "0.5"))
+MAX_QUERY_KEYWORDS = 3  # QUERY2KEYWORD_PROMPT 규칙: 1 ~ 3개
+# 프로세스 내 메모 크기 / LLM 추출 결과 영구 캐시 크기
+KEYWORD_MEMO_MAX_ENTRIES = int(os.getenv("KEYWORD_MEMO_MAX_ENTRIES", "1024"))
+KEYWORD_CACHE_MAX_ENTRIES = int(os.getenv("KEYWORD_CACHE_MAX_ENTRIES", "20000"))
+
+# 질문에 자주 나오지만 효능/기능과 무관한 명사
+QUERY_STOPWORDS = {
+    "이", "그", "저", "이거", "그거", "것", "거", "약", "제품", "영양제", "건강기능식품",
+    "효과", "효능", "도움", "광고", "사실", "정말", "진짜", "복용", "섭취", "성분",
+    "사람", "때", "데", "중", "정도", "문제", "질문", "부분", "요즘", "매일",
+}
+# 사전에는 있지만 그것만으로는 어떤 기능인지 알 수 없는 포괄적인 용어 ("건강에 좋나요?")
+GENERIC_HEALTH_TERMS = {"건강", "기능", "증상"}
+# 사전 용어 끝의 동작 표현을 떼어 어근도 사전에 넣습니다. ("면역력 강화" → "면역력")
+_ACTION_SUFFIXES = ("개선", "완화", "강화", "향상", "증진", "회복", "예방", "해소", "조절", "촉진", "유지", "감소")
+# kiwipiepy가 없을 때 어절 끝에서 떼어낼 조사
+_JOSA_SUFFIXES = sorted(
+    ["은", "는", "이", "가", "을", "를", "에", "에서", "에게", "의", "도", "로", "으로", "과", "와", "이나", "나", "랑", "이랑", "만"],
+    key=len,
+    reverse=True,
+)
+_WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+# kiwipiepy가 없을 때 명사가 아닌 어절(용언 활용형)로 보는 어미 ("좋다던데", "되나요", "먹으면")
+_PREDICATE_ENDINGS = ("다", "요", "까", "데", "면", "고", "서", "게", "지", "죠", "네", "며", "니")
+
+
+class KeywordResult(NamedTuple):
+    keywords: List[str]
+    confidence: float  # 건강 용어 사전으로 뒷받침되는 키워드 비율 (0~1)
+    method: str  # "local" | "llm"
+
+
+class HealthLexicon(NamedTuple):
+    vocabulary: Set[str]  # 공백 없는 소문자 용어·어근
+    by_length: List[str]  # vocabulary 중 2글자 이상을 긴 것부터 (질문 전체에서 구(句) 우선 탐색용)
+    display: Dict[str, str]  # 공백을 뺀 사전 용어 → 사전 표기 ("간건강" → "간 건강")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).split())
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"\s+", "", text).lower()
+
+
+def _build_lexicon() -> HealthLexicon:
+    vocabulary: Set[str] = set()
+    display: Dict[str, str] = {}
+    for terms in CATEGORY_KEYWORDS.values():
+        for term in terms:
+            display.setdefault(_compact(term), term)
+            words = [_compact(term)] + [w.lower() for w in term.split()] + content_morphs(term)
+            for word in words:
+                vocabulary.add(word)
+                for suffix in _ACTION_SUFFIXES:
+                    if word.endswith(suffix) and len(word) > len(suffix):
+                        vocabulary.add(word[: -len(suffix)])
+    # "개선", "강화" 같은 동작 표현 자체는 키워드가 아님
+    vocabulary = {
+        w for w in vocabulary if w and w not in QUERY_STOPWORDS and w not in _ACTION_SUFFIXES
+    }
+    by_length = sorted((w for w in vocabulary if len(w) >= 2), key=lambda w: (-len(w), w))
+    return HealthLexicon(vocabulary, by_length, display)
+
+
+_lexicon: Optional[HealthLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_health_lexicon() -> HealthLexicon:
+    """건강 용어 사전 (첫 호출 때 한 번 생성 — import 시점에 형태소 분석기를 로딩하지 않음)"""
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = _build_lexicon()
+    return _lexicon
+
+
+def get_health_vocabulary() -> Set[str]:
+    return get_health_lexicon().vocabulary
+
+
+# 🗃️ LLM 키워드 추출 결과 캐시: 질문 + 프롬프트 버전 + 사전 버전 기준
+QUERY2KEYWORD_PROMPT_VERSION = prompt_version(QUERY2KEYWORD_PROMPT)
+LEXICON_VERSION = prompt_version(
+    "\n".join(f"{c}:{t}" for c, terms in sorted(CATEGORY_KEYWORDS.items()) for t in terms)
+)
+# 질문 + 프롬프트/사전 버전으로 키가 정해지므로 참조 데이터 버전과는 무관
+keyword_cache = PersistentCache(
+    "query_keywords", max_entries=KEYWORD_CACHE_MAX_ENTRIES, data_versioned=False
+)
+
+
+def _strip_josa(word: str) -> str:
+    for josa in _JOSA_SUFFIXES:
+        if word.endswith(josa) and len(word) > len(josa):
+            return word[: -len(josa)]
+    return word
+
+
+def _query_tokens(query: str) -> List[str]:
+    """질문의 명사·어근 (kiwipiepy가 없으면 어절에서 조사를 뗀 형태)"""
+    if get_kiwi() is not None:
+        return content_morphs(query)
+    return [_strip_josa(w).lower() for w in _WORD_PATTERN.findall(query)]
+
+
+def _is_content_token(token: str) -> bool:
+    """신뢰도 계산에 넣을 명사 후보. kiwipiepy가 없으면 어미·길이로 용언과 한 글자 어절을 거릅니다."""
+    if get_kiwi() is not None:
+        return True
+    return (
+        len(token) >= 2
+        and not token.endswith(_PREDICATE_ENDINGS)
+        and token not in _ACTION_SUFFIXES
+        and not token.isdigit()
+    )
+
+
+def _keyword_form(word: str, lexicon: HealthLexicon) -> str:
+    """
+    키워드로 내보낼 표기. 동작 표현이 붙은 용어는 효능 문구와 표현이 달라도 맞도록 어근만 사용하고
+    ("면역력강화" → "면역력"), 띄어 쓴 사전 용어는 사전 표기로 되돌립니다. ("간건강" → "간 건강")
+    """
+    for suffix in _ACTION_SUFFIXES:
+        root = word[: -len(suffix)]
+        if word.endswith(suffix) and root in lexicon.vocabulary and root not in GENERIC_HEALTH_TERMS:
+            word = root
+            break
+    return lexicon.display.get(word, word)
+
+
+def extract_keywords_local(query: str) -> KeywordResult:
+    """
+    형태소 분석 + 건강 용어 사전(CATEGORY_KEYWORDS)으로 질문의 효능/기능 키워드를 뽑습니다.
+    1) 공백을 뺀 질문에서 가장 긴 사전 용어부터 찾음 ("간 건강", "면역력강화에")
+    2) 그 용어에 포함되지 않은 사전 명사를 보완 (이미 "간 건강"이 잡혔으면 "간", "건강"은 제외)
+    신뢰도 = 구체적인 사전 용어 수 / (사전 용어 + 사전에 없는 명사 수).
+    "건강"처럼 포괄적인 용어만 있거나 사전 용어가 없으면 낮아져 hybrid 모드에서 LLM으로 넘어갑니다.
+    """
+    tokens = [t for t in dict.fromkeys(_query_tokens(query)) if t not in QUERY_STOPWORDS]
+    lexicon = get_health_lexicon()
+
+    compact_query = _compact(query)
+    covered = [False] * len(compact_query)
+    positions: Dict[str, int] = {}
+    for word in lexicon.by_length:
+        start = compact_query.find(word)
+        while start != -1 and any(covered[start : start + len(word)]):
+            start = compact_query.find(word, start + 1)
+        if start == -1:
+            continue
+        covered[start : start + len(word)] = [True] * len(word)
+        positions[word] = start
+
+    phrases = list(positions)
+    for token in tokens:
+        if token in lexicon.vocabulary and token not in positions and not any(token in p for p in phrases):
+            found = compact_query.find(token)
+            positions[token] = found if found != -1 else len(compact_query)
+    backed = sorted(positions, key=positions.get)  # 질문에 나온 순서 유지
+
+    # 사전에 없는 명사(예: "두뇌", 원료명)는 키워드로 쓰지 않고 신뢰도 계산에만 반영합니다.
+    unbacked = [
+        t for t in tokens if _is_content_token(t) and not any(t in b or b in t for b in backed)
+    ]
+    # 구체적인 용어가 있으면 포괄적인 용어("건강")는 키워드에서 제외
+    specific = [w for w in backed if w not in GENERIC_HEALTH_TERMS]
+    keywords = list(dict.fromkeys(_keyword_form(w, lexicon) for w in (specific or backed)))
+    keywords = keywords[:MAX_QUERY_KEYWORDS]
+    if not keywords:
+        return KeywordResult(unbacked[:MAX_QUERY_KEYWORDS], 0.0, "local")
+    confidence = len(specific) / (len(backed) + len(unbacked))
+    return KeywordResult(keywords, round(confidence, 3), "local")
+
+
+def extract_keywords_llm(query: str) -> List[str]:
+    """QUERY2KEYWORD_PROMPT로 LLM에게 키워드를 추출시킵니다."""
+    prompt = QUERY2KEYWORD_PROMPT.replace("{query}", query)
+    response = text_llm.invoke(prompt)
+    try:
+        content = response.content.strip()  # strip()추가
+        return json.loads(content)
+    except Exception as e:
+        print(f"❌ 키워드 JSON 파싱 실패: {e}\n원문: {response.content}")
+        return []
+
+
+def extract_query_keywords(query: str, mode: str = None) -> KeywordResult:
+    """
+    질문에서 효능/기능 키워드를 추출합니다.
+    mode(기본 KEYWORD_EXTRACTOR)가 hybrid이면 로컬 결과의 신뢰도가
+    KEYWORD_LOCAL_MIN_CONFIDENCE 미만일 때만 LLM을 호출합니다. (LLM 결과는 keyword_cache에 저장)
+    """
+    mode = mode or KEYWORD_EXTRACTOR
+    if mode != "llm":
+        local = extract_keywords_local(query)
+        if mode == "local" or local.confidence >= KEYWORD_LOCAL_MIN_CONFIDENCE:
+            return local
+        print(f"ℹ️ 로컬 키워드 신뢰도 낮음({local.confidence}, {local.keywords}) → LLM으로 추출")
+
+    cache_key = make_cache_key(
+        "query_keywords", normalize_query(query), QUERY2KEYWORD_PROMPT_VERSION, LEXICON_VERSION
+    )
+    cached = keyword_cache.get(cache_key)
+    if cached is not None:
+        print("⚡ 같은 질문의 LLM 키워드 추출 결과를 캐시에서 사용합니다.")
+        return KeywordResult(cached, 1.0, "llm")
+    keywords = extract_keywords_llm(query)
+    if keywords:  # 파싱 실패(빈 결과)는 캐시하지 않음
+        keyword_cache.set(cache_key, keywords)
+    return KeywordResult(keywords, 1.0, "llm")
+
+
+class KeywordService:
+    """
+    질문 → 키워드 공용 서비스. claim check와 RAG 보완이 같은 질문을 두 번 추출하지 않도록
+    - 프로세스 내 LRU 메모 (같은 실행 안에서의 반복 호출)
+    - LLM 결과는 extract_query_keywords에서 keyword_cache에 저장 (실행 간 재사용)
+    - 동시에 들어온 같은 질문은 먼저 온 호출의 결과를 기다려 공유 (single-flight)
+    """
+
+    def __init__(self, max_entries: int = KEYWORD_MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[str, KeywordResult]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = {"memo_hits": 0, "shared": 0, "extractions": 0}
+
+    def get(self, query: str, mode: str = None) -> KeywordResult:
+        mode = mode or KEYWORD_EXTRACTOR
+        key = make_cache_key("query_keywords", normalize_query(query), mode)
+        with self._lock:
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+                self._counters["memo_hits"] += 1
+                return result
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self._counters["extractions"] += 1
+            else:
+                self._counters["shared"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = extract_query_keywords(normalize_query(query), mode)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if result.keywords:  # 빈 결과(파싱 실패 등)는 다음 호출에서 다시 시도
+                self._memo[key] = result
+                while len(self._memo) > self.max_entries:
+                    self._memo.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counters, "memo_size": len(self._memo), "llm_cache": keyword_cache.stats()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+
+keyword_service = KeywordService()
+
+
+def get_query_keywords(query: str, mode: str = None) -> KeywordResult:
+    """claim_check_4 / rag_service_4_1 공용 진입점 (메모·캐시·single-flight 적용)"""
+    return keyword_service.get(query, mode)
+
+
+# ▶️ 실행 예시: python -m core.keyword_extractor "이 약 먹으면 키 크는 데 도움이 되나요?"
+if __name__ == "__main__":
+    import sys
+
+    queries = sys.argv[1:] or [
+        "이 약 먹으면 키 크는 데 도움이 되나요?",
+        "이 제품은 감기 예방이나 면역력 강화에 좋을까요?",
+        "두뇌 발달이나 집중력 향상에 좋다던데 사실인가요?",
+        "입 안에 뭐 났는데 이거 먹으면 효과 있나요?",
+    ]
+    extract_keywords_local(queries[0])  # 형태소 분석기 로딩 시간 제외
+    for query in queries:
+        start = time.perf_counter()
+        result = extract_keywords_local(query)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        print(f"🔑 '{query}' → {result.keywords} (신뢰도 {result.confidence}, {elapsed_us:.0f} µs)")
@@ -0,0 +1,43 @@
+import re
+import threading
+from typing import List, Optional
+
+try:
+    from kiwipiepy import Kiwi
+except ImportError:  # 형태소 분석 없이 문자 n-gram만으로 동작
+    Kiwi = None
+
+# 색인·키워드 추출에 쓰는 품사: 일반/고유 명사, 어근, 외국어
+CONTENT_TAGS = ("NNG", "NNP", "XR", "SL")
+
+_kiwi = None
+_kiwi_lock = threading.Lock()
+_NON_WORD_PATTERN = re.compile(r"[\s\W_]+")
+
+
+def get_kiwi() -> Optional["Kiwi"]:
+    """프로세스 공용 Kiwi 인스턴스 (kiwipiepy 미설치 시 None). 모델 로딩은 첫 호출 때 한 번만 합니다."""
+    global _kiwi
+    if Kiwi is None:
+        return None
+    if _kiwi is None:
+        with _kiwi_lock:
+            if _kiwi is None:
+                _kiwi = Kiwi()
+    return _kiwi
+
+
+def content_morphs(text: str) -> List[str]:
+    """명사·어근 형태소 목록 (소문자). kiwipiepy가 없으면 빈 리스트"""
+    kiwi = get_kiwi()
+    if kiwi is None or not text:
+        return []
+    return [token.form.lower() for token in kiwi.tokenize(text) if token.tag in CONTENT_TAGS]
+
+
+def char_ngrams(text: str, n: int = 2) -> List[str]:
+    """공백·기호를 제거한 문자 n-gram (n보다 짧으면 전체 문자열 하나)"""
+    compact = _NON_WORD_PATTERN.sub("", str(text)).lower()
+    if len(compact) <= n:
+        return [compact] if compact else []
+    return [compact[i : i + n] for i in range(len(compact) - n + 1)]
@@ -0,0 +1,236 @@
+import os
+import re
+import copy
+import json
+import time
+import threading
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from rapidfuzz import fuzz
+
+from .utils import STEP_OUTPUTS_DIR
+
+# 📁 색인 대상: 일괄 보강 결과 + 과거 파이프라인 실행의 정보 보강 단계 출력
+TEXT2SEARCH_DIR = "TEXT2SEARCH_data"  # web_search_3.OUTPUT_DIR와 동일
+ENRICH_STEP_FILENAME = "enrich_product_info.json"
+
+# ⚙️ 설정 (환경변수로 조정 가능)
+PRODUCT_REUSE_THRESHOLD = float(os.getenv("PRODUCT_REUSE_THRESHOLD", "92"))  # 0~100
+PRODUCT_INDEX_NGRAM = int(os.getenv("PRODUCT_INDEX_NGRAM", "2"))
+PRODUCT_INDEX_MAX_CANDIDATES = int(os.getenv("PRODUCT_INDEX_MAX_CANDIDATES", "50"))
+# 마지막 스캔 후 이 시간(초)이 지나면 조회 시 새로 생긴 파일을 추가로 색인합니다.
+PRODUCT_INDEX_RESCAN_SECONDS = float(os.getenv("PRODUCT_INDEX_RESCAN_SECONDS", "60"))
+
+
+def normalize_product_name(name: str) -> str:
+    """대소문자·공백·구두점 차이를 없앤 비교용 제품명"""
+    return re.sub(r"[\s\W_]+", "", str(name)).lower()
+
+
+def _name_keys(name: str) -> List[str]:
+    """
+    '키즈플랜 비오클 / KIDZPLAN BIOCLE' → [대표명 키, 전체 표기 키]
+    '/'로 나뉜 표기 중 하나(예: 영문 브랜드)만 같은 다른 제품을 재사용하지 않도록
+    대표명(첫 표기) 또는 모든 표기를 이어 붙인 키로만 비교합니다.
+    """
+    parts = [normalize_product_name(part) for part in str(name).split("/")]
+    parts = [part for part in parts if part]
+    if not parts:
+        return []
+    keys = [parts[0]]
+    full_key = "".join(parts)
+    if full_key != parts[0]:
+        keys.append(full_key)
+    return keys
+
+
+def _ngrams(key: str, n: int = PRODUCT_INDEX_NGRAM) -> Set[str]:
+    if len(key) <= n:
+        return {key}
+    return {key[i : i + n] for i in range(len(key) - n + 1)}
+
+
+class ProductMatch(NamedTuple):
+    product_name: str  # 색인에 저장된 제품명
+    score: float
+    source: str  # 보강 결과 파일 경로 (프로세스 내에서 추가된 항목은 "memory")
+    enriched_info: Dict[str, Any]
+
+
+class ProductNameIndex:
+    """
+    과거 보강 결과를 제품명으로 찾는 색인.
+    문자 n-gram 역색인으로 후보를 좁힌 뒤(blocking) rapidfuzz로 재채점하므로
+    색인이 커져도 조회는 후보 수(PRODUCT_INDEX_MAX_CANDIDATES)에만 비례합니다.
+    보강 결과 본문은 메모리에 올리지 않고, 매칭된 경우에만 파일에서 읽습니다.
+    """
+
+    def __init__(
+        self,
+        text2search_dir: str = TEXT2SEARCH_DIR,
+        step_outputs_dir: str = STEP_OUTPUTS_DIR,
+    ):
+        self.text2search_dir = text2search_dir
+        self.step_outputs_dir = step_outputs_dir
+        self._keys: List[str] = []
+        self._entries: List[Tuple[str, str]] = []  # (제품명, 출처)
+        self._records: Dict[str, Dict[str, Any]] = {}  # 프로세스 내에서 add()된 결과
+        self._postings: Dict[str, List[int]] = {}
+        self._key_ids: Dict[str, int] = {}
+        self._seen_paths: Set[str] = set()
+        self._last_scan = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _add_key(self, key: str, product_name: str, source: str) -> None:
+        entry_id = self._key_ids.get(key)
+        if entry_id is not None:  # 같은 키는 최신 결과로 덮어씀
+            self._entries[entry_id] = (product_name, source)
+            return
+        entry_id = len(self._keys)
+        self._key_ids[key] = entry_id
+        self._keys.append(key)
+        self._entries.append((product_name, source))
+        for gram in _ngrams(key):
+            self._postings.setdefault(gram, []).append(entry_id)
+
+    def add(self, product_name: str, enriched_info: Dict[str, Any], aliases: Tuple[str, ...] = ()) -> None:
+        """방금 보강한 결과를 색인에 추가합니다. aliases: 원본 OCR 제품명 등 추가 표기"""
+        if not enriched_info or enriched_info.get("error"):
+            return
+        with self._lock:
+            source = f"memory:{product_name}"
+            # 호출한 쪽이 이후에 결과를 수정해도 색인 내용이 바뀌지 않도록 사본을 저장
+            self._records[source] = copy.deepcopy(enriched_info)
+            for name in (product_name, *aliases):
+                for key in _name_keys(name or ""):
+                    self._add_key(key, product_name, source)
+
+    def _candidate_paths(self) -> List[str]:
+        paths = []
+        if os.path.isdir(self.text2search_dir):
+            paths.extend(
+                os.path.join(self.text2search_dir, f)
+                for f in sorted(os.listdir(self.text2search_dir))
+                if f.startswith("enriched_") and f.endswith(".json")
+            )
+        if os.path.isdir(self.step_outputs_dir):
+            for run_id in sorted(os.listdir(self.step_outputs_dir)):
+                path = os.path.join(self.step_outputs_dir, run_id, ENRICH_STEP_FILENAME)
+                if os.path.exists(path):
+                    paths.append(path)
+        return paths
+
+    def refresh(self) -> int:
+        """아직 색인하지 않은 결과 파일을 추가로 읽습니다. 반환값: 새로 색인한 파일 수"""
+        with self._lock:
+            added = 0
+            for path in self._candidate_paths():
+                if path in self._seen_paths:
+                    continue
+                self._seen_paths.add(path)
+                record = _load_enriched_info(path)
+                if not record or not record.get("제품명"):
+                    continue
+                for key in _name_keys(record["제품명"]):
+                    self._add_key(key, record["제품명"], path)
+                added += 1
+            self._last_scan = time.monotonic()
+            return added
+
+    def _search(self, key: str) -> Optional[Tuple[int, float]]:
+        exact = self._key_ids.get(key)
+        if exact is not None:
+            return exact, 100.0
+        counts: Counter = Counter()
+        for gram in _ngrams(key):
+            counts.update(self._postings.get(gram, ()))
+        best: Optional[Tuple[int, float]] = None
+        for entry_id, _ in counts.most_common(PRODUCT_INDEX_MAX_CANDIDATES):
+            score = fuzz.ratio(key, self._keys[entry_id])
+            if best is None or score > best[1]:
+                best = (entry_id, score)
+        return best
+
+    def lookup(
+        self, *names: Optional[str], threshold: float = PRODUCT_REUSE_THRESHOLD
+    ) -> Optional[ProductMatch]:
+        """
+        주어진 제품명(대표명, 원본 OCR 제품명 등) 중 하나라도 threshold 이상으로
+        색인된 제품과 일치하면 가장 유사한 결과를 반환합니다.
+        """
+        with self._lock:
+            if time.monotonic() - self._last_scan > PRODUCT_INDEX_RESCAN_SECONDS:
+                self.refresh()
+
+            best: Optional[Tuple[int, float]] = None
+            for name in names:
+                for key in _name_keys(name or ""):
+                    found = self._search(key)
+                    if found and (best is None or found[1] > best[1]):
+                        best = found
+            if best is None or best[1] < threshold:
+                return None
+            product_name, source = self._entries[best[0]]
+            record = self._records.get(source)
+
+        if record is None:
+            record = _load_enriched_info(source)
+            if not record:
+                return None
+        else:
+            record = copy.deepcopy(record)  # 재사용하는 쪽의 수정이 색인에 남지 않도록
+        return ProductMatch(product_name, best[1], source, record)
+
+
+def _load_enriched_info(path: str) -> Optional[Dict[str, Any]]:
+    """enriched_*.json 또는 STEP_OUTPUTS/*/enrich_product_info.json에서 보강 결과를 꺼냅니다."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if os.path.basename(path) == ENRICH_STEP_FILENAME:
+        if data.get("status") != "success":
+            return None
+        data = (data.get("outputs") or {}).get("enriched_info") or {}
+    if not isinstance(data, dict) or data.get("error"):
+        return None
+    data.pop("original_효력_주장", None)  # 이전 실행 이미지의 효능 주장은 재사용하지 않음
+    return data
+
+
+_default_index: Optional[ProductNameIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_product_index() -> ProductNameIndex:
+    """프로세스 전체에서 공유하는 ProductNameIndex 인스턴스를 반환합니다."""
+    global _default_index
+    if _default_index is None:
+        with _default_lock:
+            if _default_index is None:
+                _default_index = ProductNameIndex()
+    return _default_index
+
+
+# ▶️ 실행 예시: python -m core.product_index "키즈플랜 비오클 / KIDZPLAN BIOCLE"
+if __name__ == "__main__":
+    import sys
+
+    index = get_product_index()
+    start = time.perf_counter()
+    index.refresh()
+    print(f"📚 색인 완료: {len(index)}개 키 ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    for query in sys.argv[1:] or ["키즈플랜 비오클 / KIDZPLAN BIOCLE"]:
+        start = time.perf_counter()
+        match = index.lookup(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if match:
+            print(f"✅ '{query}' → '{match.product_name}' (유사도 {match.score:.1f}, {match.source}, {elapsed_ms:.3f} ms)")
+        else:
+            print(f"❌ '{query}' 일치 항목 없음 ({elapsed_ms:.3f} ms)")
@@ -1,28 +1,39 @@
 import os
 import json
 from datetime import datetime
-from core.prompt import QUERY2KEYWORD_PROMPT
-from core.config import vector_store, text_llm
+from core.cache import PersistentCache, make_cache_key, prompt_version
+from core.config import vector_store, text_llm, rerank_client
+from core.ingredient_aliases import lookup_alias
+from core.keyword_extractor import get_query_keywords
+from core.reference_data import get_reference_data
 from langchain.schema import Document  # 반드시 포함
-import cohere
 
 SAVE_DIR = "RAG_RESULTS"
 os.makedirs(SAVE_DIR, exist_ok=True)
-# 🧠 Cohere Reranker 설정
-COHERE_API_KEY = os.getenv("COHERE_API_KEY")
-cohere_client = cohere.Client(COHERE_API_KEY)
+# 🧠 Cohere Reranker 설정 (core.config의 rerank_client가 첫 호출 시 생성)
+cohere_client = rerank_client
 
+# 성분별 효능 요약 프롬프트 (검색·재정렬된 문서 → 한 줄 요약)
+INGREDIENT_SUMMARY_PROMPT = """다음은 '{ingredient_name}' 성분과 관련된 문서들입니다.
+이 문서들의 내용을 바탕으로, 주요 효능을 한글로 간결히 요약하세요.
+
+[문서 시작]
+{context}
+[문서 끝]
+
+효능 요약:"""
+
+# 🗃️ 성분별 RAG 요약 캐시 (검색 → 재정렬 → LLM 요약 결과)
+# 벡터 DB와 csv_data에서 나온 결과이므로 데이터 버전을 키에 포함: 인덱스를 다시 만들거나
+# 참조 데이터가 바뀌면 이전 요약은 자동으로 miss 처리됩니다.
+RAG_CACHE_MAX_ENTRIES = int(os.getenv("RAG_CACHE_MAX_ENTRIES", "5000"))
+INGREDIENT_SUMMARY_PROMPT_VERSION = prompt_version(INGREDIENT_SUMMARY_PROMPT)
+rag_summary_cache = PersistentCache("rag_summary", max_entries=RAG_CACHE_MAX_ENTRIES)
 
-# 🔍 사용자 질문에서 키워드 추출
+
+# 🔍 사용자 질문에서 키워드 추출 (claim check에서 이미 추출한 질문이면 메모된 결과 재사용)
 def extract_keywords(query: str) -> list[str]:
-    prompt = QUERY2KEYWORD_PROMPT.replace("{query}", query)
-    response = text_llm.invoke(prompt)
-    try:
-        return json.loads(response.content)
-    except Exception as e:
-        print("❌ 키워드 JSON 파싱 실패:", e)
-        print("원문:", response.content)
-        return []
+    return get_query_keywords(query).keywords
 
 
 def decide_final_judgment(user_query: str, evaluation_results: list[dict]) -> str:
@@ -52,6 +63,21 @@ def decide_final_judgment(user_query: str, evaluation_results: list[dict]) -> st
         return "판단 실패: 오류 발생"
 
 
+def _keyword_match_status(efficacy: str, keywords: list[str]) -> str:
+    return "일치" if any(kw in efficacy for kw in keywords) else "불일치 또는 직접 관련 없음"
+
+
+def _evaluation_entry(ingredient_name: str, summary: dict, match_status: str) -> dict:
+    return {
+        "성분명": ingredient_name,
+        "효능": summary["효능"],
+        "일치도": match_status,
+        "출처": summary["출처"],
+        "원본문서": summary["원본문서"],
+        "재정렬문서": summary["재정렬문서"],
+    }
+
+
 def cohere_rerank(query: str, docs: list[Document], top_n: int = 5) -> list[Document]:
     contents = [doc.page_content for doc in docs]
     response = cohere_client.rerank(
@@ -78,15 +104,33 @@ def run_rag_from_ingredients(
 
     evaluation_results = []
     seen_ingredients = set()  # ✅ 중복 방지용 집합
+    ingredient_alias_dict = get_reference_data().ingredient_alias_dict
 
     for item in ingredients:
         ingredient_name = item.get("성분명", "")
-        if not ingredient_name or ingredient_name in seen_ingredients:
+        if not ingredient_name:
+            continue
+        # 별칭 테이블에 있는 성분은 DB 원료명(canonical)으로 검색 (표기 차이로 인한 검색 누락 방지)
+        search_name = lookup_alias(ingredient_name, ingredient_alias_dict) or ingredient_name
+        if search_name in seen_ingredients:
+            continue
+        seen_ingredients.add(search_name)
+
+        cache_key = make_cache_key(
+            "rag_summary", ingredient_name, search_name, strategy, INGREDIENT_SUMMARY_PROMPT_VERSION
+        )
+        cached = rag_summary_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ 캐시된 RAG 요약 사용 (성분: {ingredient_name})")
+            match_status = _keyword_match_status(cached["효능"], keywords)
+            evaluation_results.append(_evaluation_entry(ingredient_name, cached, match_status))
             continue
-        seen_ingredients.add(ingredient_name)
 
-        print(f"🧬 RAG 검색 중 (성분: {ingredient_name})")
-        retrieved_docs = retriever.invoke(ingredient_name)
+        if search_name != ingredient_name:
+            print(f"🧬 RAG 검색 중 (성분: {ingredient_name} → DB 원료명: {search_name})")
+        else:
+            print(f"🧬 RAG 검색 중 (성분: {ingredient_name})")
+        retrieved_docs = retriever.invoke(search_name)
 
         if not retrieved_docs:
             evaluation_results.append(
@@ -107,7 +151,7 @@ def run_rag_from_ingredients(
 
         # 💡 Cohere Rerank 적용
         reranked_docs = cohere_rerank(
-            query=ingredient_name,
+            query=search_name,
             docs=retrieved_docs,
             top_n=5,
         )
@@ -137,38 +181,24 @@ def run_rag_from_ingredients(
             ]
         )
 
-        prompt = f"""다음은 '{ingredient_name}' 성분과 관련된 문서들입니다.
-이 문서들의 내용을 바탕으로, 주요 효능을 한글로 간결히 요약하세요.
-
-[문서 시작]
-{context}
-[문서 끝]
-
-효능 요약:"""
+        prompt = INGREDIENT_SUMMARY_PROMPT.format(ingredient_name=ingredient_name, context=context)
 
+        summary = {
+            "효능": "정보 없음",
+            "출처": sources[:3],
+            "원본문서": [doc.page_content for doc in retrieved_docs[:5]],
+            "재정렬문서": [doc.page_content for doc in reranked_docs],
+        }
         try:
             llm_response = text_llm.invoke(prompt)
-            efficacy = llm_response.content.strip() or "정보 없음"
-            match_status = (
-                "일치"
-                if any(kw in efficacy for kw in keywords)
-                else "불일치 또는 직접 관련 없음"
-            )
+            summary["효능"] = llm_response.content.strip() or "정보 없음"
+            match_status = _keyword_match_status(summary["효능"], keywords)
+            rag_summary_cache.set(cache_key, summary)  # 질문과 무관한 부분만 저장
         except Exception as e:
             print(f"❌ LLM 오류: {e}")
-            efficacy = "정보 없음"
             match_status = "정보 없음"
 
-        evaluation_results.append(
-            {
-                "성분명": ingredient_name,
-                "효능": efficacy,
-                "일치도": match_status,
-                "출처": sources[:3],
-                "원본문서": [doc.page_content for doc in retrieved_docs[:5]],
-                "재정렬문서": [doc.page_content for doc in reranked_docs],
-            }
-        )
+        evaluation_results.append(_evaluation_entry(ingredient_name, summary, match_status))
 
     final_decision = decide_final_judgment(user_query, evaluation_results)
 
@@ -0,0 +1,515 @@
+import os
+import re
+import hashlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+from .compact_store import (
+    CompactMapping,
+    StringPool,
+    build_string_pool,
+    deep_sizeof,
+    intern_str_dict,
+)
+from .config import BASE_DIR, CACHE_DIR
+from .ingredient_aliases import build_alias_table
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import msgpack
+except ImportError:  # 스냅샷 없이 CSV를 직접 파싱하는 경로로 동작
+    msgpack = None
+
+# 📁 경로 설정
+CSV_DATA_DIR = os.path.join(BASE_DIR, "csv_data")
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "reference_snapshot.msgpack")
+# 스냅샷에 담는 테이블 구조가 바뀌면 올려서 기존 스냅샷을 무효화합니다.
+SNAPSHOT_FORMAT_VERSION = 5
+# csv_data 변경 감시 주기 (초). 0이면 감시하지 않음 (장시간 실행되는 Streamlit/서버 프로세스용)
+REFERENCE_RELOAD_INTERVAL = float(os.getenv("REFERENCE_RELOAD_INTERVAL", "0"))
+
+FNCLTY_FILENAME = "fnclty_materials_complete.csv"
+DRUG_FILENAME = "drug_raw.csv"
+HEALTHFOOD_CLAIMS_FILENAME = "healthfood_claims_final10.csv"
+
+# 📄 fnclty_materials_complete.csv: 성분 기반 효능
+MATERIAL_COL_FNCLTY = "APLC_RAWMTRL_NM"
+EFFICACY_COL_FNCLTY = "FNCLTY_CN"
+
+# 📄 drug_raw.csv: 제품명 기반 효능 (보완용)
+PRODUCT_NAME_COL_DRUG = "itemName"
+EFFICACY_COL_DRUG = "efcyQesitm"
+
+# 📄 healthfood_claims_final10.csv: (제품명, 성분명['일일섭취량']) 복합 키 기반 효능
+PRODUCT_NAME_COL_HC_CLAIMS = "제품명"
+INGREDIENT_COL_HC_CLAIMS = "일일섭취량"
+EFFICACY_COL_HC_CLAIMS = "기능성 내용"
+
+T = TypeVar("T")
+
+# efficacy_pool을 공유하는 조회 테이블 (스냅샷에는 키 목록 + 풀 id 배열로 저장)
+_POOLED_TABLES = (
+    "efficacy_dict",
+    "drug_efficacy_dict",
+    "healthfood_claims_composite_key_efficacy_dict",
+)
+
+_EFFICACY_STRIP_PATTERN = re.compile(r"[\s·\.\,!?;:()\[\]{}]")
+
+
+def normalize_efficacy_text(text: str) -> str:
+    """
+    소문자 변환 + 공백·중점(·)·특수기호 제거 (효능 텍스트 퍼지 매칭용)
+    """
+    return _EFFICACY_STRIP_PATTERN.sub("", str(text).lower())
+
+
+def _read_csv(path: str, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+    """
+    CSV를 읽어 DataFrame으로 반환합니다.
+    columns가 주어지면 해당 컬럼만 읽고, 파일이 없으면 빈 DataFrame을 반환합니다.
+    """
+    import pandas as pd  # 스냅샷만 쓰는 프로세스는 pandas import 비용을 내지 않음
+
+    try:
+        if columns is None:
+            return pd.read_csv(path)
+        wanted = set(columns)
+        return pd.read_csv(path, usecols=lambda c: c in wanted)
+    except FileNotFoundError:
+        print(f"⚠️ '{os.path.basename(path)}' 파일을 찾을 수 없습니다. 빈 테이블로 처리합니다.")
+        return pd.DataFrame(columns=columns or [])
+
+
+def _has_columns(df: "pd.DataFrame", columns: List[str], path: str) -> bool:
+    missing = [c for c in columns if c not in df.columns]
+    if missing and len(df.columns) > 0:
+        print(
+            f"⚠️ '{os.path.basename(path)}' 파일에서 필요한 컬럼({', '.join(missing)})을(를) 찾을 수 없습니다. 해당 딕셔너리가 비어있을 수 있습니다."
+        )
+    return not missing
+
+
+def _file_stat(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def compute_fingerprint(paths: List[str]) -> str:
+    """원본 CSV 내용(파일명 + 바이트)의 SHA-256 지문을 계산합니다."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8"))
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+class ReferenceData:
+    """
+    csv_data의 공공 데이터 테이블과 조회용 딕셔너리를 첫 접근 시점에 만들어 보관합니다.
+    claim check, RAG, 인덱싱이 같은 인스턴스(get_reference_data())를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        csv_dir: str = CSV_DATA_DIR,
+        snapshot_path: Optional[str] = SNAPSHOT_PATH,
+    ):
+        self.csv_dir = csv_dir
+        self.fnclty_path = os.path.join(csv_dir, FNCLTY_FILENAME)
+        self.drug_path = os.path.join(csv_dir, DRUG_FILENAME)
+        self.healthfood_claims_path = os.path.join(csv_dir, HEALTHFOOD_CLAIMS_FILENAME)
+        # msgpack이 없으면 스냅샷을 사용하지 않고 CSV에서 바로 생성
+        self.snapshot_path = snapshot_path if msgpack is not None else None
+        self._cache: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        # 생성 시점의 CSV 크기/수정시각 (has_source_changes 비교 기준)
+        self.source_stats = [_file_stat(p) for p in self.source_paths]
+
+    @property
+    def source_paths(self) -> List[str]:
+        return [self.fnclty_path, self.drug_path, self.healthfood_claims_path]
+
+    @property
+    def fingerprint(self) -> str:
+        """원본 CSV 내용 지문. 스냅샷을 불러왔다면 스냅샷에 기록된 값을 그대로 사용합니다."""
+        return self._cached(
+            "fingerprint", lambda: compute_fingerprint(self.source_paths)
+        )
+
+    def has_source_changes(self) -> bool:
+        """생성 이후 csv_data가 바뀌었는지. 크기/수정시각이 같으면 내용 해시 계산을 생략합니다."""
+        current_stats = [_file_stat(p) for p in self.source_paths]
+        if current_stats == self.source_stats:
+            return False
+        known = self._cache.get("fingerprint")
+        if known is not None and compute_fingerprint(self.source_paths) == known:
+            self.source_stats = current_stats  # 내용은 같고 수정시각만 바뀐 경우
+            return False
+        return True
+
+    def _cached(self, name: str, builder: Callable[[], T]) -> T:
+        if name not in self._cache:
+            with self._lock:
+                if name not in self._cache:
+                    self._cache[name] = builder()
+        return self._cache[name]  # type: ignore[return-value]
+
+    # --- 원본 테이블 (인덱싱 등 전체 컬럼이 필요한 경우) ---
+    @property
+    def df_fnclty(self) -> "pd.DataFrame":
+        return self._cached("df_fnclty", lambda: _read_csv(self.fnclty_path))
+
+    @property
+    def df_drug(self) -> "pd.DataFrame":
+        return self._cached("df_drug", lambda: _read_csv(self.drug_path))
+
+    @property
+    def df_healthfood_claims(self) -> "pd.DataFrame":
+        return self._cached(
+            "df_healthfood_claims", lambda: _read_csv(self.healthfood_claims_path)
+        )
+
+    # --- 조회용 테이블 (필요한 컬럼만 읽어서 생성, 효능 원문은 StringPool 한 곳에만 저장) ---
+    @property
+    def efficacy_dict(self) -> Mapping[str, str]:
+        return self._lookup_tables["efficacy_dict"]
+
+    @property
+    def drug_efficacy_dict(self) -> Mapping[str, str]:
+        return self._lookup_tables["drug_efficacy_dict"]
+
+    @property
+    def healthfood_claims_composite_key_efficacy_dict(
+        self,
+    ) -> Mapping[Tuple[str, str], str]:
+        return self._lookup_tables["healthfood_claims_composite_key_efficacy_dict"]
+
+    @property
+    def efficacy_pool(self) -> StringPool:
+        """위 세 테이블이 공유하는 효능 원문 풀 (중복 제거)"""
+        return self._lookup_tables["efficacy_pool"]
+
+    @property
+    def normalized_efficacy_pool(self) -> StringPool:
+        """efficacy_pool과 같은 순서의 normalize_efficacy_text 결과 (로딩 시 한 번만 계산)"""
+        return self._lookup_tables["normalized_efficacy_pool"]
+
+    @property
+    def ingredient_alias_dict(self) -> Dict[str, str]:
+        """원료명 별칭(정규화 키) → efficacy_dict의 원료명. (core.ingredient_aliases.lookup_alias로 조회)"""
+        return self._lookup_tables["ingredient_alias_dict"]
+
+    def normalized_efficacy(self, text: str) -> str:
+        text_id = self.efficacy_pool.find(text)
+        if text_id is None:  # 참조 데이터에 없는 텍스트 (웹 결과 등)
+            return normalize_efficacy_text(text)
+        return self.normalized_efficacy_pool[text_id]
+
+    def memory_report(self) -> Dict[str, int]:
+        """조회 테이블별 대략적인 메모리 사용량 (바이트). 풀은 테이블과 별도로 집계합니다."""
+        return {name: deep_sizeof(table) for name, table in self._lookup_tables.items()}
+
+    @property
+    def _lookup_tables(self) -> Dict[str, Any]:
+        return self._cached("lookup_tables", self._load_lookup_tables)
+
+    def _load_lookup_tables(self) -> Dict[str, Any]:
+        """스냅샷이 유효하면 스냅샷에서, 아니면 CSV에서 조회 테이블을 만들고 스냅샷을 갱신합니다."""
+        if self.snapshot_path:
+            tables = self._read_snapshot()
+            if tables is not None:
+                return tables
+
+        # CSV를 읽기 전에 크기/수정시각과 지문을 확정 (빌드 중 CSV가 바뀌면 다음 로딩 때 불일치로 감지)
+        source_stats, fingerprint = self._capture_sources()
+        tables = self._build_lookup_tables()
+        if self.snapshot_path:
+            self._write_snapshot(tables, source_stats, fingerprint)
+        return tables
+
+    def _capture_sources(self) -> Tuple[List[Optional[List[int]]], str]:
+        """빌드 직전의 CSV 크기/수정시각과 내용 지문. 스냅샷에는 반드시 이 값을 기록합니다."""
+        source_stats = [_file_stat(p) for p in self.source_paths]
+        fingerprint = compute_fingerprint(self.source_paths)
+        with self._lock:
+            self._cache.setdefault("fingerprint", fingerprint)
+        return source_stats, fingerprint
+
+    def _build_lookup_tables(self) -> Dict[str, Any]:
+        raw = {
+            "efficacy_dict": self._build_efficacy_dict(),
+            "drug_efficacy_dict": self._build_drug_efficacy_dict(),
+            "healthfood_claims_composite_key_efficacy_dict": self._build_healthfood_claims_dict(),
+        }
+        pool, pool_ids = build_string_pool(raw.values())
+        tables: Dict[str, Any] = {
+            name: CompactMapping.from_dict(table, pool, pool_ids) for name, table in raw.items()
+        }
+        tables["efficacy_pool"] = pool
+        tables["normalized_efficacy_pool"] = StringPool.from_strings(
+            normalize_efficacy_text(text) for text in pool_ids
+        )
+        # healthfood_claims의 원료명 표기는 fnclty 원료명의 별칭 출처로 사용
+        tables["ingredient_alias_dict"] = intern_str_dict(
+            build_alias_table(
+                raw["efficacy_dict"].keys(),
+                (product for product, _ in raw["healthfood_claims_composite_key_efficacy_dict"]),
+            )
+        )
+        return tables
+
+    # --- 컴파일된 스냅샷 (msgpack) ---
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                payload = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ 참조 데이터 스냅샷을 읽지 못했습니다. CSV에서 다시 생성합니다: {e}")
+            return None
+
+        if payload.get("format") != SNAPSHOT_FORMAT_VERSION:
+            return None
+
+        # CSV 파일 크기/수정시각이 그대로면 내용 해시 계산을 생략
+        current_stats = [_file_stat(p) for p in self.source_paths]
+        if current_stats != payload.get("source_stats"):
+            if compute_fingerprint(self.source_paths) != payload.get("fingerprint"):
+                print("🔄 csv_data 변경이 감지되어 참조 데이터 스냅샷을 다시 생성합니다.")
+                return None
+
+        with self._lock:
+            self._cache.setdefault("fingerprint", payload["fingerprint"])
+        tables = self._unpack_tables(payload["tables"])
+        if current_stats != payload.get("source_stats"):
+            # 내용은 같고 수정시각만 바뀐 경우: 다음 로딩부터 해시 계산을 생략하도록 갱신
+            self._write_snapshot(tables, current_stats, payload["fingerprint"])
+        return tables
+
+    def _write_snapshot(
+        self,
+        tables: Dict[str, Any],
+        source_stats: List[Optional[List[int]]],
+        fingerprint: str,
+    ) -> None:
+        """source_stats/fingerprint는 tables를 만들기 전에 확인한 값 (저장 시점에 다시 읽지 않음)"""
+        payload = {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "source_stats": source_stats,
+            "tables": self._pack_tables(tables),
+        }
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(msgpack.packb(payload, use_bin_type=True))
+            os.replace(tmp_path, self.snapshot_path)  # 원자적 교체
+        except OSError as e:
+            print(f"⚠️ 참조 데이터 스냅샷 저장 실패: {e}")
+
+    @staticmethod
+    def _pack_tables(tables: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            name: table if isinstance(table, dict) else table.to_payload()
+            for name, table in tables.items()
+        }
+
+    @staticmethod
+    def _unpack_tables(packed: Dict[str, Any]) -> Dict[str, Any]:
+        pool = StringPool.from_payload(packed["efficacy_pool"])
+        tables: Dict[str, Any] = {
+            name: CompactMapping.from_payload(packed[name], pool)
+            for name in _POOLED_TABLES
+        }
+        tables["efficacy_pool"] = pool
+        tables["normalized_efficacy_pool"] = StringPool.from_payload(
+            packed["normalized_efficacy_pool"]
+        )
+        tables["ingredient_alias_dict"] = intern_str_dict(packed["ingredient_alias_dict"])
+        return tables
+
+    def build_snapshot(self) -> Dict[str, Any]:
+        """CSV에서 조회 테이블을 새로 만들어 스냅샷으로 저장합니다. (빌드 단계용)"""
+        if not self.snapshot_path:
+            raise RuntimeError("msgpack이 설치되어 있지 않아 스냅샷을 만들 수 없습니다.")
+        source_stats, fingerprint = self._capture_sources()
+        tables = self._build_lookup_tables()
+        self._write_snapshot(tables, source_stats, fingerprint)
+        with self._lock:
+            self._cache["lookup_tables"] = tables
+        return tables
+
+    def _build_efficacy_dict(self) -> Dict[str, str]:
+        columns = [MATERIAL_COL_FNCLTY, EFFICACY_COL_FNCLTY]
+        df = _read_csv(self.fnclty_path, columns)
+        if not _has_columns(df, columns, self.fnclty_path):
+            return {}
+        df = df.dropna(subset=columns)  # astype(str)가 NaN을 "nan" 문자열로 바꾸기 전에 제외
+        return dict(
+            zip(
+                df[MATERIAL_COL_FNCLTY].astype(str),
+                df[EFFICACY_COL_FNCLTY].astype(str),
+            )
+        )
+
+    def _build_drug_efficacy_dict(self) -> Dict[str, str]:
+        columns = [PRODUCT_NAME_COL_DRUG, EFFICACY_COL_DRUG]
+        df = _read_csv(self.drug_path, columns)
+        if not _has_columns(df, columns, self.drug_path):
+            return {}
+        df = df.dropna(subset=columns)
+        return dict(
+            zip(
+                df[PRODUCT_NAME_COL_DRUG].astype(str),
+                df[EFFICACY_COL_DRUG].astype(str),
+            )
+        )
+
+    def _build_healthfood_claims_dict(self) -> Dict[Tuple[str, str], str]:
+        columns = [
+            PRODUCT_NAME_COL_HC_CLAIMS,
+            INGREDIENT_COL_HC_CLAIMS,
+            EFFICACY_COL_HC_CLAIMS,
+        ]
+        df = _read_csv(self.healthfood_claims_path, columns)
+        if not _has_columns(df, columns, self.healthfood_claims_path):
+            return {}
+        df = df.dropna(subset=columns)
+
+        product_keys = df[PRODUCT_NAME_COL_HC_CLAIMS].astype(str).str.strip()
+        # '일일섭취량' 컬럼 값을 성분명으로 사용
+        ingredient_keys = df[INGREDIENT_COL_HC_CLAIMS].astype(str).str.strip()
+        efficacy_values = df[EFFICACY_COL_HC_CLAIMS].astype(str)
+
+        # 제품명과 성분명(일일섭취량)이 모두 유효한 행만 사용
+        valid = (product_keys != "") & (ingredient_keys != "")
+        return dict(
+            zip(
+                zip(product_keys[valid], ingredient_keys[valid]),
+                efficacy_values[valid],
+            )
+        )
+
+
+_default_reference_data: Optional[ReferenceData] = None
+_default_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_watcher_lock = threading.Lock()
+_reload_warmers: List[Callable[[ReferenceData], Any]] = []
+_watcher: Optional[threading.Thread] = None
+
+
+def get_reference_data() -> ReferenceData:
+    """
+    프로세스 전체에서 공유하는 ReferenceData 인스턴스를 반환합니다.
+    참조 데이터가 교체되어도 이미 받은 인스턴스는 그대로 유효하므로,
+    요청(평가) 하나는 시작할 때 받은 인스턴스를 끝까지 사용해야 합니다.
+    """
+    global _default_reference_data
+    if _default_reference_data is None:
+        with _default_lock:
+            if _default_reference_data is None:
+                _default_reference_data = ReferenceData()
+        if REFERENCE_RELOAD_INTERVAL > 0:
+            start_reference_watcher()
+    return _default_reference_data
+
+
+def register_reload_warmer(warmer: Callable[[ReferenceData], Any]) -> None:
+    """새 참조 데이터로 교체하기 전에 미리 만들어 둘 파생 색인 (예: get_ingredient_resolver)"""
+    if warmer not in _reload_warmers:
+        _reload_warmers.append(warmer)
+
+
+def reload_reference_data(force: bool = False) -> bool:
+    """
+    csv_data가 바뀌었으면(force=True면 무조건) 새 ReferenceData를 만들고
+    조회 테이블·파생 색인을 모두 준비한 뒤 공유 인스턴스를 원자적으로 교체합니다.
+    빌드 중 오류가 나면 기존 인스턴스를 유지합니다. 교체했으면 True
+    """
+    global _default_reference_data
+    with _reload_lock:  # 동시에 여러 번 빌드하지 않음
+        current = get_reference_data()
+        if not force and not current.has_source_changes():
+            return False
+
+        start = time.perf_counter()
+        try:
+            candidate = ReferenceData(current.csv_dir, current.snapshot_path)
+            candidate._lookup_tables  # 스냅샷이 오래되었으면 CSV에서 다시 생성
+            for warmer in _reload_warmers:
+                warmer(candidate)
+        except Exception as e:
+            print(f"❌ 참조 데이터 다시 불러오기 실패, 기존 데이터를 계속 사용합니다: {e}")
+            return False
+
+        if not force and candidate.fingerprint == current.fingerprint:
+            current.source_stats = candidate.source_stats
+            return False
+        with _default_lock:
+            _default_reference_data = candidate
+    print(
+        f"🔄 참조 데이터 교체 완료: {current.fingerprint[:12]} → {candidate.fingerprint[:12]} "
+        f"({time.perf_counter() - start:.2f}초)"
+    )
+    return True
+
+
+def _watch_reference_data(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        try:
+            reload_reference_data()
+        except Exception as e:  # 감시 스레드는 계속 유지
+            print(f"⚠️ 참조 데이터 변경 감시 오류: {e}")
+
+
+def start_reference_watcher(interval: float = REFERENCE_RELOAD_INTERVAL) -> None:
+    """csv_data를 interval초마다 확인해 바뀌었으면 백그라운드에서 다시 불러오는 데몬 스레드 (프로세스당 1개)"""
+    global _watcher
+    if interval <= 0:
+        return
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = threading.Thread(
+                target=_watch_reference_data,
+                args=(interval,),
+                name="reference-data-watcher",
+                daemon=True,
+            )
+            _watcher.start()
+            print(f"👀 csv_data 변경 감시 시작 ({interval:.0f}초 간격)")
+
+
+# ▶️ 스냅샷 빌드: python -m core.reference_data
+if __name__ == "__main__":
+    reference_data = ReferenceData()
+
+    start = time.perf_counter()
+    built = reference_data.build_snapshot()
+    print(
+        f"📦 스냅샷 생성 완료: {reference_data.snapshot_path} ({time.perf_counter() - start:.3f}초)"
+    )
+    print(f"🔑 지문: {reference_data.fingerprint}")
+    memory = reference_data.memory_report()
+    for name, table in built.items():
+        print(f"  - {name}: {len(table)}건, {memory[name] / 1024:.1f} KB")
+    print(f"🧠 조회 테이블 합계: {sum(memory.values()) / 1024:.1f} KB")
+
+    start = time.perf_counter()
+    ReferenceData().efficacy_dict
+    print(f"⚡ 스냅샷 로딩 시간: {(time.perf_counter() - start) * 1000:.1f}ms")
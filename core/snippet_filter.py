@@ -0,0 +1,183 @@
+import os
+import re
+from typing import Callable, List, Optional, Set
+from urllib.parse import urlparse
+
+# ⚙️ 도메인 허용/차단 목록 (쉼표 구분 환경변수로 덮어쓸 수 있음)
+# WEB2INGREDIENT_PROMPT가 배제하라고 지시하는 블로그·쇼핑몰·커뮤니티를 LLM 호출 전에 걸러냅니다.
+DEFAULT_DENY_DOMAINS = [
+    "blog.naver.com",
+    "cafe.naver.com",
+    "post.naver.com",
+    "smartstore.naver.com",
+    "shopping.naver.com",
+    "tistory.com",
+    "brunch.co.kr",
+    "blog.daum.net",
+    "cafe.daum.net",
+    "coupang.com",
+    "11st.co.kr",
+    "gmarket.co.kr",
+    "auction.co.kr",
+    "ssg.com",
+    "lotteon.com",
+    "oliveyoung.co.kr",
+    "iherb.com",
+    "instagram.com",
+    "facebook.com",
+    "youtube.com",
+    "dcinside.com",
+    "theqoo.net",
+    "clien.net",
+]
+DEFAULT_ALLOW_DOMAINS = [
+    "go.kr",  # 식약처·식품안전나라 등 공공기관
+    "or.kr",
+    "ac.kr",
+    "health.kr",
+    "nih.gov",
+    "who.int",
+    "kormedi.com",
+    "amc.seoul.kr",
+    "snuh.org",
+]
+
+
+def _domains_from_env(name: str, default: List[str]) -> List[str]:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [d.strip().lower() for d in value.split(",") if d.strip()]
+
+
+SEARCH_DENY_DOMAINS = _domains_from_env("SEARCH_DENY_DOMAINS", DEFAULT_DENY_DOMAINS)
+SEARCH_ALLOW_DOMAINS = _domains_from_env("SEARCH_ALLOW_DOMAINS", DEFAULT_ALLOW_DOMAINS)
+# drop: 차단 도메인 결과 제거 / demote: 맨 뒤로 보내 토큰 예산에서 가장 먼저 잘리게 함
+# (drop이라도 결과가 전부 차단 도메인이면 제거하지 않고 demote처럼 남김 — 웹 요약 실패 방지)
+SEARCH_DENY_MODE = os.getenv("SEARCH_DENY_MODE", "drop")
+SNIPPET_SHINGLE_SIZE = int(os.getenv("SNIPPET_SHINGLE_SIZE", "5"))
+SNIPPET_DUPLICATE_THRESHOLD = float(os.getenv("SNIPPET_DUPLICATE_THRESHOLD", "0.8"))
+SEARCH_TOKEN_BUDGET = int(os.getenv("SEARCH_TOKEN_BUDGET", "3000"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")  # gpt-4o 계열
+
+
+def _host(url: Optional[str]) -> str:
+    if not url:
+        return ""
+    return (urlparse(url).hostname or "").lower()
+
+
+def _matches(host: str, domains: List[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def domain_rank(url: Optional[str]) -> int:
+    """0: 허용(신뢰) 도메인, 1: 일반, 2: 차단 도메인"""
+    host = _host(url)
+    if host and _matches(host, SEARCH_DENY_DOMAINS):
+        return 2
+    if host and _matches(host, SEARCH_ALLOW_DOMAINS):
+        return 0
+    return 1
+
+
+def _shingles(text: str, size: int = SNIPPET_SHINGLE_SIZE) -> Set[str]:
+    normalized = re.sub(r"\s+", "", text.lower())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def filter_search_results(results: List[dict]) -> List[dict]:
+    """
+    검색 결과를 LLM에 넘기기 전에 결정적으로 정리합니다.
+    1) 도메인 순위로 안정 정렬 (신뢰 도메인 우선), 차단 도메인은 제거 또는 후순위
+       단, 제거하면 아무것도 남지 않는 경우에는 제거하지 않습니다.
+    2) 문자 shingle Jaccard 유사도가 임계값 이상인 스니펫은 앞선(순위가 높은) 것만 유지
+    """
+    ranked = sorted(results, key=lambda r: domain_rank(r.get("url")))
+    if SEARCH_DENY_MODE == "drop":
+        allowed = [r for r in ranked if domain_rank(r.get("url")) < 2]
+        if allowed or not ranked:
+            ranked = allowed
+        else:
+            print(f"⚠️ 검색 결과 {len(ranked)}건이 모두 차단 도메인입니다. 제거하지 않고 사용합니다.")
+
+    kept: List[dict] = []
+    kept_shingles: List[Set[str]] = []
+    for res in ranked:
+        shingles = _shingles(res.get("content") or "")
+        if any(
+            _jaccard(shingles, other) >= SNIPPET_DUPLICATE_THRESHOLD
+            for other in kept_shingles
+        ):
+            continue
+        kept.append(res)
+        kept_shingles.append(shingles)
+    return kept
+
+
+_encoding = None
+
+
+def _get_token_functions() -> "tuple[Callable[[str], list], Callable[[list], str]]":
+    """tiktoken 인코더 (없으면 문자 2개 ≈ 1토큰으로 근사)"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:  # 미설치 또는 인코딩 파일 다운로드 실패
+            print(f"⚠️ tiktoken을 사용할 수 없어 문자 수 기반으로 토큰을 근사합니다: {e}")
+            _encoding = False
+    if _encoding:
+        return _encoding.encode, _encoding.decode
+    return (
+        lambda text: [text[i : i + 2] for i in range(0, len(text), 2)],
+        lambda tokens: "".join(tokens),
+    )
+
+
+def count_tokens(text: str) -> int:
+    encode, _ = _get_token_functions()
+    return len(encode(text))
+
+
+def trim_to_token_budget(
+    results: List[dict],
+    format_result: Callable[[dict], str],
+    budget: int = SEARCH_TOKEN_BUDGET,
+    min_tail_tokens: int = 50,
+) -> List[str]:
+    """
+    순서대로 결과를 format_result로 문단화해 담다가 예산을 넘으면 멈춥니다.
+    남은 예산이 min_tail_tokens 이상이면 마지막 결과는 본문(content)만 토큰 경계에서 잘라
+    제목과 출처 URL은 유지한 채 포함합니다.
+    """
+    encode, decode = _get_token_functions()
+    parts: List[str] = []
+    used = 0
+    for res in results:
+        part = format_result(res)
+        part_tokens = len(encode(part))
+        if used + part_tokens <= budget:
+            parts.append(part)
+            used += part_tokens
+            continue
+
+        remaining = budget - used
+        content_tokens = encode(res.get("content") or "")
+        overhead = part_tokens - len(content_tokens)  # 제목·출처 등 본문 외 토큰
+        keep = remaining - overhead - 1  # 말줄임표(" …") 몫
+        if keep >= min_tail_tokens:
+            truncated = dict(res, content=decode(content_tokens[:keep]).rstrip() + " …")
+            parts.append(format_result(truncated))
+        break
+    return parts
@@ -1,18 +1,49 @@
+import io
 import os
 import json
 import re
-from PIL import Image
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from PIL import Image, ImageOps
 from dotenv import load_dotenv
 from .config import image_llm # 앞에 . 을 추가합니다.
 from .prompt import IMG2TEXT_PROMPT # 앞에 . 을 추가합니다.
+from .cache import PersistentCache, hash_bytes, make_cache_key, prompt_version
+from .image_preprocess import (
+    prepare_pil_image,
+    preprocess_image,
+    preprocessing_signature,
+)
+from .batch import BatchStats, JsonlWriter, RateLimiter, read_jsonl
 
 # 🔐 환경변수 로드
 load_dotenv()
 
 IMG_DIR = "img"
 OUTPUT_PATH = "IMG2TEXT_data/result_all.json"
+RESULT_JSONL_PATH = "IMG2TEXT_data/result_all.jsonl"  # 일괄 추출 중간 결과 (이어쓰기용)
 os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
 
+# ⚙️ 일괄 추출 동시성 / 초당 호출 수 제한
+IMG2TEXT_MAX_WORKERS = int(os.getenv("IMG2TEXT_MAX_WORKERS", "4"))
+IMG2TEXT_RATE_LIMIT = float(os.getenv("IMG2TEXT_RATE_LIMIT", "2"))
+
+# 🧩 긴 상세페이지 타일 분할 설정
+TILE_ASPECT_THRESHOLD = float(os.getenv("TILE_ASPECT_THRESHOLD", "3.0"))  # 세로/가로 비율
+TILE_ASPECT_RATIO = float(os.getenv("TILE_ASPECT_RATIO", "1.5"))  # 타일 높이 = 폭 × 비율
+TILE_OVERLAP_RATIO = float(os.getenv("TILE_OVERLAP_RATIO", "0.15"))
+TILE_MAX_WORKERS = int(os.getenv("TILE_MAX_WORKERS", "4"))
+
+# 🗃️ 이미지 추출 결과 캐시 (이미지 바이트 SHA-256 + 프롬프트 버전 기준)
+IMG2TEXT_PROMPT_VERSION = prompt_version(IMG2TEXT_PROMPT)
+IMG2TEXT_CACHE_MAX_ENTRIES = int(os.getenv("IMG2TEXT_CACHE_MAX_ENTRIES", "5000"))
+# 이미지 → 텍스트 결과는 csv_data/벡터 인덱스와 무관하므로 데이터 버전이 바뀌어도 유지
+image_extraction_cache = PersistentCache(
+    "img2text", max_entries=IMG2TEXT_CACHE_MAX_ENTRIES, data_versioned=False
+)
+
 
 # 🖼️ 이미지 로드
 def load_image(image_path: str) -> Image.Image:
@@ -27,46 +58,340 @@ def extract_json_string(text: str) -> str:
     return text.strip()
 
 
-# 📤 LLM 호출 및 결과 추출
-def extract_info_from_image(image_path: str) -> dict:
-    image = load_image(image_path)
+def image_cache_key(image_bytes: bytes, preprocess: bool = True) -> str:
+    return make_cache_key(
+        "img2text",
+        hash_bytes(image_bytes),
+        IMG2TEXT_PROMPT_VERSION,
+        preprocessing_signature() if preprocess else "original",
+    )
+
+
+def _generate_with_cache(
+    cache_key: str,
+    build_image_part: Callable[[], Any],
+    label: str,
+    use_cache: bool,
+    limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """
+    캐시를 확인한 뒤 없으면 Gemini를 호출하고, 파싱에 성공한 결과만 캐시에 저장합니다.
+    limiter는 실제 Gemini 호출 직전에만 획득합니다. (캐시 적중은 호출 수에 포함하지 않음)
+    """
+    if use_cache:
+        cached = image_extraction_cache.get(cache_key)
+        if cached is not None:
+            print(f"⚡ 캐시된 추출 결과 사용: {label}")
+            return cached
+
     prompt_text = IMG2TEXT_PROMPT
-    response = image_llm.generate_content([prompt_text, image])
+    image_part = build_image_part()
+    if limiter is not None:
+        limiter.acquire()
+    response = image_llm.generate_content([prompt_text, image_part])
     raw_text = response.text
     cleaned = extract_json_string(raw_text)
 
     try:
         data = json.loads(cleaned)
-        data["이미지"] = os.path.basename(image_path)  # 파일명 포함
-        return data
     except json.JSONDecodeError:
-        print(f"❌ JSON 파싱 실패: {os.path.basename(image_path)}")
+        print(f"❌ JSON 파싱 실패: {label}")
         print("응답:\n", raw_text)
         return {}
 
+    # 파일명은 업로드마다 다르므로 제외하고 저장
+    if use_cache and isinstance(data, dict):
+        image_extraction_cache.set(cache_key, data)
+    return data
+
+
+def _build_preprocessed_part(image_path: str) -> Dict[str, Any]:
+    # 축소·재인코딩한 바이트를 전송해 업로드 크기를 줄임
+    prepared = preprocess_image(image_path)
+    print(
+        f"🗜️ {os.path.basename(image_path)}: {prepared.original_bytes:,} → {len(prepared.data):,} bytes {prepared.original_size} → {prepared.size}"
+    )
+    return prepared.as_gemini_part()
+
+
+# 📤 LLM 호출 및 결과 추출
+def extract_info_from_image(
+    image_path: str,
+    use_cache: bool = True,
+    preprocess: bool = True,
+    tiling: Optional[bool] = None,
+    limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """
+    tiling=None이면 세로/가로 비율이 TILE_ASPECT_THRESHOLD를 넘는 긴 상세페이지 이미지만
+    타일로 나누어 추출합니다. True/False로 강제할 수 있습니다.
+    limiter를 주면 타일을 포함한 모든 Gemini 호출이 같은 속도 제한을 공유합니다.
+    """
+    image_name = os.path.basename(image_path)
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    if tiling is None:
+        # 캐시 적중이면 이미지 헤더도 읽지 않음 (일반/타일 병합 결과 중 있는 쪽 사용)
+        cached = _cached_extraction(image_bytes, preprocess) if use_cache else None
+        if cached is not None:
+            print(f"⚡ 캐시된 추출 결과 사용: {image_name}")
+            data = dict(cached)
+            data["이미지"] = image_name
+            return data
+        tiling = is_tall_image(image_bytes)
+
+    if tiling:
+        data = extract_info_from_tall_image(
+            image_bytes, image_name, use_cache, preprocess=preprocess, limiter=limiter
+        )
+    else:
+        data = _generate_with_cache(
+            image_cache_key(image_bytes, preprocess),
+            (
+                (lambda: _build_preprocessed_part(image_path))
+                if preprocess
+                else (lambda: load_image(image_path))
+            ),
+            image_name,
+            use_cache,
+            limiter,
+        )
+
+    if data:
+        data["이미지"] = image_name  # 파일명 포함
+    return data
+
+
+def _cached_extraction(image_bytes: bytes, preprocess: bool) -> Optional[dict]:
+    for key in (image_cache_key(image_bytes, preprocess), tiled_cache_key(image_bytes, preprocess)):
+        cached = image_extraction_cache.get(key)
+        if cached is not None:
+            return cached
+    return None
+
+
+# 🧩 긴 상세페이지 이미지: 겹치는 타일로 나누어 병렬 추출 후 병합
+# EXIF Orientation(0x0112) 5~8은 90°/270° 회전이므로 가로·세로가 바뀜
+_EXIF_ORIENTATION = 0x0112
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def is_tall_image(image_bytes: bytes) -> bool:
+    """헤더의 크기와 EXIF 방향만 읽어 판단합니다. (픽셀 디코딩 없음)"""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        width, height = image.size
+        if image.getexif().get(_EXIF_ORIENTATION) in _ROTATED_ORIENTATIONS:
+            width, height = height, width
+    return height / max(width, 1) > TILE_ASPECT_THRESHOLD
+
+
+def tiled_cache_key(image_bytes: bytes, preprocess: bool = True) -> str:
+    return make_cache_key(
+        image_cache_key(image_bytes, preprocess), "tiled", TILE_ASPECT_RATIO, TILE_OVERLAP_RATIO
+    )
+
 
-# 🚀 전체 이미지 처리 후 하나로 저장
-def process_all_images():
-    all_results = []
+def split_into_tiles(
+    image: Image.Image, tile_height: int, overlap: int
+) -> List[Image.Image]:
+    """위에서 아래로 overlap 픽셀씩 겹치는 tile_height 높이의 타일 목록을 만듭니다."""
+    width, height = image.size
+    step = max(tile_height - overlap, 1)
+    tiles = []
+    top = 0
+    while True:
+        bottom = min(top + tile_height, height)
+        tiles.append(image.crop((0, top, width, bottom)))
+        if bottom >= height:
+            break
+        top += step
+    return tiles
 
-    for filename in os.listdir(IMG_DIR):
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"[\s·\.\,!?;:()\[\]{}\"'“”]", "", str(text).lower())
+
+
+def merge_tile_results(tile_results: List[dict]) -> dict:
+    """
+    타일별 추출 결과 병합.
+    - 효능_주장: 정규화 후 중복 제거 (겹침 구간에서 잘린 문구는 더 긴 문구로 대체)
+    - 제품명: 타일 간 다수결, 동률이면 위쪽 타일의 제품명 우선
+    """
+    claims: List[str] = []
+    claim_keys: List[str] = []
+    name_votes: Counter = Counter()
+    first_seen: Dict[str, Tuple[int, str]] = {}
+
+    for index, result in enumerate(tile_results):
+        name = (result.get("제품명") or "").strip()
+        if name:
+            key = _normalize_text(name)
+            name_votes[key] += 1
+            first_seen.setdefault(key, (index, name))
+
+        for claim in result.get("효능_주장") or []:
+            key = _normalize_text(claim)
+            if not key:
+                continue
+            duplicate = next(
+                (i for i, existing in enumerate(claim_keys) if key in existing or existing in key),
+                None,
+            )
+            if duplicate is None:
+                claims.append(claim)
+                claim_keys.append(key)
+            elif len(key) > len(claim_keys[duplicate]):
+                claims[duplicate] = claim
+                claim_keys[duplicate] = key
+
+    product_name = ""
+    if name_votes:
+        best = max(name_votes, key=lambda k: (name_votes[k], -first_seen[k][0]))
+        product_name = first_seen[best][1]
+
+    return {"제품명": product_name, "효능_주장": claims}
+
+
+def extract_info_from_tall_image(
+    image_bytes: bytes,
+    image_name: str,
+    use_cache: bool = True,
+    preprocess: bool = True,
+    limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """
+    타일별 결과는 타일 픽셀 해시로 캐시되므로, 일부 타일이 실패해 다시 실행하더라도
+    성공한 타일은 Gemini를 다시 호출하지 않습니다.
+    preprocess=False이면 타일을 축소·재인코딩하지 않고 원본 픽셀 그대로 전송합니다.
+    """
+    whole_key = tiled_cache_key(image_bytes, preprocess)
+    if use_cache:
+        cached = image_extraction_cache.get(whole_key)
+        if cached is not None:
+            print(f"⚡ 캐시된 타일 병합 결과 사용: {image_name}")
+            return cached
+
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+    tile_height = int(image.size[0] * TILE_ASPECT_RATIO)
+    tiles = split_into_tiles(image, tile_height, int(tile_height * TILE_OVERLAP_RATIO))
+    print(f"🧩 {image_name}: {image.size} → 타일 {len(tiles)}개로 분할하여 추출")
+
+    def _extract_tile(index: int, tile: Image.Image) -> dict:
+        tile_key = make_cache_key(
+            "img2text-tile",
+            hash_bytes(tile.tobytes()),
+            tile.size,
+            IMG2TEXT_PROMPT_VERSION,
+            preprocessing_signature() if preprocess else "original",
+        )
+        label = f"{image_name} [타일 {index + 1}/{len(tiles)}]"
+        try:
+            return _generate_with_cache(
+                tile_key,
+                (
+                    (lambda: prepare_pil_image(tile, original_bytes=0).as_gemini_part())
+                    if preprocess
+                    else (lambda: tile)
+                ),
+                label,
+                use_cache,
+                limiter,
+            )
+        except Exception as e:
+            print(f"⚠️ 타일 추출 실패: {label} ({type(e).__name__}: {e})")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=TILE_MAX_WORKERS) as executor:
+        tile_results = list(executor.map(_extract_tile, range(len(tiles)), tiles))
+
+    succeeded = [r for r in tile_results if isinstance(r, dict) and r]
+    if not succeeded:
+        return {}
+
+    merged = merge_tile_results(succeeded)
+    failed_count = len(tiles) - len(succeeded)
+    if failed_count:
+        print(f"⚠️ {image_name}: 타일 {failed_count}개 추출 실패 (부분 결과 반환, 캐시하지 않음)")
+    elif use_cache:
+        image_extraction_cache.set(whole_key, merged)
+    return merged
+
+
+# 🚀 전체 이미지 처리: 제한된 동시성 + 호출 속도 제한 + JSONL 이어쓰기
+def process_all_images(
+    img_dir: str = IMG_DIR,
+    max_workers: int = IMG2TEXT_MAX_WORKERS,
+    rate_limit: Optional[float] = IMG2TEXT_RATE_LIMIT,
+):
+    """
+    img_dir의 모든 이미지를 병렬로 추출합니다.
+    결과는 추출 즉시 RESULT_JSONL_PATH에 한 줄씩 추가되며, 재시작 시 이미 기록된
+    이미지(내용 해시 기준)는 건너뜁니다. 마지막에 OUTPUT_PATH(JSON 배열)를 다시 만듭니다.
+    """
+    done_hashes = {
+        record.get("image_sha256") for record in read_jsonl(RESULT_JSONL_PATH)
+    }
+
+    pending = []
+    stats = BatchStats()
+    for filename in sorted(os.listdir(img_dir)):
         if not filename.lower().endswith((".png", ".jpg", ".jpeg", ".webp")):
             continue
+        stats.total += 1
+        image_path = os.path.join(img_dir, filename)
+        with open(image_path, "rb") as f:
+            image_sha256 = hash_bytes(f.read())
+        if image_sha256 in done_hashes:
+            stats.skipped += 1
+            continue
+        done_hashes.add(image_sha256)  # 같은 내용의 이미지가 여러 개면 한 번만 처리
+        pending.append((filename, image_path, image_sha256))
+
+    print(
+        f"🔍 처리 대상 {len(pending)}개 (전체 {stats.total}개, 이미 처리됐거나 중복인 이미지 {stats.skipped}개 건너뜀)"
+    )
+
+    writer = JsonlWriter(RESULT_JSONL_PATH)
+    limiter = RateLimiter(rate_limit)
 
-        image_path = os.path.join(IMG_DIR, filename)
-        print(f"🔍 처리 중: {filename}")
-        result = extract_info_from_image(image_path)
+    def _process(filename: str, image_path: str, image_sha256: str) -> None:
+        started = time.perf_counter()
+        try:
+            # 긴 이미지의 타일 호출까지 Gemini 호출마다 리미터를 획득
+            result = extract_info_from_image(image_path, limiter=limiter)
+            error = None
+        except Exception as e:  # 한 이미지 실패가 전체 배치를 멈추지 않도록
+            result = {}
+            error = f"{type(e).__name__}: {e}"
+        stats.record(bool(result), time.perf_counter() - started)
 
         if result:
-            all_results.append(result)
+            result["image_sha256"] = image_sha256
+            writer.append(result)
             print(f"✅ 추출 완료: {filename}")
         else:
-            print(f"⚠️ 실패: {filename}")
+            print(f"⚠️ 실패: {filename}" + (f" ({error})" if error else ""))
 
-    # 모든 결과를 하나의 JSON 배열로 저장
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_process, *item) for item in pending]
+        for future in as_completed(futures):
+            future.result()
+
+    # 모든 결과를 하나의 JSON 배열로 저장 (기존 result_all.json 형식 유지)
+    all_results = list(read_jsonl(RESULT_JSONL_PATH))
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
         json.dump(all_results, f, ensure_ascii=False, indent=2)
-        print(f"\n📦 전체 결과 저장 완료: {OUTPUT_PATH}")
+        print(f"\n📦 전체 결과 저장 완료: {OUTPUT_PATH} ({len(all_results)}건)")
+
+    summary = stats.summary()
+    print(
+        f"📊 처리 {summary['succeeded'] + summary['failed']}개 | 성공 {summary['succeeded']} | 실패 {summary['failed']} | "
+        f"건너뜀 {summary['skipped']} | {summary['items_per_second']} images/sec"
+    )
+    print(f"🗃️ 캐시 통계: {image_extraction_cache.stats()}")
+    return summary
 
 
 if __name__ == "__main__":
@@ -4,6 +4,8 @@ import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from .data_version import data_version_info
+
 # 📦 코드 블록(JSON) 정제
 def extract_json_string(text: str) -> str:
     match = re.search(r"```json(.*?)```", text, re.DOTALL)
@@ -33,10 +35,17 @@ def save_step_output(
     filename = f"{step_name}.json"
     filepath = os.path.join(run_dir, filename)
 
+    try:
+        data_version = data_version_info()  # 이 결과를 만든 csv_data·벡터 인덱스 버전
+    except Exception as e:
+        print(f"⚠️ [{run_id}] 데이터 버전 확인 실패: {e}")
+        data_version = None
+
     data_to_save = {
         "run_id": run_id,
         "step_name": step_name,
         "timestamp_iso": datetime.now().isoformat(), # 저장 시점의 타임스탬프
+        "data_version": data_version,
         "status": status,
         "inputs": step_inputs if step_inputs else {},
         "outputs": step_outputs, # 기존에 output으로 저장하던 내용
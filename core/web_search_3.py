@@ -3,51 +3,279 @@ import json
 
 # from dotenv import load_dotenv # main.py에서 처리
 from core.prompt import WEB2INGREDIENT_PROMPT  # 아래에서 만들 프롬프트
-from core.config import web_search_llm, text_llm  # TavilyClient, ChatOpenAI
-from typing import List
+from core.config import (  # TavilyClient, AsyncTavilyClient, ChatOpenAI
+    web_search_llm,
+    async_web_search_llm,
+    text_llm,
+)
+from core.cache import PersistentCache, hash_bytes, make_cache_key, prompt_version
+from core.snippet_filter import count_tokens, filter_search_results, trim_to_token_budget
+from core.batch import BatchStats, RateLimiter, write_json_atomic
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
 import re
+import time
+import asyncio
+import threading
 
 # 📁 설정
 RESULT_ALL_PATH = "IMG2TEXT_data/result_all.json"
 OUTPUT_DIR = "TEXT2SEARCH_data"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-
-# 🔍 검색 → 요약 텍스트 추출
-def search_product_and_summarize(product_name: str) -> str:
-    search_query = f"{product_name} 성분 효능"
-    print(f"🌐 '{search_query}'로 웹 검색 중...")
+# 일괄 보강(process_all_products) 동시 실행 수와 초당 최대 제품 수
+ENRICH_MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "4"))
+ENRICH_RATE_LIMIT = float(os.getenv("ENRICH_RATE_LIMIT", "2"))
+
+# 🗃️ Tavily 검색 결과 캐시 (초 단위)
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 3600)))
+# 만료 후에도 이 기간 동안은 이전 결과를 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", str(7 * 24 * 3600)))
+# 검색 결과가 없는 제품(negative entry)은 짧게 캐시
+SEARCH_CACHE_NEGATIVE_TTL = float(os.getenv("SEARCH_CACHE_NEGATIVE_TTL", "1800"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "20000"))
+# 제품명 변형(한글/영문/브랜드)별 검색 1건당 제한 시간 (초)
+SEARCH_QUERY_TIMEOUT = float(os.getenv("SEARCH_QUERY_TIMEOUT", "15"))
+
+# 원본 웹 검색 결과는 참조 데이터와 무관하므로 데이터 버전 대신 TTL로만 갱신
+search_cache = PersistentCache(
+    "web_search", max_entries=SEARCH_CACHE_MAX_ENTRIES, data_versioned=False
+)
+
+# 🗃️ 성분 추출(LLM) 결과 캐시: 웹 요약 텍스트 해시 + 프롬프트 버전 기준
+WEB2INGREDIENT_PROMPT_VERSION = prompt_version(WEB2INGREDIENT_PROMPT)
+INGREDIENT_CACHE_MAX_ENTRIES = int(os.getenv("INGREDIENT_CACHE_MAX_ENTRIES", "20000"))
+# 웹 요약 텍스트 + 프롬프트만으로 결과가 정해지므로 csv_data가 바뀌어도 유지
+ingredient_cache = PersistentCache(
+    "web2ingredient", max_entries=INGREDIENT_CACHE_MAX_ENTRIES, data_versioned=False
+)
+
+# 🧩 성분 추출 map-reduce 모드: off(단일 호출) | on | auto(요약이 MAP_REDUCE_MIN_TOKENS를 넘을 때만)
+WEB2INGREDIENT_MAP_REDUCE = os.getenv("WEB2INGREDIENT_MAP_REDUCE", "off")
+MAP_REDUCE_MIN_TOKENS = int(os.getenv("MAP_REDUCE_MIN_TOKENS", "1500"))
+MAP_REDUCE_CHUNK_TOKENS = int(os.getenv("MAP_REDUCE_CHUNK_TOKENS", "800"))  # 청크 1개당 최대 토큰
+MAP_REDUCE_MAX_WORKERS = int(os.getenv("MAP_REDUCE_MAX_WORKERS", "4"))
+
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+_refreshing_keys: set = set()
+_refreshing_lock = threading.Lock()
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+
+def _search_and_store(search_query: str, cache_key: str) -> dict:
     search_result = web_search_llm.search(search_query)
-    results = search_result.get("results", [])
-
-    processed_content_parts = []
-    if not results:
-        print(f"⚠️ '{product_name}'에 대한 웹 검색 결과가 없습니다.")
-        return ""
+    _store_search_result(cache_key, search_result)
+    return search_result
+
+
+def _refresh_in_background(search_query: str, cache_key: str) -> None:
+    with _refreshing_lock:
+        if cache_key in _refreshing_keys:  # 같은 키는 한 번만 갱신
+            return
+        _refreshing_keys.add(cache_key)
+
+    def _refresh():
+        try:
+            _search_and_store(search_query, cache_key)
+            print(f"🔄 '{search_query}' 검색 캐시 갱신 완료")
+        except Exception as e:
+            print(f"⚠️ '{search_query}' 검색 캐시 갱신 실패: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing_keys.discard(cache_key)
+
+    _refresh_executor.submit(_refresh)
+
+
+def _lookup_search_cache(search_query: str):
+    """(캐시 키, 사용할 캐시 결과 또는 None)을 반환합니다."""
+    cache_key = make_cache_key("tavily", normalize_search_query(search_query))
+    entry = search_cache.get_entry(cache_key, max_stale=SEARCH_CACHE_STALE_TTL)
+
+    if entry is not None and not entry.is_expired:
+        print(f"⚡ 캐시된 검색 결과 사용: '{search_query}'")
+        return cache_key, entry.value
+    if entry is not None and entry.value.get("results"):
+        print(f"⚡ 만료된 검색 결과를 우선 사용하고 백그라운드에서 갱신: '{search_query}'")
+        _refresh_in_background(search_query, cache_key)
+        return cache_key, entry.value
+    return cache_key, None
+
+
+def _store_search_result(cache_key: str, search_result: dict) -> None:
+    ttl = (
+        SEARCH_CACHE_TTL if search_result.get("results") else SEARCH_CACHE_NEGATIVE_TTL
+    )
+    search_cache.set(cache_key, search_result, ttl=ttl)
+
+
+def cached_web_search(search_query: str) -> dict:
+    """
+    정규화한 검색어 기준으로 Tavily 결과를 캐시합니다.
+    - TTL 이내: 캐시 반환
+    - 만료됐지만 stale 허용 기간 이내: 캐시를 반환하고 백그라운드에서 갱신
+    - 결과 없음(negative) 항목은 만료 즉시 다시 검색
+    """
+    cache_key, cached = _lookup_search_cache(search_query)
+    if cached is not None:
+        return cached
+    return _search_and_store(search_query, cache_key)
+
+
+async def cached_web_search_async(search_query: str) -> dict:
+    """cached_web_search의 비동기 버전. 캐시 miss일 때만 AsyncTavilyClient를 호출합니다."""
+    cache_key, cached = _lookup_search_cache(search_query)
+    if cached is not None:
+        return cached
+
+    search_result = await asyncio.wait_for(
+        async_web_search_llm.search(search_query), timeout=SEARCH_QUERY_TIMEOUT
+    )
+    _store_search_result(cache_key, search_result)
+    return search_result
+
+
+def build_name_variants(product_name: str) -> List[str]:
+    """
+    "키즈픽션 / KIDSFICTION" → ["키즈픽션", "KIDSFICTION"]
+    "키즈플랜 비오클 / KIDZPLAN BIOCLE" → ["키즈플랜 비오클", "KIDZPLAN BIOCLE", "키즈플랜"]
+    순서: 대표명(/ 앞부분), 나머지 병기명, 브랜드(대표명의 첫 단어)
+    """
+    parts = [p.strip() for p in product_name.split("/") if p.strip()]
+    if not parts:
+        return []
+    variants = list(parts)
+    primary_tokens = parts[0].split()
+    if len(primary_tokens) > 1:
+        variants.append(primary_tokens[0])
+
+    unique, seen = [], set()
+    for variant in variants:
+        key = normalize_search_query(variant)
+        if key not in seen:
+            seen.add(key)
+            unique.append(variant)
+    return unique
+
+
+def _normalize_url(url: str) -> str:
+    return url.split("#")[0].rstrip("/").lower()
+
+
+def merge_search_results(result_lists: List[List[dict]]) -> List[dict]:
+    """변형별 검색 결과를 순서대로 합치며 같은 URL은 한 번만 남깁니다."""
+    merged, seen_urls = [], set()
+    for results in result_lists:
+        for res in results:
+            url = res.get("url")
+            if url:
+                key = _normalize_url(url)
+                if key in seen_urls:
+                    continue
+                seen_urls.add(key)
+            merged.append(res)
+    return merged
+
+
+async def _search_variants(queries: List[str]) -> List[List[dict]]:
+    async def _one(query: str) -> List[dict]:
+        try:
+            search_result = await cached_web_search_async(query)
+            return search_result.get("results", [])
+        except asyncio.TimeoutError:
+            print(f"⏱️ '{query}' 검색 시간 초과 ({SEARCH_QUERY_TIMEOUT}s), 해당 결과는 제외합니다.")
+        except Exception as e:
+            print(f"⚠️ '{query}' 검색 실패: {type(e).__name__} - {e}")
+        return []
+
+    return await asyncio.gather(*(_one(q) for q in queries))
+
+
+def _run_async(coro):
+    """동기 코드에서 코루틴 실행. 이미 이벤트 루프가 도는 스레드라면 별도 스레드에서 실행합니다."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def search_product_results(
+    product_name: str, raw_product_name: Optional[str] = None
+) -> List[dict]:
+    """제품명 변형(한글/영문/브랜드)을 동시에 검색하고 URL 기준으로 중복 제거해 합칩니다."""
+    variants = build_name_variants(raw_product_name or product_name)
+    if not variants:
+        variants = [product_name]
+    queries = [f"{variant} 성분 효능" for variant in variants]
+    print(f"🌐 {queries}로 웹 검색 중...")
+
+    result_lists = _run_async(_search_variants(queries))
+    merged = merge_search_results(result_lists)
+    total = sum(len(r) for r in result_lists)
+    if total:
+        print(f"🔗 검색 결과 {total}건 → URL 중복 제거 후 {len(merged)}건")
+    return merged
+
+
+def format_search_result(res: dict) -> str:
+    title = res.get("title", "제목 없음")
+    snippet = res.get("content", "내용 없음")
+    source_url = res.get("url")  # 웹 검색 결과에서 URL 추출
+
+    # 각 결과를 "제목 - 내용 - 출처 URL" 형식으로 구성
+    part = f"[{title}]\n{snippet}"
+    if source_url:
+        part += f"\n출처: {source_url}"
+    else:
+        part += "\n출처: 정보 없음"  # URL이 없는 경우를 대비
+    return part
 
-    for res in results:
-        title = res.get("title", "제목 없음")
-        snippet = res.get("content", "내용 없음")
-        source_url = res.get("url")  # 웹 검색 결과에서 URL 추출
 
-        # 각 결과를 "제목 - 내용 - 출처 URL" 형식으로 구성
-        part = f"[{title}]\n{snippet}"
-        if source_url:
-            part += f"\n출처: {source_url}"
-        else:
-            part += "\n출처: 정보 없음"  # URL이 없는 경우를 대비
-        processed_content_parts.append(part)
+def format_search_results(results: List[dict]) -> str:
+    """
+    LLM 호출 전 결정적 전처리 후 텍스트로 합칩니다.
+    도메인 허용/차단 목록 정렬·필터 → 유사 스니펫 병합 → 토큰 예산(SEARCH_TOKEN_BUDGET) 내로 절단
+    """
+    filtered = filter_search_results(results)
+    processed_content_parts = trim_to_token_budget(filtered, format_search_result)
+    print(
+        f"✂️ 스니펫 전처리: {len(results)}건 → 필터/중복 제거 {len(filtered)}건 → 토큰 예산 내 {len(processed_content_parts)}건"
+    )
 
     # 모든 검색 결과를 두 줄 바꿈으로 연결하여 하나의 텍스트로 만듭니다.
     # 이는 WEB2INGREDIENT_PROMPT에서 "각 문단 말미: 해당 정보의 출처 URL" 형식을 따르도록 합니다.
     return "\n\n".join(processed_content_parts).strip()
 
 
-# 🧠 LLM을 통해 성분 + 효능 추출
-def extract_ingredients_and_effects(summary_text: str) -> dict:
-    if not summary_text.strip():  # summary_text가 비어있거나 공백만 있는 경우
-        print("⚠️ 요약 텍스트가 비어 있어 성분 및 효능 추출을 건너뜁니다.")
-        return {}
+# 🔍 검색 → 요약 텍스트 추출
+def search_product_and_summarize(
+    product_name: str, raw_product_name: Optional[str] = None
+) -> str:
+    results = search_product_results(product_name, raw_product_name)
+    if not results:
+        print(f"⚠️ '{product_name}'에 대한 웹 검색 결과가 없습니다.")
+        return ""
+    summary = format_search_results(results)
+    if not summary:
+        print(f"⚠️ '{product_name}'의 검색 결과에 사용할 수 있는 본문이 없습니다.")
+    return summary
+
+
+def _extract_single(summary_text: str) -> dict:
+    """웹 요약 텍스트 전체를 한 번의 LLM 호출로 추출합니다. (결과는 텍스트 해시 기준으로 캐시)"""
+    cache_key = make_cache_key(
+        "web2ingredient",
+        hash_bytes(summary_text.encode("utf-8")),
+        WEB2INGREDIENT_PROMPT_VERSION,
+    )
+    cached = ingredient_cache.get(cache_key)
+    if cached is not None:
+        print("⚡ 동일한 웹 요약에 대한 성분 추출 결과를 캐시에서 사용합니다.")
+        return cached
 
     full_prompt = WEB2INGREDIENT_PROMPT.replace("{web_text}", summary_text)
 
@@ -63,21 +291,178 @@ def extract_ingredients_and_effects(summary_text: str) -> dict:
     cleaned = extract_json_string(raw_text)
 
     try:
-        return json.loads(cleaned)
+        parsed = json.loads(cleaned)
     except json.JSONDecodeError:
         print(f"❌ JSON 파싱 실패. 원본 응답:\n---\n{raw_text}\n---")
         # 파싱 실패 시, 추가적인 디버깅 정보나 빈 결과를 반환할 수 있습니다.
         return {"error": "JSON 파싱 실패", "raw_response": raw_text}
 
+    # 정상적으로 파싱된 결과만 캐시 (오류 결과는 다음 호출에서 다시 시도)
+    if isinstance(parsed, dict) and "error" not in parsed:
+        ingredient_cache.set(cache_key, parsed)
+    return parsed
+
+
+def split_summary_into_chunks(
+    summary_text: str, max_tokens: int = MAP_REDUCE_CHUNK_TOKENS
+) -> List[str]:
+    """
+    format_search_results 출력을 "출처:" 줄 단위 문단으로 나눈 뒤,
+    순서를 유지한 채 max_tokens 이하가 되도록 인접 문단을 묶습니다.
+    """
+    paragraphs: List[str] = []
+    current: List[str] = []
+    for line in summary_text.split("\n"):
+        current.append(line)
+        if line.startswith("출처:"):
+            paragraphs.append("\n".join(current).strip())
+            current = []
+    if "\n".join(current).strip():
+        paragraphs.append("\n".join(current).strip())
+
+    chunks: List[str] = []
+    chunk: List[str] = []
+    chunk_tokens = 0
+    for paragraph in paragraphs:
+        tokens = count_tokens(paragraph)
+        if chunk and chunk_tokens + tokens > max_tokens:
+            chunks.append("\n\n".join(chunk))
+            chunk, chunk_tokens = [], 0
+        chunk.append(paragraph)
+        chunk_tokens += tokens
+    if chunk:
+        chunks.append("\n\n".join(chunk))
+    return chunks
+
+
+def _name_key(name) -> str:
+    return re.sub(r"\s+", "", str(name)).lower()
+
+
+def _merge_comma_values(values: List[str]) -> str:
+    """쉼표로 구분된 값들을 처음 등장한 순서대로 중복 없이 합칩니다."""
+    seen = {}
+    for value in values:
+        for item in str(value).split(","):
+            item = item.strip()
+            if item and _name_key(item) not in seen:
+                seen[_name_key(item)] = item
+    return ", ".join(seen.values())
+
+
+def _merged_source(url: str, fields: dict) -> dict:
+    # { "성분명", "효능", "출처" } 형식의 출처는 성분_내용 대신 성분명을 성분 나열로 사용
+    merged = {"url": url, "성분_내용": _merge_comma_values(fields["성분_내용"] or fields["성분명"])}
+    for field in ("성분명", "효능"):
+        if fields[field]:
+            merged[field] = _merge_comma_values(fields[field])
+    return merged
+
+
+def merge_partial_extractions(partials: List[dict]) -> dict:
+    """
+    청크별 추출 결과를 LLM 재호출 없이 결정적으로 병합합니다. (청크 순서 = 검색 결과 순위)
+    - 성분_추출_출처: URL별로 묶고 성분_내용·성분명·효능은 중복 없이 이어붙임
+      (URL이 없는 출처는 서로 묶지 않고 각각 남김)
+    - 확정_성분: 공백·대소문자 무시하고 처음 등장한 표기로 중복 제거
+    - 성분_효능: 성분명별로 효능 표현을 중복 없이 이어붙임
+    - 요약: 가장 앞선 청크의 요약을 사용
+    """
+    sources = {}
+    ingredients = {}
+    effects = {}
+    summary = ""
+    for partial_index, partial in enumerate(partials):
+        for source_index, source in enumerate(partial.get("성분_추출_출처") or []):
+            if not isinstance(source, dict):
+                continue
+            url = source.get("url") or source.get("출처") or ""
+            key = url or (partial_index, source_index)
+            fields = sources.setdefault(key, (url, {"성분_내용": [], "성분명": [], "효능": []}))[1]
+            for field, values in fields.items():
+                if source.get(field):
+                    values.append(source[field])
+        for name in partial.get("확정_성분") or []:
+            ingredients.setdefault(_name_key(name), name)
+        for item in partial.get("성분_효능") or []:
+            if isinstance(item, dict) and item.get("성분명"):
+                key = _name_key(item["성분명"])
+                entry = effects.setdefault(key, {"성분명": item["성분명"], "효능": []})
+                entry["효능"].append(item.get("효능", ""))
+        if not summary and partial.get("요약"):
+            summary = partial["요약"]
+
+    return {
+        "성분_추출_출처": [_merged_source(url, fields) for url, fields in sources.values()],
+        "확정_성분": list(ingredients.values()),
+        "성분_효능": [
+            {"성분명": e["성분명"], "효능": _merge_comma_values(e["효능"])}
+            for e in effects.values()
+        ],
+        "요약": summary,
+    }
+
+
+def _extract_map_reduce(summary_text: str) -> dict:
+    """청크별 추출(map)을 동시에 실행하고 결과를 결정적으로 병합(reduce)합니다."""
+    chunks = split_summary_into_chunks(summary_text)
+    print(f"🧩 성분 추출 map-reduce: {len(chunks)}개 청크 동시 처리")
+    if len(chunks) <= 1:
+        return _extract_single(summary_text)
+
+    with ThreadPoolExecutor(max_workers=MAP_REDUCE_MAX_WORKERS) as executor:
+        partials = list(executor.map(_extract_single, chunks))  # 청크 순서 유지
+
+    succeeded = [p for p in partials if isinstance(p, dict) and p and "error" not in p]
+    if not succeeded:
+        return partials[0] if partials else {}
+    if len(succeeded) < len(partials):
+        print(f"⚠️ {len(partials) - len(succeeded)}개 청크 추출 실패, 나머지 결과만 병합합니다.")
+    return merge_partial_extractions(succeeded)
+
+
+def _use_map_reduce(summary_text: str, map_reduce: Optional[bool]) -> bool:
+    if map_reduce is not None:
+        return map_reduce
+    if WEB2INGREDIENT_MAP_REDUCE == "on":
+        return True
+    if WEB2INGREDIENT_MAP_REDUCE == "auto":
+        return count_tokens(summary_text) > MAP_REDUCE_MIN_TOKENS
+    return False
+
+
+# 🧠 LLM을 통해 성분 + 효능 추출
+def extract_ingredients_and_effects(
+    summary_text: str, map_reduce: Optional[bool] = None
+) -> dict:
+    """
+    map_reduce: None이면 WEB2INGREDIENT_MAP_REDUCE 설정을 따릅니다.
+        True이면 출처 문단 청크별로 동시에 추출한 뒤 병합해, 호출당 프롬프트 길이를 제한합니다.
+    """
+    if not summary_text.strip():  # summary_text가 비어있거나 공백만 있는 경우
+        print("⚠️ 요약 텍스트가 비어 있어 성분 및 효능 추출을 건너뜁니다.")
+        return {}
+
+    if _use_map_reduce(summary_text, map_reduce):
+        return _extract_map_reduce(summary_text)
+    return _extract_single(summary_text)
+
 
 # --- 파이프라인을 위한 새로운 함수 ---
-def get_enriched_product_info(product_name: str) -> dict:
+def get_enriched_product_info(
+    product_name: str, raw_product_name: Optional[str] = None
+) -> dict:
+    """
+    product_name: 대표 제품명 ("/" 앞부분). 결과의 "제품명"으로 사용됩니다.
+    raw_product_name: 이미지에서 추출한 원본 제품명 (예: "키즈픽션 / KIDSFICTION").
+        주어지면 한글/영문/브랜드 변형을 함께 검색합니다.
+    """
     if not product_name:
         print("⚠️ 제품명이 제공되지 않았습니다. (get_enriched_product_info)")
         return {"제품명": product_name, "error": "제품명 없음"}
 
     print(f"🔍 '{product_name}'에 대한 웹 검색 및 성분 추출 중...")
-    web_summary = search_product_and_summarize(product_name)
+    web_summary = search_product_and_summarize(product_name, raw_product_name)
     if not web_summary:
         print(f"⚠️ '{product_name}'에 대한 웹 요약을 가져올 수 없습니다.")
         return {"제품명": product_name, "error": "웹 요약 실패", "요약_텍스트": ""}
@@ -111,52 +496,127 @@ def get_enriched_product_info(product_name: str) -> dict:
     return parsed_result
 
 
-# 🚀 전체 파이프라인 실행
-# def process_all_products():
-#     with open(RESULT_ALL_PATH, encoding="utf-8") as f:
-#         products = json.load(f)
-
-#     for entry in products:
-#         product_name = entry.get("제품명", "").split("/")[0].strip()
-#         if not product_name:
-#             continue
+def enriched_result_path(product_name: str) -> str:
+    """TEXT2SEARCH_data/enriched_<제품명>.json (파일명에 쓸 수 없는 문자만 "_"로 치환)"""
+    safe_name = re.sub(r'[\\/:*?"<>|]', "_", product_name).strip()
+    return os.path.join(OUTPUT_DIR, f"enriched_{safe_name}.json")
 
-#         print(f"🔍 웹 검색 및 성분 추출 중: {product_name}")
-#         result_path = os.path.join(OUTPUT_DIR, f"enriched_{product_name}.json")
 
-#         if os.path.exists(result_path):
-#             print(f"✅ 이미 처리됨: {product_name}")
-#             continue
-
-#         # 1. 검색 + 요약
-#         web_summary = search_product_and_summarize(product_name)
-
-#         # 2. 요약문 + 프롬프트 → LLM 처리
-#         parsed_result = extract_ingredients_and_effects(web_summary)
-
-#         if parsed_result:
-#             parsed_result["제품명"] = product_name
-#             parsed_result["요약_텍스트"] = web_summary  # Optional: 출처 기록용
-
-#             with open(result_path, "w", encoding="utf-8") as f:
-#                 json.dump(parsed_result, f, ensure_ascii=False, indent=2)
+def load_product_list(path: str = RESULT_ALL_PATH) -> List[dict]:
+    """
+    보강 대상 제품 목록을 읽습니다.
+    - .json: result_all.json 형식([{"제품명": ...}, ...]) 또는 제품명 문자열 배열
+    - 그 외: 한 줄에 제품명 하나인 텍스트 파일
+    반환: [{"제품명": 대표 제품명, "원본_제품명": 원본 제품명}, ...] (대표 제품명 기준 중복 제거)
+    """
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            entries = [line.strip() for line in f if line.strip()]
 
-#             print(f"✅ 저장 완료: {result_path}")
-#         else:
-#             print(f"⚠️ 실패: {product_name}")
+    products = {}
+    for entry in entries:
+        raw_name = entry.get("제품명", "") if isinstance(entry, dict) else str(entry)
+        product_name = raw_name.split("/")[0].strip()
+        if product_name and product_name not in products:
+            products[product_name] = {"제품명": product_name, "원본_제품명": raw_name}
+    return list(products.values())
 
 
+def _is_completed(result_path: str) -> bool:
+    if not os.path.exists(result_path):
+        return False
+    try:
+        with open(result_path, encoding="utf-8") as f:
+            return "error" not in json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return False  # 손상된 체크포인트는 다시 처리
+
+
+# 🚀 전체 파이프라인 실행 (제품 목록 일괄 보강)
+def process_all_products(
+    product_source: str = RESULT_ALL_PATH,
+    max_workers: int = ENRICH_MAX_WORKERS,
+    rate_limit: Optional[float] = ENRICH_RATE_LIMIT,
+):
+    """
+    제품 목록의 각 제품에 대해 웹 검색 + 성분 추출을 병렬로 수행합니다.
+    제품별 결과는 완료 즉시 TEXT2SEARCH_data/enriched_<제품명>.json에 원자적으로 저장되며,
+    재시작 시 오류 없이 저장된 제품은 건너뜁니다.
+    """
+    products = load_product_list(product_source)
+    stats = BatchStats(total=len(products))
+    pending = []
+    for product in products:
+        if _is_completed(enriched_result_path(product["제품명"])):
+            stats.skipped += 1
+        else:
+            pending.append(product)
+
+    print(
+        f"🔍 보강 대상 {len(pending)}개 (전체 {stats.total}개, 이미 완료된 제품 {stats.skipped}개 건너뜀)"
+    )
+
+    limiter = RateLimiter(rate_limit)
+
+    def _process(product: dict) -> None:
+        product_name = product["제품명"]
+        limiter.acquire()
+        started = time.perf_counter()
+        try:
+            result = get_enriched_product_info(product_name, product["원본_제품명"])
+            error = result.get("error")
+        except Exception as e:  # 한 제품 실패가 전체 배치를 멈추지 않도록
+            result = None
+            error = f"{type(e).__name__}: {e}"
+        stats.record(error is None, time.perf_counter() - started)
+
+        if error is None:
+            result_path = enriched_result_path(product_name)
+            write_json_atomic(result_path, result)
+            print(f"✅ 저장 완료: {result_path}")
+        else:
+            print(f"⚠️ 실패: {product_name} ({error})")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_process, product) for product in pending]
+        for future in as_completed(futures):
+            future.result()
+
+    summary = stats.summary()
+    print(
+        f"📊 처리 {summary['succeeded'] + summary['failed']}개 | 성공 {summary['succeeded']} | 실패 {summary['failed']} | "
+        f"건너뜀 {summary['skipped']} | {summary['items_per_second']} products/sec | "
+        f"평균 {summary['latency_avg_seconds']}s, p95 {summary['latency_p95_seconds']}s"
+    )
+    print(f"🗃️ 캐시 통계: {search_cache.stats()} / {ingredient_cache.stats()}")
+    return summary
+
+
+# ▶️ 실행 예시
+#   python -m core.web_search_3                       # 단일 제품 예시 (키즈픽션)
+#   python -m core.web_search_3 --batch [제품목록.json|.txt] [--workers N] [--rate R]
 if __name__ == "__main__":
-    test_product_name = "키즈픽션"
-    enriched_info = get_enriched_product_info(test_product_name)
-
-    # ✅ 결과 저장 추가
-    if enriched_info:
-        safe_name = test_product_name.replace(" ", "_").replace("/", "_")
-        result_path = os.path.join(OUTPUT_DIR, f"enriched_{safe_name}.json")
-        with open(result_path, "w", encoding="utf-8") as f:
-            json.dump(enriched_info, f, ensure_ascii=False, indent=2)
-        print(f"✅ 결과 저장 완료: {result_path}")
-
-    # 기존의 process_all_products()를 사용하려면 아래 주석을 해제하세요.
-    # process_all_products()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="제품 웹 검색 + 성분 추출")
+    parser.add_argument(
+        "--batch", nargs="?", const=RESULT_ALL_PATH, help="제품 목록 일괄 보강 (기본: result_all.json)"
+    )
+    parser.add_argument("--workers", type=int, default=ENRICH_MAX_WORKERS)
+    parser.add_argument("--rate", type=float, default=ENRICH_RATE_LIMIT, help="초당 최대 제품 수")
+    args = parser.parse_args()
+
+    if args.batch:
+        process_all_products(args.batch, max_workers=args.workers, rate_limit=args.rate)
+    else:
+        test_product_name = "키즈픽션"
+        enriched_info = get_enriched_product_info(test_product_name)
+
+        # ✅ 결과 저장 추가
+        if enriched_info:
+            result_path = enriched_result_path(test_product_name)
+            write_json_atomic(result_path, enriched_info)
+            print(f"✅ 결과 저장 완료: {result_path}")
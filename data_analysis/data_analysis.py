@@ -8,6 +8,10 @@ from collections import Counter
 import sys
 import os  # OS 모듈 추가
 
+# 프로젝트 루트의 core 패키지를 불러오기 위해 경로 추가 (python data_analysis/data_analysis.py 실행 시)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.health_lexicon import CATEGORY_KEYWORDS
+
 # --- 파일 경로 설정 ---
 fnclty_path = "csv_data/fnclty_materials_complete.csv"
 drug_path = "csv_data/drug_raw.csv"
@@ -109,253 +113,8 @@ def run_pipeline(df, label):
         return [w for w in nouns if w not in stopwords and len(w) > 1]
 
     # --- 카테고리 키워드 사전 (MFDS 기능성 영역 기반) ---
-    # (카테고리 키워드 사전은 변경 없음)
-    category_keywords = {
-        "신경계": [
-            "인지기능",
-            "기억력",
-            "집중력",
-            "주의력",
-            "학습능력",
-            "스트레스 완화",
-            "진정",
-            "불안 개선",
-            "기분 조절",
-            "피로회복",
-            "뇌피로",
-            "멜라토닌",
-            "가바",
-            "수면개선",
-            "수면의질향상",
-            "불면증완화",
-            "신경통완화",
-            "두통완화",
-            "어지럼증",
-            "근육경련",
-        ],
-        "소화/대사계": [
-            "위 건강",
-            "위장운동",
-            "소화불량",
-            "숙취해소",
-            "속쓰림",
-            "위통",
-            "체함",
-            "구역",
-            "위산과다",
-            "위궤양",
-            "제산",
-            "위염",
-            "위부팽만감",
-            "구토억제",
-            "장 건강",
-            "배변활동",
-            "변비",
-            "설사 개선",
-            "장염",
-            "과민성대장증후군",
-            "치질완화",
-            "항문질환",
-            "프로바이오틱스",
-            "프리바이오틱스",
-            "유산균",
-            "장내환경개선",
-            "유익균증식",
-            "유해균억제",
-            "체지방 감소",
-            "대사조절",
-            "포만감",
-            "식욕조절",
-            "식욕부진개선",
-            "비만",
-            "칼슘흡수",
-            "칼슘대사",
-            "비타민D",
-            "간 건강",
-            "간기능개선",
-            "간보호",
-            "간염보조치료",
-            "간해독",
-            "지방간",
-            "간경변",
-            "간질환",
-        ],
-        "생식&비뇨계": [
-            "전립선 건강",
-            "전립선비대증",
-            "배뇨 기능",
-            "요로 건강",
-            "방광염",
-            "요로감염 예방",
-            "신장기능",
-            "요로결석보조",
-            "성기능 개선",
-            "남성호르몬 균형",
-            "발기부전",
-            "생리불순",
-            "질 건강",
-            "여성호르몬 균형",
-            "생리통완화",
-            "월경전증후군",
-            "칸디다질염",
-            "세균성질염",
-            "갱년기 증상 완화",
-            "피임",
-        ],
-        "신체방어·면역계": [
-            "면역력 강화",
-            "면역세포 증강",
-            "NK세포 활성화",
-            "알레르기반응조절",
-            "코과민반응개선",
-            "항산화",
-            "염증 완화",
-            "항바이러스",
-            "항균 작용",
-            "인삼",
-            "홍삼",
-            "베타글루칸",
-            "프로폴리스",
-            "아연",
-            "셀레늄",
-            "호흡기 건강",
-            "기관지 건강",
-            "폐 건강",
-            "코 건강",
-            "목 건강",
-            "기침",
-            "가래",
-            "천식",
-            "기관지염",
-            "비염",
-            "코막힘",
-            "콧물",
-            "재채기",
-            "인후염",
-            "편도염",
-            "상기도감염",
-            "알레르기성 비염",
-        ],
-        "감각계": [
-            "눈 건강",
-            "시력 보호",
-            "황반변성 예방",
-            "안구건조 완화",
-            "눈의피로",
-            "결막염치료",
-            "각막보호",
-            "콘택트렌즈관리",
-            "인공눈물",
-            "다래끼",
-            "녹내장",
-            "고안압",
-            "청각 보호",
-            "이명 완화",
-            "귀건강",
-            "이명",
-            "이명증",
-            "치아 건강",
-            "잇몸 강화",
-            "구강 위생",
-            "치주질환",
-            "치은염",
-            "구내염",
-            "설염",
-            "입냄새제거",
-            "피부 건강",
-            "보습",
-            "탄력",
-            "자외선 차단",
-            "동상",
-            "습진",
-            "피부염",
-            "아토피",
-            "화상",
-            "상처치료",
-            "피부궤양",
-            "피부재생",
-            "가려움해소",
-            "두드러기완화",
-            "여드름치료",
-            "뾰루지",
-            "무좀치료",
-            "백선",
-            "건선",
-            "벌레물림",
-            "피부소독",
-            "살균",
-            "상처소독",
-            "땀띠",
-            "발진",
-            "지루성피부염",
-            "비듬",
-            "티눈",
-            "굳은살",
-            "사마귀",
-            "다한증",
-            "기미",
-            "눈의 세정",
-            "눈의 불쾌감",
-        ],
-        "심혈관계": [
-            "혈압 조절",
-            "고혈압 완화",
-            "혈관 탄력",
-            "혈중 중성지방 개선",
-            "콜레스테롤개선",
-            "LDL",
-            "HDL 균형",
-            "혈행 개선",
-            "말초혈관 순환",
-            "혈액순환",
-            "혈소판응집억제",
-            "동맥경화 예방",
-            "혈색소 관리",
-            "빈혈예방",
-            "철분보충",
-            "나토키나제",
-            "홍국",
-            "코엔자임Q10",
-            "심부전보조치료",
-        ],
-        "내분비계": [
-            "혈당 조절",
-            "인슐린 저항성",
-            "식후혈당 안정화",
-            "당뇨병보조",
-            "갑상선 대사",
-            "갑상선 기능 개선",
-            "갱년기 증상 완화",
-            "월경전증후군 개선",
-            "생리통 완화",
-            "블랙코호시",
-            "보스웰리아",
-        ],
-        "근육계": [
-            "뼈 건강",
-            "관절 건강",
-            "연골 보호",
-            "관절염 완화",
-            "타박상",
-            "삠",
-            "근력 강화",
-            "근지구력",
-            "근육통 완화",
-            "어꺠결림",
-            "류마티스 통증",
-            "운동수행능력",
-            "회복력",
-            "근육피로 회복",
-            "MSM",
-            "글루코사민",
-            "콘드로이틴",
-            "콜라겐",
-            "비타민C",
-            "어린이키성장",
-            "성장기영양",
-            "근육통증",
-        ],
-    }
+    # (core/health_lexicon.py로 이동: 질의 키워드 추출과 같은 사전을 공유)
+    category_keywords = CATEGORY_KEYWORDS
 
     # --- 카테고리 분류 함수 ---
     def assign_category_with_hits(tokens):
@@ -14,6 +14,7 @@ import shutil # 파일 복사를 위해 추가
 from core.text_extract_1 import extract_info_from_image
 from core.intent_refiner_agent_2 import node_refine_user_intent
 from core.web_search_3 import get_enriched_product_info
+from core.product_index import get_product_index
 from core.claim_check_4 import get_product_evaluation
 from core.rag_service_4_1 import run_rag_from_ingredients
 from core.answer_user_5 import generate_natural_response
@@ -189,9 +190,25 @@ def node_enrich_product_info(state: GraphState) -> Dict[str, Any]:
                 "current_step": current_step_name,
             }
         else:
-            enriched_data = get_enriched_product_info(
-                product_name
-            )  # web_search_3.py의 함수
+            raw_product_name = (state.get("image_data") or {}).get("제품명")
+            # 같은 제품의 OCR 표기 차이로 웹 검색·LLM 추출을 반복하지 않도록 과거 보강 결과를 먼저 조회
+            product_index = get_product_index()
+            match = product_index.lookup(product_name, raw_product_name)
+            if match:
+                print(
+                    f"♻️ [{run_id}] 이전 보강 결과 재사용: '{match.product_name}' (유사도 {match.score:.1f}, {match.source})"
+                )
+                enriched_data = match.enriched_info
+                enriched_data["재사용_정보"] = {
+                    "제품명": match.product_name,
+                    "유사도": match.score,
+                    "출처": match.source,
+                }
+            else:
+                enriched_data = get_enriched_product_info(
+                    product_name, raw_product_name=raw_product_name
+                )  # web_search_3.py의 함수 (한글/영문/브랜드 변형 동시 검색)
+                product_index.add(product_name, enriched_data, aliases=(raw_product_name,))
             if not enriched_data or enriched_data.get("error"):
                 error_msg = f"웹 정보를 보강하지 못했습니다. 메시지: {enriched_data.get('error', '알 수 없음') if enriched_data else '데이터 없음'}"
                 print(f"❌ [{run_id}] {current_step_name} 오류: {error_msg}")
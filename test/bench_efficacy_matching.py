@@ -0,0 +1,82 @@
+"""
+효능 매칭 비용 마이크로벤치마크 (실제 csv_data 사용, API 호출 없음)
+
+- before: 매 평가마다 조회 테이블에서 효능 원문을 꺼내 정규화(lower + 정규식)한 뒤 cdist
+- after : 조회 테이블에서 풀 id만 꺼내, 로딩 시 미리 만든 정규화 텍스트(normalized_efficacy_pool)로 바로 cdist
+
+실행: PYTHONPATH=. python test/bench_efficacy_matching.py
+"""
+import random
+import time
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from core.claim_check_4 import _normalize, score_efficacy_ids
+from core.reference_data import get_reference_data
+
+QUERY_KEYWORDS = ["간", "건강", "피로"]
+INGREDIENTS_PER_PRODUCT = 8
+REPEAT = 500
+
+
+def _scores_before(keywords, entries):
+    return process.cdist(
+        [_normalize(kw) for kw in keywords],
+        [_normalize(table[key]) for table, key in entries],
+        scorer=fuzz.partial_ratio,
+        dtype=np.float64,  # score_efficacy_matrix와 같은 정밀도로 비교
+    )
+
+
+def _scores_after(keywords, entries):
+    return score_efficacy_ids(keywords, [table.value_id(key) for table, key in entries])
+
+
+def _bench(label, fn, keywords, text_sets):
+    start = time.perf_counter()
+    for texts in text_sets:
+        fn(keywords, texts)
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / len(text_sets) * 1e6
+    print(f"  {label:<7} {per_call_us:9.1f} µs/평가")
+    return per_call_us
+
+
+if __name__ == "__main__":
+    ref = get_reference_data()
+    start = time.perf_counter()
+    _ = ref.normalized_efficacy_pool
+    print(f"📚 참조 데이터 로딩: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    # (조회 테이블, 키): claim_check_4._lookup_product_efficacies가 성분마다 조회하는 단위
+    corpus = [
+        (table, key)
+        for table in (
+            ref.efficacy_dict,
+            ref.drug_efficacy_dict,
+            ref.healthfood_claims_composite_key_efficacy_dict,
+        )
+        for key in table
+    ]
+    print(f"📄 효능 텍스트 {len(corpus)}건 (정규화 캐시 {len(ref.normalized_efficacy_pool)}건)")
+    if not corpus:
+        raise SystemExit("csv_data가 비어 있어 벤치마크를 건너뜁니다.")
+
+    rng = random.Random(0)
+    product_sets = [rng.sample(corpus, min(INGREDIENTS_PER_PRODUCT, len(corpus))) for _ in range(REPEAT)]
+
+    # 두 방식의 점수가 같은지 먼저 확인
+    assert (
+        _scores_before(QUERY_KEYWORDS, corpus) == _scores_after(QUERY_KEYWORDS, corpus)
+    ).all()
+
+    print(f"\n🧪 제품 1건 평가 (성분 {INGREDIENTS_PER_PRODUCT}개 × 키워드 {len(QUERY_KEYWORDS)}개, {REPEAT}회)")
+    before = _bench("before", _scores_before, QUERY_KEYWORDS, product_sets)
+    after = _bench("after", _scores_after, QUERY_KEYWORDS, product_sets)
+    print(f"  → {before / after:.2f}배")
+
+    print(f"\n🧪 전체 효능 텍스트 {len(corpus)}건 일괄 매칭 (20회)")
+    before = _bench("before", _scores_before, QUERY_KEYWORDS, [corpus] * 20)
+    after = _bench("after", _scores_after, QUERY_KEYWORDS, [corpus] * 20)
+    print(f"  → {before / after:.2f}배")
@@ -0,0 +1,129 @@
+"""
+참조 데이터 조회 테이블 메모리 비교 (API 호출 없음)
+
+- dataframe: 초기 claim_check_4 방식. 세 CSV의 전체 컬럼 DataFrame을 모듈 전역에 유지 (+ 아래 dict)
+- dict     : 원료명/제품명 → 효능 원문 str을 dict 3개에 그대로 보관 (+ 원문 → 정규화 dict)
+- compact  : ReferenceData 방식. 효능 원문은 StringPool 하나에 이어 붙이고, 키는 intern + 풀 id
+
+drug_raw.csv가 없거나 작으면 fnclty 효능 문구로 의약품 테이블을 합성합니다. (기본 20,000행, 모든 효능 문구가 서로 다른 최악의 경우)
+
+참고: 절감량의 대부분은 DataFrame을 유지하지 않는 것(dataframe → dict)에서 나옵니다.
+합성 데이터 기준 dict → compact는 약 5% (17.0 → 16.2 MB)로, 효능 문구가 중복되는 만큼만 더 줄어듭니다.
+실행: PYTHONPATH=. python test/bench_reference_memory.py [합성 의약품 행 수]
+"""
+import gc
+import random
+import resource
+import sys
+import tracemalloc
+
+from core.compact_store import CompactMapping, StringPool, build_string_pool
+from core.reference_data import get_reference_data, normalize_efficacy_text
+
+SYNTHETIC_DRUG_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+# 합성 의약품 DataFrame의 텍스트 컬럼 (cromadb_indexing_0.drug_to_doc이 쓰는 컬럼)
+DRUG_TEXT_COLUMNS = ["entpName", "useMethodQesitm", "atpnQesitm", "depositMethodQesitm"]
+
+
+def _raw_tables():
+    """CSV에서 읽은 것과 같은 plain dict (값마다 별도 str 객체, 스냅샷 로딩 시와 동일)"""
+    ref = get_reference_data()
+    copy = lambda s: (s + ".")[:-1]  # 풀 조각이 아닌 독립 str
+    tables = {
+        "efficacy_dict": {copy(k): copy(v) for k, v in ref.efficacy_dict.items()},
+        "drug_efficacy_dict": {copy(k): copy(v) for k, v in ref.drug_efficacy_dict.items()},
+        "healthfood_claims_composite_key_efficacy_dict": {
+            (copy(p), copy(i)): copy(v)
+            for (p, i), v in ref.healthfood_claims_composite_key_efficacy_dict.items()
+        },
+    }
+    if len(tables["drug_efficacy_dict"]) < SYNTHETIC_DRUG_ROWS:
+        rng = random.Random(0)
+        phrases = list(ref.efficacy_pool) or ["이 약은 두통, 치통, 생리통의 진통에 사용합니다."]
+        for i in range(SYNTHETIC_DRUG_ROWS - len(tables["drug_efficacy_dict"])):
+            text = " ".join(rng.choice(phrases) for _ in range(4))
+            tables["drug_efficacy_dict"][f"합성의약품정{i}밀리그램"] = text
+    return tables
+
+
+def _measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<9} {current / 1024 / 1024:8.2f} MB")
+    return result, current
+
+
+def _build_dataframes(raw):
+    import pandas as pd
+
+    ref = get_reference_data()
+    frames = {
+        "df_fnclty": pd.read_csv(ref.fnclty_path),
+        "df_healthfood_claims": pd.read_csv(ref.healthfood_claims_path),
+    }
+    drug = raw["drug_efficacy_dict"]
+    rng = random.Random(1)
+    texts = list(drug.values())
+    columns = {"itemName": list(drug), "efcyQesitm": list(texts)}
+    for column in DRUG_TEXT_COLUMNS:
+        columns[column] = [(rng.choice(texts) + ".")[:-1] for _ in texts]
+    frames["df_drug"] = pd.DataFrame(columns)
+    return frames
+
+
+def _build_dict(raw):
+    tables = {name: dict(table) for name, table in raw.items()}
+    tables["normalized_efficacy_dict"] = {
+        text: normalize_efficacy_text(text) for table in raw.values() for text in table.values()
+    }
+    return tables
+
+
+def _build_compact(raw):
+    pool, pool_ids = build_string_pool(raw.values())
+    tables = {
+        name: CompactMapping.from_dict(table, pool, pool_ids) for name, table in raw.items()
+    }
+    tables["normalized_efficacy_pool"] = StringPool.from_strings(
+        normalize_efficacy_text(text) for text in pool_ids
+    )
+    return tables
+
+
+if __name__ == "__main__":
+    raw = _raw_tables()
+    rows = {name: len(table) for name, table in raw.items()}
+    print(f"📄 조회 테이블 행 수: {rows}")
+
+    # raw의 str 객체를 공유하지 않도록 각 방식은 직렬화 후 복원한 값으로 측정
+    import msgpack
+
+    packed = {
+        name: msgpack.packb([[list(k) if isinstance(k, tuple) else k, v] for k, v in t.items()])
+        for name, t in raw.items()
+    }
+    del raw
+
+    def _restore():
+        restored = {}
+        for name, payload in packed.items():
+            restored[name] = {
+                (tuple(k) if isinstance(k, list) else k): v for k, v in msgpack.unpackb(payload)
+            }
+        return restored
+
+    print("🧠 조회 테이블 메모리 (tracemalloc, 원문 정규화 결과 포함)")
+    frames, frame_bytes = _measure("dataframe", lambda: _build_dataframes(_restore()))
+    del frames
+    _, dict_bytes = _measure("dict", lambda: _build_dict(_restore()))
+    _, compact_bytes = _measure("compact", lambda: _build_compact(_restore()))
+    for label, baseline in (("dataframe + dict", frame_bytes + dict_bytes), ("dict", dict_bytes)):
+        saved = (baseline - compact_bytes) / 1024 / 1024
+        print(f"  → {label} 대비 {baseline / compact_bytes:.2f}배 감소 ({saved:.2f} MB 절약)")
+    print(f"📈 프로세스 최대 RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
@@ -0,0 +1,54 @@
+"""
+일괄 제품 평가 = 단건 평가 반복 결과 동일성 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_batch_evaluation.py
+"""
+import pytest
+
+from core import claim_check_4
+from core.claim_check_4 import get_product_evaluation, get_product_evaluations_batch
+from core.keyword_extractor import extract_keywords_local
+from core.reference_data import get_reference_data
+
+QUERIES = ["간 건강에 좋나요?", "면역력 강화에 좋을까요?", "눈 건강에 좋은가요?", "간 건강에 좋나요?"]
+
+
+@pytest.fixture(autouse=True)
+def local_keywords(monkeypatch):
+    # LLM·디스크 캐시 없이 로컬 추출 결과로 고정
+    monkeypatch.setattr(
+        claim_check_4, "extract_keywords_from_query", lambda q: extract_keywords_local(q).keywords
+    )
+
+
+def _products():
+    ref = get_reference_data()
+    names = list(ref.efficacy_dict)[:24]
+    claims = list(ref.healthfood_claims_composite_key_efficacy_dict)[:6]
+    products = [
+        {"제품명": f"제품{i}", "확정_성분": names[i * 4 : i * 4 + 4] + ["밀크씨슬(실리마린)", "홍삼 농축액"]}
+        for i in range(6)
+    ]
+    products += [{"제품명": name, "확정_성분": [name]} for name, _ in claims]
+    products.append({"제품명": "성분 없는 제품", "확정_성분": []})
+    return products
+
+
+def test_batch_equals_single_evaluations():
+    products = _products()
+    single = [get_product_evaluation(p, q, q) for p in products for q in QUERIES]
+    assert get_product_evaluations_batch(products, QUERIES) == single
+    # 일치·불일치 판정이 모두 섞인 입력이어야 비교 의미가 있음
+    verdicts = {m["일치도"] for e in single for m in e["매칭_성분"]}
+    assert {"일치", "불일치"} <= verdicts
+
+
+def test_batch_keeps_display_queries():
+    products = _products()[:2]
+    display = [f"원문: {q}" for q in QUERIES]
+    single = [get_product_evaluation(p, q, d) for p in products for q, d in zip(QUERIES, display)]
+    assert get_product_evaluations_batch(products, QUERIES, display) == single
+
+
+def test_batch_rejects_mismatched_display_queries():
+    with pytest.raises(ValueError):
+        get_product_evaluations_batch(_products()[:1], QUERIES, QUERIES[:1])
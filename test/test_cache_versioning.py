@@ -0,0 +1,39 @@
+"""
+데이터 버전 기반 캐시 무효화 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_cache_versioning.py
+"""
+from core import data_version
+from core.cache import PersistentCache
+
+
+def _use_build_id(monkeypatch, build_id):
+    monkeypatch.setattr(data_version, "read_index_build_info", lambda: {"build_id": build_id})
+
+
+def test_index_rebuild_invalidates_versioned_entries(tmp_path, monkeypatch):
+    cache = PersistentCache("versioned", cache_dir=str(tmp_path))
+    _use_build_id(monkeypatch, "build-1")
+    cache.set("밀크씨슬", {"효능": "간 건강"})
+    assert cache.get("밀크씨슬") == {"효능": "간 건강"}
+
+    _use_build_id(monkeypatch, "build-2")  # 벡터 인덱스 재생성
+    assert cache.get("밀크씨슬") is None
+
+    _use_build_id(monkeypatch, "build-1")  # 이전 버전 항목은 키만 다를 뿐 그대로 남아 있음
+    assert cache.get("밀크씨슬") == {"효능": "간 건강"}
+
+
+def test_unversioned_cache_survives_version_change(tmp_path, monkeypatch):
+    cache = PersistentCache("plain", cache_dir=str(tmp_path), data_versioned=False)
+    _use_build_id(monkeypatch, "build-1")
+    cache.set("질문", ["간 건강"])
+    _use_build_id(monkeypatch, "build-2")
+    assert cache.get("질문") == ["간 건강"]
+
+
+def test_data_version_follows_build_id(monkeypatch):
+    _use_build_id(monkeypatch, "build-1")
+    first = data_version.get_data_version()
+    assert data_version.get_data_version() == first
+    _use_build_id(monkeypatch, "build-2")
+    assert data_version.get_data_version() != first
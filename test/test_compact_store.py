@@ -0,0 +1,62 @@
+"""
+StringPool / CompactMapping 테스트 (msgpack 스냅샷 왕복 포함)
+실행: python -m pytest -q test/test_compact_store.py
+"""
+import msgpack
+
+from core.compact_store import CompactMapping, StringPool, build_string_pool, intern_str_dict
+
+FNCLTY = {
+    "밀크씨슬추출물": "간 건강에 도움을 줄 수 있음",
+    "홍삼": "면역력 증진·피로개선에 도움을 줄 수 있음",
+    "은행잎추출물": "기억력 개선에 도움을 줄 수 있음",
+}
+CLAIMS = {
+    ("간건강 밀크씨슬", "밀크씨슬추출물"): "간 건강에 도움을 줄 수 있음",
+    ("6년근 홍삼정", "홍삼농축액"): "면역력 증진·피로개선에 도움을 줄 수 있음",
+}
+
+
+def _roundtrip(payload):
+    return msgpack.unpackb(msgpack.packb(payload, use_bin_type=True), raw=False)
+
+
+def test_string_pool_lookup_and_find():
+    pool = StringPool.from_strings(["간 건강", "", "피로개선"])
+    assert len(pool) == 3
+    assert list(pool) == ["간 건강", "", "피로개선"]
+    assert pool.find("피로개선") == 2
+    assert pool.find("") == 1
+    assert pool.find("없는 문구") is None
+
+
+def test_build_string_pool_deduplicates_values():
+    pool, pool_ids = build_string_pool([FNCLTY, CLAIMS])
+    assert len(pool) == 3
+    efficacy = CompactMapping.from_dict(FNCLTY, pool, pool_ids)
+    claims = CompactMapping.from_dict(CLAIMS, pool, pool_ids)
+    assert efficacy.value_id("밀크씨슬추출물") == claims.value_id(("간건강 밀크씨슬", "밀크씨슬추출물"))
+    assert dict(efficacy) == FNCLTY
+    assert dict(claims) == CLAIMS
+
+
+def test_msgpack_roundtrip():
+    pool, pool_ids = build_string_pool([FNCLTY, CLAIMS])
+    efficacy = CompactMapping.from_dict(FNCLTY, pool, pool_ids)
+    claims = CompactMapping.from_dict(CLAIMS, pool, pool_ids)
+
+    restored_pool = StringPool.from_payload(_roundtrip(pool.to_payload()))
+    restored_efficacy = CompactMapping.from_payload(_roundtrip(efficacy.to_payload()), restored_pool)
+    restored_claims = CompactMapping.from_payload(_roundtrip(claims.to_payload()), restored_pool)
+
+    assert list(restored_pool) == list(pool)
+    assert dict(restored_efficacy) == FNCLTY
+    # 튜플 키는 msgpack에서 리스트가 되었다가 다시 튜플로 복원
+    assert dict(restored_claims) == CLAIMS
+    assert ("6년근 홍삼정", "홍삼농축액") in restored_claims
+    assert restored_claims.get(("없는 제품", "없는 원료")) is None
+
+
+def test_intern_str_dict_shares_values():
+    table = intern_str_dict({"밀크씨슬": "밀크씨슬" + "추출물", "실리마린": "밀크씨슬추" + "출물"})
+    assert table["밀크씨슬"] is table["실리마린"]
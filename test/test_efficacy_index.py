@@ -0,0 +1,77 @@
+"""
+기능성 문구 → 원료 역색인 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_efficacy_index.py
+"""
+from types import SimpleNamespace
+
+from core.efficacy_index import (
+    SOURCE_DRUG,
+    SOURCE_FNCLTY,
+    SOURCE_HEALTHFOOD_CLAIMS,
+    EfficacyIndex,
+    get_efficacy_index,
+)
+from core.claim_check_4 import PRODUCT_MATERIAL_SOURCES
+
+REF = SimpleNamespace(
+    efficacy_dict={
+        "밀크씨슬추출물": "간 건강에 도움을 줄 수 있음",
+        "홍삼": "면역력 증진·피로개선에 도움을 줄 수 있음",
+        "루테인": "노화로 인해 감소될 수 있는 황반색소밀도를 유지하여 눈 건강에 도움을 줄 수 있음",
+    },
+    healthfood_claims_composite_key_efficacy_dict={
+        ("밀크씨슬 (카르두스 마리아누스) 추출물", "130mg"): "간 건강에 도움을 줄 수 있음",
+        ("밀크씨슬 (카르두스 마리아누스) 추출물", "260mg"): "간 건강에 도움을 줄 수 있음",
+        ("프로바이오틱스", "1억 CFU"): "유산균 증식 및 유해균 억제, 배변활동 원활에 도움을 줄 수 있음",
+    },
+    drug_efficacy_dict={
+        "우루사정": "간 기능 개선, 만성 간질환의 간 기능 장애 개선",
+    },
+)
+
+
+def test_search_ranks_and_dedupes_by_material():
+    hits = EfficacyIndex(REF).search(["간", "건강"])
+    names = [(h.source, h.name) for h in hits]
+    assert (SOURCE_FNCLTY, "밀크씨슬추출물") in names
+    # 같은 원료의 여러 일일섭취량 행은 하나로
+    assert names.count((SOURCE_HEALTHFOOD_CLAIMS, "밀크씨슬 (카르두스 마리아누스) 추출물")) == 1
+    assert hits[0].matched_keywords == ("간", "건강")
+    assert (SOURCE_FNCLTY, "홍삼") not in names
+
+
+def test_sources_filter():
+    hits = EfficacyIndex(REF).search(["간"], sources=[SOURCE_DRUG])
+    assert [(h.source, h.name) for h in hits] == [(SOURCE_DRUG, "우루사정")]
+    assert hits[0].efficacy == REF.drug_efficacy_dict["우루사정"]
+
+
+def test_matching_materials_equals_search_keys():
+    index = EfficacyIndex(REF)
+    for keywords in (["간", "건강"], ["면역력"], ["눈 건강"], ["배변"], ["없는 기능성"], []):
+        for sources in (None, PRODUCT_MATERIAL_SOURCES, [SOURCE_DRUG]):
+            expected = {(h.source, h.name) for h in index.search(keywords, top_k=None, sources=sources)}
+            assert index.matching_materials(keywords, sources=sources) == expected, (keywords, sources)
+
+
+def test_sources_are_indexed_lazily():
+    index = EfficacyIndex(REF)
+    assert len(index) == 7 and not index._sources  # 생성만으로는 색인하지 않음
+    index.matching_materials(["간"], sources=PRODUCT_MATERIAL_SOURCES)
+    assert set(index._sources) == set(PRODUCT_MATERIAL_SOURCES)  # drug_raw는 조회 전까지 만들지 않음
+
+
+def test_unqueried_source_does_not_change_matches():
+    # drug_raw 행이 많아져도 다른 출처의 idf·일치 결과는 그대로
+    noisy = SimpleNamespace(**vars(REF))
+    noisy.drug_efficacy_dict = {f"약{i}": "간 기능 개선 및 건강 유지" for i in range(200)}
+    keywords = ["간 건강", "면역력"]
+    assert EfficacyIndex(noisy).matching_materials(keywords, PRODUCT_MATERIAL_SOURCES) == EfficacyIndex(
+        REF
+    ).matching_materials(keywords, PRODUCT_MATERIAL_SOURCES)
+
+
+def test_reference_index_milk_thistle():
+    materials = get_efficacy_index().matching_materials(["간 건강"], sources=PRODUCT_MATERIAL_SOURCES)
+    assert (SOURCE_FNCLTY, "밀크씨슬추출물") in materials
+    assert all(source in PRODUCT_MATERIAL_SOURCES for source, _ in materials)
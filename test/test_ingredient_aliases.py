@@ -0,0 +1,61 @@
+"""
+원료명 별칭 조회 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_ingredient_aliases.py
+"""
+from core.ingredient_aliases import (
+    alias_keys,
+    base_ingredient_name,
+    build_alias_table,
+    lookup_alias,
+    normalize_ingredient_name,
+)
+from core.reference_data import get_reference_data
+
+CANONICAL_NAMES = [
+    "밀크씨슬추출물",
+    "밀크씨슬 추출물(Milk Thistle Extract)",
+    "EPA 및 DHA 함유 유지",
+    "은행잎추출물",
+    "홍삼",
+]
+
+
+def test_normalize_and_base_name():
+    assert normalize_ingredient_name("EPA & DHA 함유 유지") == "epadha함유유지"
+    assert normalize_ingredient_name("EPA 및 DHA 함유 유지") == "epadha함유유지"
+    assert base_ingredient_name("밀크씨슬(실리마린)") == "밀크씨슬"
+    assert base_ingredient_name("밀크씨슬 (카르두스 마리아누스) 추출물") == "밀크씨슬"
+    assert base_ingredient_name("녹차추출분말") == "녹차"
+
+
+def test_alias_keys_most_specific_first():
+    keys = alias_keys("밀크씨슬(실리마린)")
+    assert keys[0] == "밀크씨슬실리마린"
+    assert keys.index("밀크씨슬") < keys.index("실리마린")
+    # 3자 미만 괄호 약어는 별칭으로 쓰지 않음
+    assert "dg" not in alias_keys("프로바이오틱스(DG)")
+
+
+def test_lookup_resolves_spelling_variants():
+    table = build_alias_table(CANONICAL_NAMES, ["밀크씨슬(실리마린)"])
+    assert lookup_alias("밀크씨슬(실리마린)", table) == "밀크씨슬추출물"
+    assert lookup_alias("실리마린", table) == "밀크씨슬추출물"  # 동의어 표기에서 온 별칭
+    assert lookup_alias("밀크씨슬 추출물", table) == "밀크씨슬추출물"
+    assert lookup_alias("EPA & DHA 함유 유지", table) == "EPA 및 DHA 함유 유지"
+    assert lookup_alias("은행잎", table) == "은행잎추출물"
+    assert lookup_alias("홍삼", table) == "홍삼"
+    assert lookup_alias("없는 원료", table) is None
+
+
+def test_ambiguous_alias_is_excluded():
+    table = build_alias_table(["EPA/DHA 함유 유지", "EPA/GLA 혼합유"])
+    assert lookup_alias("EPA/DHA 함유 유지", table) == "EPA/DHA 함유 유지"
+    assert lookup_alias("DHA 함유 유지", table) == "EPA/DHA 함유 유지"
+    assert lookup_alias("EPA", table) is None  # 두 원료를 가리키므로 제외
+
+
+def test_reference_alias_table():
+    table = get_reference_data().ingredient_alias_dict
+    assert lookup_alias("밀크씨슬(실리마린)", table) == "밀크씨슬추출물"
+    assert lookup_alias("카르두스 마리아누스", table) == "밀크씨슬추출물"
+    assert lookup_alias("은행잎", table) == "은행잎추출물"
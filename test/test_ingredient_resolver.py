@@ -0,0 +1,54 @@
+"""
+원료명 근사 매칭 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_ingredient_resolver.py
+"""
+from core.ingredient_resolver import IngredientResolver, get_ingredient_resolver
+
+DB_NAMES = [
+    "프로바이오틱스(드시모네)",
+    "동우코엔자임Q10",
+    "밀크씨슬추출물",
+    "가르시니아 캄보지아 추출물",
+    "폴리코사놀 - 사탕수수 왁스 알코올",
+    "Lactobacillus plantarum TWK10 프로바이오틱스",
+    "Bacillus coagulans SNZ 1969 프로바이오틱스",
+]
+
+
+def _resolved_name(resolver, query):
+    match = resolver.resolve(query)
+    return match.name if match else None
+
+
+def test_spelling_variants_resolve():
+    resolver = IngredientResolver(DB_NAMES)
+    assert _resolved_name(resolver, "밀크씨슬 추출물") == "밀크씨슬추출물"
+    assert _resolved_name(resolver, "밀크씨슬(실리마린)") == "밀크씨슬추출물"
+    assert _resolved_name(resolver, "가르시니아캄보지아 추출물") == "가르시니아 캄보지아 추출물"
+    assert _resolved_name(resolver, "폴리코사놀-사탕수수왁스알콜") == "폴리코사놀 - 사탕수수 왁스 알코올"
+    assert (
+        _resolved_name(resolver, "Bacillus coagulans SNZ1969 프로바이오틱스")
+        == "Bacillus coagulans SNZ 1969 프로바이오틱스"
+    )
+
+
+def test_short_name_one_syllable_apart_is_rejected():
+    resolver = IngredientResolver(DB_NAMES)
+    assert resolver.resolve("프리바이오틱스") is None  # ≠ 프로바이오틱스
+
+
+def test_material_is_not_resolved_to_product_name():
+    resolver = IngredientResolver(DB_NAMES)
+    assert resolver.resolve("코엔자임Q10") is None  # ≠ 동우코엔자임Q10 (제품명)
+
+
+def test_different_strain_code_is_rejected():
+    resolver = IngredientResolver(DB_NAMES)
+    assert resolver.resolve("Lactobacillus plantarum C29 프로바이오틱스") is None
+
+
+def test_reference_resolver_near_misses():
+    resolver = get_ingredient_resolver()
+    for query in ("프리바이오틱스", "코엔자임Q10", "코엔자임 Q10"):
+        assert resolver.resolve(query) is None, query
+    assert _resolved_name(resolver, "홍경천 추출물") == "홍경천추출물"
@@ -0,0 +1,57 @@
+"""
+로컬 질의 키워드 추출 테스트 (LLM 호출 없음)
+실행: python -m pytest -q test/test_keyword_extractor.py
+"""
+from core.claim_check_4 import match_efficacy
+from core.keyword_extractor import (
+    KEYWORD_LOCAL_MIN_CONFIDENCE,
+    extract_keywords_local,
+    get_health_lexicon,
+)
+
+
+def test_lexicon_phrase_beats_its_parts():
+    assert extract_keywords_local("간 건강에 좋나요?").keywords == ["간 건강"]
+    assert extract_keywords_local("눈 건강에 좋은가요?").keywords == ["눈 건강"]
+    assert extract_keywords_local("간건강에 좋나요").keywords == ["간 건강"]
+    assert extract_keywords_local("장 건강과 면역력").keywords == ["장 건강", "면역력"]
+
+
+def test_phrase_keywords_are_confident():
+    for query in ("간 건강에 좋나요?", "눈 건강에 좋은가요?"):
+        assert extract_keywords_local(query).confidence >= KEYWORD_LOCAL_MIN_CONFIDENCE
+
+
+def test_action_suffix_is_reduced_to_root():
+    assert extract_keywords_local("면역력 강화에 좋을까요?").keywords == ["면역력"]
+    assert extract_keywords_local("혈압 조절에 도움되나요").keywords == ["혈압"]
+
+
+def test_single_syllable_term_without_phrase():
+    assert extract_keywords_local("간에 좋나요").keywords == ["간"]
+
+
+def test_generic_only_query_falls_back_to_llm():
+    result = extract_keywords_local("건강에 좋나요?")
+    assert result.keywords == ["건강"]
+    assert result.confidence < KEYWORD_LOCAL_MIN_CONFIDENCE
+
+
+def test_unknown_nouns_lower_confidence():
+    result = extract_keywords_local("두뇌 발달이나 집중력 향상에 좋다던데 사실인가요?")
+    assert result.keywords == ["집중력"]
+    assert result.confidence < KEYWORD_LOCAL_MIN_CONFIDENCE
+
+
+def test_phrase_keyword_does_not_match_other_organ():
+    keywords = extract_keywords_local("간 건강에 좋나요?").keywords
+    assert match_efficacy(keywords, "장 건강에 도움을 줄 수 있음") == "불일치"
+    assert match_efficacy(keywords, "간 건강에 도움을 줄 수 있음") == "일치"
+
+
+def test_vocabulary_sorted_once_longest_first():
+    lexicon = get_health_lexicon()
+    assert lexicon is get_health_lexicon()
+    lengths = [len(w) for w in lexicon.by_length]
+    assert lengths == sorted(lengths, reverse=True)
+    assert min(lengths) >= 2
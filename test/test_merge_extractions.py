@@ -0,0 +1,53 @@
+"""
+청크별 성분 추출 결과 병합 테스트 (LLM 호출 없음)
+실행: python -m pytest -q test/test_merge_extractions.py
+"""
+from core.web_search_3 import merge_partial_extractions
+
+URL_A = "https://www.foodsafetykorea.go.kr/a"
+URL_B = "https://www.health.kr/b"
+
+
+def test_sources_merge_by_url_in_both_shapes():
+    partials = [
+        {
+            "성분_추출_출처": [
+                {"url": URL_A, "성분_내용": "아연, 비타민D"},
+                {"성분명": "아연", "효능": "면역력 강화", "출처": URL_B},
+            ],
+            "확정_성분": ["아연", "비타민D"],
+            "성분_효능": [{"성분명": "아연", "효능": "면역력 강화"}],
+            "요약": "면역력 중심 광고",
+        },
+        {
+            "성분_추출_출처": [
+                {"url": URL_A, "성분_내용": "비타민 D, 셀레늄"},
+                {"성분명": "셀레늄", "효능": "항산화", "출처": URL_B},
+            ],
+            "확정_성분": ["비타민 D", "셀레늄"],
+            "성분_효능": [{"성분명": "아연", "효능": "면역력 강화, 정상적인 세포분열"}],
+            "요약": "두 번째 요약",
+        },
+    ]
+    merged = merge_partial_extractions(partials)
+    assert merged["성분_추출_출처"] == [
+        {"url": URL_A, "성분_내용": "아연, 비타민D, 셀레늄"},
+        {"url": URL_B, "성분_내용": "아연, 셀레늄", "성분명": "아연, 셀레늄", "효능": "면역력 강화, 항산화"},
+    ]
+    assert merged["확정_성분"] == ["아연", "비타민D", "셀레늄"]
+    assert merged["성분_효능"] == [{"성분명": "아연", "효능": "면역력 강화, 정상적인 세포분열"}]
+    assert merged["요약"] == "면역력 중심 광고"
+
+
+def test_sources_without_url_are_kept_apart():
+    partials = [
+        {"성분_추출_출처": [{"성분명": "홍삼", "효능": "피로개선"}, {"성분명": "밀크씨슬", "효능": "간 건강"}]},
+        {"성분_추출_출처": [{"성분_내용": "루테인"}, "잘못된 항목"]},
+    ]
+    merged = merge_partial_extractions(partials)
+    assert merged["성분_추출_출처"] == [
+        {"url": "", "성분_내용": "홍삼", "성분명": "홍삼", "효능": "피로개선"},
+        {"url": "", "성분_내용": "밀크씨슬", "성분명": "밀크씨슬", "효능": "간 건강"},
+        {"url": "", "성분_내용": "루테인"},
+    ]
+    assert merged["확정_성분"] == [] and merged["요약"] == ""
@@ -0,0 +1,49 @@
+"""
+제품명 색인 재사용 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_product_index.py
+"""
+from core.product_index import ProductNameIndex, _name_keys
+
+INFO = {"제품명": "키즈플랜 비오클 / KIDZPLAN BIOCLE", "확정_성분": [{"성분명": "프로바이오틱스"}]}
+
+
+def _empty_index(tmp_path):
+    return ProductNameIndex(str(tmp_path / "text2search"), str(tmp_path / "step_outputs"))
+
+
+def test_name_keys_main_and_full():
+    assert _name_keys("키즈플랜 비오클 / KIDZPLAN BIOCLE") == ["키즈플랜비오클", "키즈플랜비오클kidzplanbiocle"]
+    assert _name_keys("키즈플랜 비오클") == ["키즈플랜비오클"]
+    assert _name_keys("") == []
+
+
+def test_spelling_variant_reuses_result(tmp_path):
+    index = _empty_index(tmp_path)
+    index.add("키즈플랜 비오클", INFO, aliases=(INFO["제품명"],))
+    assert index.lookup("키즈플랜비오클").product_name == "키즈플랜 비오클"
+    assert index.lookup("키즈플랜 비오클 / Kidzplan Biocle").score == 100.0
+
+
+def test_shared_brand_segment_is_not_reused(tmp_path):
+    index = _empty_index(tmp_path)
+    index.add("키즈플랜 비오클 / KIDZPLAN BIOCLE", INFO)
+    assert index.lookup("키즈플랜 멀티비타민 / KIDZPLAN BIOCLE") is None
+    assert index.lookup("KIDZPLAN BIOCLE") is None
+
+
+def test_stored_and_served_records_are_copies(tmp_path):
+    index = _empty_index(tmp_path)
+    info = {"제품명": "키즈플랜 비오클", "확정_성분": [{"성분명": "프로바이오틱스"}]}
+    index.add("키즈플랜 비오클", info)
+    info["original_효력_주장"] = ["장 건강"]  # 보강 직후 노드에서 수정
+    info["확정_성분"].append({"성분명": "아연"})
+
+    served = index.lookup("키즈플랜 비오클").enriched_info
+    assert "original_효력_주장" not in served
+    assert served["확정_성분"] == [{"성분명": "프로바이오틱스"}]
+
+    served["재사용_정보"] = {"유사도": 100.0}  # 재사용한 쪽의 수정
+    served["확정_성분"].clear()
+    again = index.lookup("키즈플랜 비오클").enriched_info
+    assert "재사용_정보" not in again
+    assert again["확정_성분"] == [{"성분명": "프로바이오틱스"}]
@@ -0,0 +1,43 @@
+"""
+검색 스니펫 전처리 테스트 (도메인 정렬·차단, 중복 제거, 토큰 예산)
+실행: python -m pytest -q test/test_snippet_filter.py
+"""
+from core import snippet_filter
+from core.snippet_filter import count_tokens, filter_search_results, trim_to_token_budget
+
+OFFICIAL = {"url": "https://www.foodsafetykorea.go.kr/a", "content": "밀크씨슬추출물은 간 건강에 도움을 줄 수 있음"}
+NEWS = {"url": "https://news.example.com/b", "content": "홍삼은 면역력 증진과 피로개선에 도움을 줄 수 있습니다"}
+BLOG = {"url": "https://blog.naver.com/c", "content": "내돈내산 후기: 이 제품 먹고 피곤함이 사라졌어요"}
+SHOP = {"url": "https://www.coupang.com/d", "content": "오늘만 최저가! 밀크씨슬 3+1 행사"}
+
+
+def test_trusted_domains_first_and_denied_dropped(monkeypatch):
+    monkeypatch.setattr(snippet_filter, "SEARCH_DENY_MODE", "drop")
+    assert filter_search_results([BLOG, NEWS, OFFICIAL]) == [OFFICIAL, NEWS]
+
+
+def test_demote_keeps_denied_last(monkeypatch):
+    monkeypatch.setattr(snippet_filter, "SEARCH_DENY_MODE", "demote")
+    assert filter_search_results([BLOG, NEWS, OFFICIAL]) == [OFFICIAL, NEWS, BLOG]
+
+
+def test_drop_keeps_results_when_all_denied(monkeypatch):
+    monkeypatch.setattr(snippet_filter, "SEARCH_DENY_MODE", "drop")
+    assert filter_search_results([SHOP, BLOG]) == [SHOP, BLOG]  # 순서는 그대로
+    assert filter_search_results([]) == []
+
+
+def test_near_duplicate_keeps_higher_ranked():
+    copy = {"url": "https://news.example.com/copy", "content": OFFICIAL["content"] + "."}
+    assert filter_search_results([copy, OFFICIAL]) == [OFFICIAL]
+
+
+def test_trim_to_token_budget(monkeypatch):
+    monkeypatch.setattr(snippet_filter, "_encoding", False)  # 문자 수 기반 근사로 고정
+    results = [dict(NEWS, content=NEWS["content"] * 20) for _ in range(5)]
+    format_result = lambda r: f"{r['content']}\n출처: {r['url']}"
+
+    parts = trim_to_token_budget(results, format_result, budget=600, min_tail_tokens=50)
+    assert 1 <= len(parts) < len(results)
+    assert sum(count_tokens(p) for p in parts) <= 600
+    assert parts[-1].endswith(f"출처: {NEWS['url']}")  # 잘린 마지막 결과도 출처 URL 유지
@@ -0,0 +1,65 @@
+"""
+긴 상세페이지 판별·타일 결과 병합 테스트 (API 호출 없음)
+실행: python -m pytest -q test/test_text_extract_tiles.py
+"""
+import io
+
+from PIL import Image, ImageFile
+
+from core.text_extract_1 import is_tall_image, merge_tile_results
+
+
+def _jpeg(width, height, orientation=None):
+    image = Image.new("RGB", (width, height), "white")
+    exif = image.getexif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_is_tall_image_uses_exif_orientation():
+    assert is_tall_image(_jpeg(400, 2000))
+    assert not is_tall_image(_jpeg(2000, 400))
+    assert is_tall_image(_jpeg(2000, 400, orientation=6))  # 90° 회전 → 세로로 긴 이미지
+    assert not is_tall_image(_jpeg(400, 2000, orientation=8))
+    assert is_tall_image(_jpeg(400, 2000, orientation=3))  # 180°는 가로·세로 그대로
+
+
+def test_is_tall_image_does_not_decode_pixels(monkeypatch):
+    data = _jpeg(2000, 400, orientation=6)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("픽셀을 디코딩하면 안 됩니다")
+
+    monkeypatch.setattr(ImageFile.ImageFile, "load", _fail)
+    assert is_tall_image(data)
+
+
+def test_overlapping_claims_keep_longest():
+    merged = merge_tile_results(
+        [
+            {"제품명": "간건강 밀크씨슬", "효능_주장": ["간 건강에 도움", "피로 개"]},
+            {"제품명": "간건강 밀크씨슬", "효능_주장": ["피로 개선에 도움", "간 건강에 도움"]},
+        ]
+    )
+    assert merged["효능_주장"] == ["간 건강에 도움", "피로 개선에 도움"]
+
+
+def test_product_name_majority_then_top_tile():
+    tiles = [
+        {"제품명": "밀크씨슬 골드", "효능_주장": []},
+        {"제품명": "간 건강 기능식품", "효능_주장": []},
+        {"제품명": "간 건강 기능식품 ", "효능_주장": []},
+    ]
+    assert merge_tile_results(tiles)["제품명"] == "간 건강 기능식품"
+    # 동률이면 위쪽 타일의 제품명
+    assert merge_tile_results(tiles[:2])["제품명"] == "밀크씨슬 골드"
+
+
+def test_empty_tiles():
+    assert merge_tile_results([{}, {"제품명": None, "효능_주장": None}]) == {
+        "제품명": "",
+        "효능_주장": [],
+    }